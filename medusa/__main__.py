@@ -81,6 +81,7 @@ from medusa.databases import cache_db, failed_db, main_db
 from medusa.failed_history import trim_history
 from medusa.indexers.config import INDEXER_TVDBV2, INDEXER_TVMAZE
 from medusa.init.filesystem import is_valid_encoding
+from medusa.name_parser.parser import configure_parse_caches, name_parser_cache
 from medusa.providers.generic_provider import GenericProvider
 from medusa.providers.nzb.newznab import NewznabProvider
 from medusa.providers.torrent.rss.rsstorrent import TorrentRssProvider
@@ -95,6 +96,7 @@ from medusa.search.daily import DailySearcher
 from medusa.search.proper import ProperFinder
 from medusa.search.queue import ForcedSearchQueue, PostProcessQueue, SearchQueue, SnatchQueue
 from medusa.server.core import AppWebServer
+from medusa.show.disk_usage import DiskUsageReconciler
 from medusa.system.shutdown import Shutdown
 from medusa.themes import read_themes
 from medusa.tv import Series
@@ -351,6 +353,9 @@ class Application(object):
         # Build from the DB to start with
         self.load_shows_from_db()
 
+        # Size the parse caches, and warm them with the results persisted for these shows
+        configure_parse_caches()
+
         logger.info('Starting Medusa [{branch}] using {config!r}', branch=app.BRANCH, config=app.CONFIG_FILE)
 
         # Python 2 EOL warning
@@ -639,6 +644,14 @@ class Application(object):
             app.CHECK_PROPERS_INTERVAL = check_setting_str(app.CFG, 'General', 'check_propers_interval', '4h',
                                                            valid_values=('15m', '45m', '90m', '4h', 'daily'))
             app.RANDOMIZE_PROVIDERS = bool(check_setting_int(app.CFG, 'General', 'randomize_providers', 0))
+            app.PROVIDER_SEARCH_WORKERS = max(1, check_setting_int(app.CFG, 'General', 'provider_search_workers', 1))
+            app.PROVIDER_SEARCH_TIMEOUT = max(0, check_setting_int(app.CFG, 'General', 'provider_search_timeout', 300))
+            app.PROVIDER_SEARCH_MAX_PER_HOST = max(1, check_setting_int(app.CFG, 'General', 'provider_search_max_per_host', 1))
+            app.NAME_PARSER_WORKERS = max(1, check_setting_int(app.CFG, 'General', 'name_parser_workers', 1))
+            app.PARSE_CACHE_PERSISTENT = bool(check_setting_int(app.CFG, 'General', 'parse_cache_persistent', 0))
+            app.PARSE_CACHE_SIZE = max(1, check_setting_int(app.CFG, 'General', 'parse_cache_size', 100))
+            app.NAME_PARSER_CACHE_SIZE = max(1, check_setting_int(app.CFG, 'General', 'name_parser_cache_size', 1000))
+            app.GUESSIT_CACHE_SIZE = max(1, check_setting_int(app.CFG, 'General', 'guessit_cache_size', 25000))
             app.ALLOW_HIGH_PRIORITY = bool(check_setting_int(app.CFG, 'General', 'allow_high_priority', 1))
             app.SKIP_REMOVED_FILES = bool(check_setting_int(app.CFG, 'General', 'skip_removed_files', 0))
             app.ALLOWED_EXTENSIONS = check_setting_list(app.CFG, 'General', 'allowed_extensions', app.ALLOWED_EXTENSIONS)
@@ -647,6 +660,7 @@ class Application(object):
             app.MAX_CACHE_AGE = check_setting_int(app.CFG, 'General', 'max_cache_age', 30)
             app.AUTOPOSTPROCESSOR_FREQUENCY = max(app.MIN_AUTOPOSTPROCESSOR_FREQUENCY,
                                                   check_setting_int(app.CFG, 'General', 'autopostprocessor_frequency', 10))
+            app.POSTPROCESS_WORKERS = max(1, check_setting_int(app.CFG, 'General', 'postprocess_workers', 1))
 
             app.DOWNLOAD_HANDLER_FREQUENCY = max(app.MIN_DOWNLOAD_HANDLER_FREQUENCY,
                                                  check_setting_int(app.CFG, 'General', 'download_handler_frequency',
@@ -657,6 +671,8 @@ class Application(object):
             app.BACKLOG_FREQUENCY = max(app.MIN_BACKLOG_FREQUENCY, check_setting_int(app.CFG, 'General', 'backlog_frequency', app.DEFAULT_BACKLOG_FREQUENCY))
             app.UPDATE_FREQUENCY = max(app.MIN_UPDATE_FREQUENCY, check_setting_int(app.CFG, 'General', 'update_frequency', app.DEFAULT_UPDATE_FREQUENCY))
             app.SHOWUPDATE_HOUR = max(0, min(23, check_setting_int(app.CFG, 'General', 'showupdate_hour', app.DEFAULT_SHOWUPDATE_HOUR)))
+            app.SHOW_UPDATE_WORKERS = max(1, check_setting_int(app.CFG, 'General', 'show_update_workers', 1))
+            app.SCHEDULER_WORKERS = max(0, check_setting_int(app.CFG, 'General', 'scheduler_workers', 0))
 
             app.BACKLOG_DAYS = check_setting_int(app.CFG, 'General', 'backlog_days', 7)
 
@@ -1224,6 +1240,10 @@ class Application(object):
                                                                threadName='EPISODEUPDATER',
                                                                silent=False)
 
+            app.disk_usage_scheduler = scheduler.Scheduler(DiskUsageReconciler(),
+                                                           cycleTime=datetime.timedelta(hours=12),
+                                                           threadName='DISKUSAGE')
+
             # snatcher used for manual search, manual picked results
             app.manual_snatch_scheduler = scheduler.Scheduler(SnatchQueue(),
                                                               cycleTime=datetime.timedelta(seconds=3),
@@ -1375,6 +1395,11 @@ class Application(object):
             app.episode_update_scheduler.enable = True
             app.episode_update_scheduler.start()
 
+            # start the disk usage reconciler, and walk the show folders once at startup
+            app.disk_usage_scheduler.enable = True
+            app.disk_usage_scheduler.force = True
+            app.disk_usage_scheduler.start()
+
             # start the version checker
             app.version_check_scheduler.enable = True
             app.version_check_scheduler.start()
@@ -1461,6 +1486,7 @@ class Application(object):
                 app.backlog_search_scheduler,
                 app.show_update_scheduler,
                 app.episode_update_scheduler,
+                app.disk_usage_scheduler,
                 app.version_check_scheduler,
                 app.show_queue_scheduler,
                 app.search_queue_scheduler,
@@ -1494,6 +1520,9 @@ class Application(object):
                 except Exception:
                     pass
 
+            # Write the parse results that are waiting for the persistent parse cache
+            name_parser_cache.flush()
+
             app.__INITIALIZED__ = False
             app.started = False
 
@@ -1571,15 +1600,26 @@ class Application(object):
         new_config['General']['cache_trimming'] = int(app.CACHE_TRIMMING)
         new_config['General']['max_cache_age'] = int(app.MAX_CACHE_AGE)
         new_config['General']['autopostprocessor_frequency'] = int(app.AUTOPOSTPROCESSOR_FREQUENCY)
+        new_config['General']['postprocess_workers'] = int(app.POSTPROCESS_WORKERS)
         new_config['General']['download_handler_frequency'] = int(app.DOWNLOAD_HANDLER_FREQUENCY)
         new_config['General']['dailysearch_frequency'] = int(app.DAILYSEARCH_FREQUENCY)
         new_config['General']['backlog_frequency'] = int(app.BACKLOG_FREQUENCY)
         new_config['General']['update_frequency'] = int(app.UPDATE_FREQUENCY)
         new_config['General']['showupdate_hour'] = int(app.SHOWUPDATE_HOUR)
+        new_config['General']['show_update_workers'] = int(app.SHOW_UPDATE_WORKERS)
+        new_config['General']['scheduler_workers'] = int(app.SCHEDULER_WORKERS)
         new_config['General']['download_propers'] = int(app.DOWNLOAD_PROPERS)
         new_config['General']['propers_search_days'] = int(app.PROPERS_SEARCH_DAYS)
         new_config['General']['remove_from_client'] = int(app.REMOVE_FROM_CLIENT)
         new_config['General']['randomize_providers'] = int(app.RANDOMIZE_PROVIDERS)
+        new_config['General']['provider_search_workers'] = int(app.PROVIDER_SEARCH_WORKERS)
+        new_config['General']['provider_search_timeout'] = int(app.PROVIDER_SEARCH_TIMEOUT)
+        new_config['General']['provider_search_max_per_host'] = int(app.PROVIDER_SEARCH_MAX_PER_HOST)
+        new_config['General']['name_parser_workers'] = int(app.NAME_PARSER_WORKERS)
+        new_config['General']['parse_cache_persistent'] = int(app.PARSE_CACHE_PERSISTENT)
+        new_config['General']['parse_cache_size'] = int(app.PARSE_CACHE_SIZE)
+        new_config['General']['name_parser_cache_size'] = int(app.NAME_PARSER_CACHE_SIZE)
+        new_config['General']['guessit_cache_size'] = int(app.GUESSIT_CACHE_SIZE)
         new_config['General']['check_propers_interval'] = app.CHECK_PROPERS_INTERVAL
         new_config['General']['allow_high_priority'] = int(app.ALLOW_HIGH_PRIORITY)
         new_config['General']['skip_removed_files'] = int(app.SKIP_REMOVED_FILES)
@@ -2248,6 +2288,10 @@ class Application(object):
                 bak_file = os.path.join(dst_dir, '%s.bak-%s' % (filename, datetime.datetime.now().strftime('%Y%m%d_%H%M%S')))
                 if os.path.isfile(dst_file):
                     shutil.move(dst_file, bak_file)
+                # The WAL files belong to the replaced database
+                for wal_file in ('-wal', '-shm'):
+                    if os.path.isfile(dst_file + wal_file):
+                        shutil.move(dst_file + wal_file, bak_file + wal_file)
                 shutil.move(src_file, dst_file)
             return True
         except Exception as error:
@@ -8,6 +8,8 @@ import random
 import sys
 from threading import Lock
 
+from medusa.show.show_list import ShowList
+
 
 CUSTOMIZABLE_LOGS = [
     'Missed file: {missed_file}',
@@ -110,6 +112,7 @@ class MedusaApp(object):
         self.trakt_checker_scheduler = None
         self.download_handler_scheduler = None
         self.episode_update_scheduler = None
+        self.disk_usage_scheduler = None
         self.post_processor_scheduler = None
         self.post_processor_queue_scheduler = None
 
@@ -236,6 +239,9 @@ class MedusaApp(object):
         self.SUBTITLES_DEFAULT = False
         self.INDEXER_DEFAULT = None
         self.INDEXER_TIMEOUT = None
+        self.SHOW_UPDATE_WORKERS = 1
+        # Worker threads of the schedulers, 0 is one for every scheduler
+        self.SCHEDULER_WORKERS = 0
         self.SCENE_DEFAULT = False
         self.ANIME_DEFAULT = False
         self.SHOWLISTS_DEFAULT = ['series']
@@ -275,6 +281,14 @@ class MedusaApp(object):
         self.ALLOW_HIGH_PRIORITY = False
         self.SAB_FORCED = False
         self.RANDOMIZE_PROVIDERS = False
+        self.PROVIDER_SEARCH_WORKERS = 1
+        self.PROVIDER_SEARCH_TIMEOUT = 300
+        self.PROVIDER_SEARCH_MAX_PER_HOST = 1
+        self.NAME_PARSER_WORKERS = 1
+        self.PARSE_CACHE_PERSISTENT = False
+        self.PARSE_CACHE_SIZE = 100
+        self.NAME_PARSER_CACHE_SIZE = 1000
+        self.GUESSIT_CACHE_SIZE = 25000
 
         self._AUTOPOSTPROCESSOR_FREQUENCY = 10
         self._DAILYSEARCH_FREQUENCY = None
@@ -305,6 +319,7 @@ class MedusaApp(object):
         self.NO_DELETE = False
         self.KEEP_PROCESSED_DIR = False
         self.PROCESS_METHOD = None
+        self.POSTPROCESS_WORKERS = 1
         self.DELRARCONTENTS = False
         self.MOVE_ASSOCIATED_FILES = False
         self.POSTPONE_IF_SYNC_FILES = True
@@ -931,6 +946,16 @@ class MedusaApp(object):
         """Change LOG_DIR."""
         self.handle_prop('LOG_DIR', value)
 
+    @property
+    def showList(self):
+        """Return app.showList."""
+        return self._showList
+
+    @showList.setter
+    def showList(self, value):
+        """Change showList, keeping it indexed."""
+        self._showList = value if isinstance(value, ShowList) else ShowList(value)
+
     @property
     def NZB_DIR(self):
         """Return app.NZB_DIR."""
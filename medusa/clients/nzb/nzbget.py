@@ -254,13 +254,40 @@ def get_status(nzo_id):
 
     :return: ClientStatus object.
     """
-    from medusa.schedulers.download_handler import ClientStatus
-
     nzb = get_nzb_by_id(nzo_id)
-    status = None
     if not nzb:
         return False
 
+    return _client_status(nzb)
+
+
+def get_statuses(nzo_ids):
+    """
+    Return the status of multiple nzbs, from one queue and one history request.
+
+    :return: dict of ClientStatus objects by nzb id, None when NZBget couldn't be reached.
+    """
+    nzb_active = _get_nzb_queue()
+    nzb_history = _get_nzb_history()
+    if nzb_active is False and nzb_history is False:
+        return None
+
+    nzbs = {}
+    for nzb in (nzb_active or []) + (nzb_history or []):
+        nzbs.setdefault(nzb['NZBID'], nzb)
+
+    statuses = {}
+    for nzo_id in nzo_ids:
+        with suppress(ValueError):
+            if int(nzo_id) in nzbs:
+                statuses[nzo_id] = _client_status(nzbs[int(nzo_id)])
+    return statuses
+
+
+def _client_status(nzb):
+    """Return the ClientStatus for a queue or history group."""
+    from medusa.schedulers.download_handler import ClientStatus
+
     client_status = ClientStatus()
     # Map status to a standard ClientStatus.
     if '/' in nzb['Status']:
@@ -278,12 +278,37 @@ def get_status(nzo_id):
 
     :return: ClientStatus object.
     """
-    from medusa.schedulers.download_handler import ClientStatus
-
     nzb = get_nzb_by_id(nzo_id)
     if not nzb:
         return False
 
+    return _client_status(nzb)
+
+
+def get_statuses(nzo_ids):
+    """
+    Return the status of multiple nzbs, from one queue and one history request.
+
+    :return: dict of ClientStatus objects by nzo_id, None when sab couldn't be reached.
+    """
+    nzb_active = _get_nzb_queue()
+    nzb_history = _get_nzb_history()
+    if nzb_active is False and nzb_history is False:
+        return None
+
+    nzbs = {}
+    for data, key in ((nzb_active, 'queue'), (nzb_history, 'history')):
+        if data and data.get(key):
+            for nzb in data[key]['slots']:
+                nzbs.setdefault(nzb['nzo_id'], nzb)
+
+    return {nzo_id: _client_status(nzbs[nzo_id]) for nzo_id in nzo_ids if nzo_id in nzbs}
+
+
+def _client_status(nzb):
+    """Return the ClientStatus for a queue or history slot."""
+    from medusa.schedulers.download_handler import ClientStatus
+
     client_status = ClientStatus()
 
     if nzb['status'] in ('Paused', 'Downloading', 'Downloaded', 'Failed', 'Extracting', 'Completed'):
@@ -27,6 +27,43 @@ from six import text_type, viewitems
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
+TORRENT_STATUS_FIELDS = ['name', 'hash', 'progress', 'state', 'ratio', 'stop_ratio',
+                         'is_seed', 'is_finished', 'paused', 'files', 'download_location']
+
+
+def read_client_status(torrent):
+    """Return the ClientStatus for the torrent status from Deluge and Deluged client."""
+    client_status = ClientStatus()
+    if torrent['state'] == 'Downloading':
+        client_status.add_status_string('Downloading')
+
+    if torrent['paused']:
+        client_status.add_status_string('Paused')
+
+    # TODO: Find out which state the torrent get's when it fails.
+    # if torrent[1] & 16:
+    #     client_status.add_status_string('Failed')
+
+    if torrent['is_finished']:
+        client_status.add_status_string('Completed')
+
+    if torrent['ratio'] >= torrent['stop_ratio']:
+        client_status.add_status_string('Seeded')
+
+    # Store ratio
+    client_status.ratio = torrent['ratio']
+
+    # Store progress
+    client_status.progress = int(torrent['progress'])
+
+    # Store destination
+    client_status.destination = torrent['download_location']
+
+    # Store resource
+    client_status.resource = torrent['name']
+
+    return client_status
+
 
 def read_torrent_status(torrent_data):
     """Read torrent status from Deluge and Deluged client."""
@@ -480,8 +517,7 @@ class DelugeAPI(GenericClient):
             'method': 'core.get_torrent_status',
             'params': [
                 info_hash,
-                ['name', 'hash', 'progress', 'state', 'ratio', 'stop_ratio',
-                 'is_seed', 'is_finished', 'paused', 'files', 'download_location'],
+                TORRENT_STATUS_FIELDS,
             ],
             'id': 72,
         })
@@ -547,36 +583,30 @@ class DelugeAPI(GenericClient):
         if not torrent:
             return False
 
-        client_status = ClientStatus()
-        if torrent['state'] == 'Downloading':
-            client_status.add_status_string('Downloading')
+        return read_client_status(torrent)
 
-        if torrent['paused']:
-            client_status.add_status_string('Paused')
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents, in one request."""
+        if not info_hashes:
+            return {}
 
-        # TODO: Find out which state the torrent get's when it fails.
-        # if torrent[1] & 16:
-        #     client_status.add_status_string('Failed')
-
-        if torrent['is_finished']:
-            client_status.add_status_string('Completed')
-
-        if torrent['ratio'] >= torrent['stop_ratio']:
-            client_status.add_status_string('Seeded')
-
-        # Store ratio
-        client_status.ratio = torrent['ratio']
-
-        # Store progress
-        client_status.progress = int(torrent['progress'])
-
-        # Store destination
-        client_status.destination = torrent['download_location']
+        post_data = json.dumps({
+            'method': 'core.get_torrents_status',
+            'params': [
+                {'id': [info_hash.lower() for info_hash in info_hashes]},
+                TORRENT_STATUS_FIELDS,
+            ],
+            'id': 73,
+        })
 
-        # Store resource
-        client_status.resource = torrent['name']
+        log.debug('Checking {client} status of {count} torrents.', {'client': self.name, 'count': len(info_hashes)})
+        if not self._request(method='post', data=post_data) or self.response.json()['error']:
+            log.warning('Error while fetching the torrents status.')
+            return None
 
-        return client_status
+        torrents = self.response.json()['result']
+        return {info_hash: read_client_status(torrents[info_hash.lower()])
+                for info_hash in info_hashes if info_hash.lower() in torrents}
 
 
 api = DelugeAPI
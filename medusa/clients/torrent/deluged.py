@@ -15,10 +15,9 @@ from builtins import object
 from deluge_client import DelugeRPCClient
 
 from medusa import app
-from medusa.clients.torrent.deluge import read_torrent_status
+from medusa.clients.torrent.deluge import TORRENT_STATUS_FIELDS, read_client_status, read_torrent_status
 from medusa.clients.torrent.generic import GenericClient
 from medusa.logger.adapters.style import BraceAdapter
-from medusa.schedulers.download_handler import ClientStatus
 
 
 log = BraceAdapter(logging.getLogger(__name__))
@@ -236,36 +235,23 @@ class DelugeDAPI(GenericClient):
         if not torrent:
             return False
 
-        client_status = ClientStatus()
-        if torrent['state'] == 'Downloading':
-            client_status.add_status_string('Downloading')
+        return read_client_status(torrent)
 
-        if torrent['paused']:
-            client_status.add_status_string('Paused')
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents, in one request."""
+        if not info_hashes:
+            return {}
 
-        # TODO: Find out which state the torrent get's when it fails.
-        # if torrent[1] & 16:
-        #     client_status.add_status_string('Failed')
-
-        if torrent['is_finished']:
-            client_status.add_status_string('Completed')
-
-        if torrent['ratio'] >= torrent['stop_ratio']:
-            client_status.add_status_string('Seeded')
-
-        # Store ratio
-        client_status.ratio = torrent['ratio']
-
-        # Store progress
-        client_status.progress = int(torrent['progress'])
-
-        # Store destination
-        client_status.destination = torrent['download_location']
+        if not self.connect():
+            log.warning('Error while fetching torrents status')
+            return None
 
-        # Store resource
-        client_status.resource = torrent['name']
+        torrents = self.drpc._torrents_properties([info_hash.lower() for info_hash in info_hashes])
+        if torrents is None:
+            return None
 
-        return client_status
+        return {info_hash: read_client_status(torrents[info_hash.lower()])
+                for info_hash in info_hashes if info_hash.lower() in torrents}
 
 
 class DelugeRPC(object):
@@ -534,9 +520,7 @@ class DelugeRPC(object):
         try:
             self.connect()
             log.debug('Checking DelugeD torrent {hash} status.', {'hash': info_hash})
-            torrent_data = self.client.core.get_torrent_status(
-                info_hash, ('name', 'hash', 'progress', 'state', 'ratio', 'stop_ratio',
-                            'is_seed', 'is_finished', 'paused', 'files', 'download_location'))
+            torrent_data = self.client.core.get_torrent_status(info_hash, TORRENT_STATUS_FIELDS)
         except Exception:
             log.warning('Error while fetching torrent {hash} status.', {'hash': info_hash})
             return
@@ -546,5 +530,20 @@ class DelugeRPC(object):
             if self.client:
                 self.disconnect()
 
+    def _torrents_properties(self, info_hashes):
+        """Get the properties of the torrents with the given hashes, in one request."""
+        try:
+            self.connect()
+            log.debug('Checking DelugeD status of {count} torrents.', {'count': len(info_hashes)})
+            torrent_data = self.client.core.get_torrents_status({'id': info_hashes}, TORRENT_STATUS_FIELDS)
+        except Exception:
+            log.warning('Error while fetching the torrents status.')
+            return
+        else:
+            return torrent_data
+        finally:
+            if self.client:
+                self.disconnect()
+
 
 api = DelugeDAPI
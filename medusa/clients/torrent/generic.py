@@ -363,3 +363,31 @@ class GenericClient(object):
     def torrent_completed(self, info_hash):
         """Check if a specific torrent has finished seeding."""
         raise NotImplementedError
+
+    def get_status(self, info_hash):
+        """Return the status of a torrent.
+
+        :param info_hash:
+        :type info_hash: string
+        :return: the torrent status, or None when it's not found
+        :rtype: medusa.schedulers.download_handler.ClientStatus
+        """
+        raise NotImplementedError
+
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents.
+
+        Clients that can get the status of all torrents in one request, override this.
+
+        :param info_hashes:
+        :type info_hashes: list of string
+        :return: the status by info_hash, of the torrents that were found.
+            None when the statuses couldn't be fetched from the client.
+        :rtype: dict
+        """
+        statuses = {}
+        for info_hash in info_hashes:
+            status = self.get_status(info_hash)
+            if status:
+                statuses[info_hash] = status
+        return statuses
@@ -294,7 +294,7 @@ class QBittorrentAPI(GenericClient):
 
     @ttl_cache(60.0)
     def _get_torrents(self, filter=None, category=None, sort=None):
-        """Get all torrents from qbittorrent api."""
+        """Get all torrents from qbittorrent api, None when the request failed."""
         params = {}
         if self.api >= (2, 0, 0):
             self.url = urljoin(self.host, 'api/v2/torrents/info')
@@ -309,7 +309,7 @@ class QBittorrentAPI(GenericClient):
 
         if not self._request(method='get', params=params, cookies=self.session.cookies):
             log.warning('Error while fetching torrents.')
-            return []
+            return None
 
         return self.response.json()
 
@@ -378,20 +378,41 @@ class QBittorrentAPI(GenericClient):
 
         return get_status.progress
 
-    def get_status(self, info_hash):
-        """Return torrent status."""
-        # Set up the auth. We need it in the following methods.
+    def _check_auth(self):
+        """Set up the auth, or renew it after 30 minutes. We need it in the following methods."""
         if time.time() > self.last_time + 1800 or not self.auth:
             self.last_time = time.time()
             self._get_auth()
 
-        if not self.auth:
+        return bool(self.auth)
+
+    def get_status(self, info_hash):
+        """Return torrent status."""
+        if not self._check_auth():
             return
 
         torrent = self._torrent_properties(info_hash)
         if not torrent:
             return
 
+        return self._client_status(torrent)
+
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents, from one torrent list."""
+        if not self._check_auth():
+            return None
+
+        torrent_list = self._get_torrents()
+        if torrent_list is None:
+            return None
+
+        torrents = {torrent['hash'].lower(): torrent for torrent in torrent_list}
+        return {info_hash: self._client_status(torrents[info_hash.lower()])
+                for info_hash in info_hashes if info_hash.lower() in torrents}
+
+    @staticmethod
+    def _client_status(torrent):
+        """Return the ClientStatus for the torrent properties."""
         client_status = ClientStatus()
         if torrent['state'] in ('downloading', 'checkingDL', 'forcedDL', 'metaDL', 'queuedDL'):
             client_status.set_status_string('Downloading')
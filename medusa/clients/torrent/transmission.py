@@ -287,12 +287,14 @@ class TransmissionAPI(GenericClient):
 
         return self.check_response()
 
-    def _torrent_properties(self, info_hash):
-        """Get torrent properties."""
-        log.debug('Checking {client} torrent {hash} status.', {'client': self.name, 'hash': info_hash})
+    def _get_torrents(self, info_hashes):
+        """Get the properties of the torrents with the given hashes, in one request.
 
+        :return: the torrents, or None on error
+        :rtype: list of dict
+        """
         return_params = {
-            'ids': info_hash,
+            'ids': info_hashes,
             'fields': ['name', 'hashString', 'percentDone', 'status', 'percentDone', 'downloadDir',
                        'isStalled', 'errorString', 'seedRatioLimit', 'torrent-file', 'name',
                        'isFinished', 'uploadRatio', 'seedIdleLimit', 'activityDate']
@@ -301,10 +303,19 @@ class TransmissionAPI(GenericClient):
         post_data = json.dumps({'arguments': return_params, 'method': 'torrent-get'})
 
         if not self._request(method='post', data=post_data) or not self.check_response():
+            return None
+
+        return self.response.json()['arguments']['torrents']
+
+    def _torrent_properties(self, info_hash):
+        """Get torrent properties."""
+        log.debug('Checking {client} torrent {hash} status.', {'client': self.name, 'hash': info_hash})
+
+        torrent = self._get_torrents(info_hash)
+        if torrent is None:
             log.warning('Error while fetching torrent {hash} status.', {'hash': info_hash})
             return
 
-        torrent = self.response.json()['arguments']['torrents']
         if not torrent:
             log.debug('Could not locate torrent with {hash} status.', {'hash': info_hash})
             return
@@ -362,6 +373,26 @@ class TransmissionAPI(GenericClient):
         if not torrent:
             return
 
+        return self._client_status(torrent)
+
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents, in one request."""
+        if not info_hashes:
+            return {}
+
+        log.debug('Checking {client} status of {count} torrents.', {'client': self.name, 'count': len(info_hashes)})
+        torrents = self._get_torrents(info_hashes)
+        if torrents is None:
+            log.warning('Error while fetching the torrents status.')
+            return None
+
+        torrents = {torrent['hashString'].lower(): torrent for torrent in torrents}
+        return {info_hash: self._client_status(torrents[info_hash.lower()])
+                for info_hash in info_hashes if info_hash.lower() in torrents}
+
+    @staticmethod
+    def _client_status(torrent):
+        """Return the ClientStatus for the torrent properties."""
         client_status = ClientStatus()
         if torrent['status'] == 4:
             client_status.set_status_string('Downloading')
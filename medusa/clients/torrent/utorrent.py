@@ -247,6 +247,8 @@ class UTorrentAPI(GenericClient):
 
         Note! This is an expensive method. As when your looping through the history table to get a specific
         info_hash, it will get all torrents for each info_hash. We might want to cache this one.
+
+        :return: the torrents, False when the authentication failed or None when the request failed.
         """
         if not self.auth:
             if not self._get_auth():
@@ -256,7 +258,7 @@ class UTorrentAPI(GenericClient):
         params = {'list': 1}
         if not self._request(params=params):
             log.warning('Error while fetching torrents.')
-            return []
+            return None
 
         json_response = self.response.json()
         if json_response.get('torrents'):
@@ -346,6 +348,21 @@ class UTorrentAPI(GenericClient):
         if not torrent:
             return
 
+        return self._client_status(torrent)
+
+    def get_statuses(self, info_hashes):
+        """Return the status of multiple torrents, from one torrent list."""
+        torrent_list = self._get_torrents()
+        if torrent_list is None or torrent_list is False:
+            return None
+
+        torrents = {torrent[0].upper(): torrent for torrent in torrent_list}
+        return {info_hash: self._client_status(torrents[info_hash.upper()])
+                for info_hash in info_hashes if info_hash.upper() in torrents}
+
+    @staticmethod
+    def _client_status(torrent):
+        """Return the ClientStatus for the torrent properties."""
         client_status = ClientStatus()
         if torrent[1] & 1:
             client_status.set_status_string('Downloading')
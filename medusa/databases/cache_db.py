@@ -41,16 +41,27 @@ class InitialSchema(db.SchemaUpgrade):
         return self.connection.select(
             "SELECT name FROM sqlite_master WHERE type='table' AND name NOT IN ('lastUpdate',"
             " 'lastSearch', 'scene_names', 'network_timezones', 'scene_exceptions_refresh',"
-            " 'db_version', 'scene_exceptions', 'last_update');")
+            " 'db_version', 'scene_exceptions', 'last_update', 'provider_episodes', 'feed_state');")
 
     def clear_provider_tables(self):
         for provider in self._get_provider_tables():
             self.connection.action("DELETE FROM '{name}';".format(name=provider['name']))
 
+        self._clear_feed_state()
+
     def drop_provider_tables(self):
         for provider in self._get_provider_tables():
             self.connection.action("DROP TABLE '{name}';".format(name=provider['name']))
 
+        if self.hasTable('provider_episodes'):
+            self.connection.action('DELETE FROM provider_episodes;')
+        self._clear_feed_state()
+
+    def _clear_feed_state(self):
+        # The feeds are parsed again on the next update, to fill the emptied provider tables
+        if self.hasTable('feed_state'):
+            self.connection.action('DELETE FROM feed_state;')
+
     def inc_major_version(self):
         major_version, minor_version = self.connection.version
         major_version += 1
@@ -229,3 +240,86 @@ class RemoveSceneExceptionsTable(AddProviderTablesIdentifier):
     def execute(self):
         self.connection.action('DROP TABLE IF EXISTS scene_exceptions;')
         self.inc_major_version()
+
+
+class AddProviderEpisodes(RemoveSceneExceptionsTable):
+    """
+    Add the provider_episodes table.
+
+    It has a row for every episode of a provider cache entry, so episodes can be looked up
+    through an index instead of matching the `episodes` column with LIKE.
+    The existing cache entries are indexed per provider, when its cache table is opened.
+    """
+
+    def test(self):
+        """Test if the version is at least 5."""
+        return self.connection.version >= (5, None)
+
+    def execute(self):
+        self.connection.action(
+            'CREATE TABLE IF NOT EXISTS provider_episodes (provider TEXT, indexer NUMERIC, indexerid NUMERIC,'
+            ' season NUMERIC, episode NUMERIC, identifier TEXT);')
+        self.connection.action(
+            'CREATE INDEX IF NOT EXISTS idx_provider_episodes'
+            ' ON provider_episodes (provider, indexer, indexerid, season, episode);')
+        self.connection.action(
+            'CREATE UNIQUE INDEX IF NOT EXISTS idx_provider_episodes_identifier'
+            ' ON provider_episodes (provider, identifier, episode);')
+        self.inc_major_version()
+
+
+class AddFeedState(AddProviderEpisodes):
+    """
+    Add the feed_state table.
+
+    It has the validators (ETag, Last-Modified) and the hash of the feed of the last cache update
+    of every provider, so an unchanged feed isn't parsed again.
+    """
+
+    def test(self):
+        """Test if the version is at least 6."""
+        return self.connection.version >= (6, None)
+
+    def execute(self):
+        self.connection.action(
+            'CREATE TABLE IF NOT EXISTS feed_state (provider TEXT PRIMARY KEY, url TEXT, etag TEXT,'
+            ' last_modified TEXT, hash TEXT);')
+        self.inc_major_version()
+
+
+class ReindexSeasonPacks(AddFeedState):
+    """
+    Index the season packs in provider_episodes with their own episode number.
+
+    They were indexed as episode 0, like the specials. The episode index is dropped with its triggers,
+    so every provider cache table is indexed again when it's opened.
+    """
+
+    def test(self):
+        """Test if the version is at least 7."""
+        return self.connection.version >= (7, None)
+
+    def execute(self):
+        triggers = self.connection.select(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'provider_episodes_%';")
+        for trigger in triggers:
+            self.connection.action('DROP TRIGGER IF EXISTS [{name}];'.format(name=trigger['name']))
+        self.connection.action('DELETE FROM provider_episodes;')
+        self.inc_major_version()
+
+
+class AddFeedStateShows(ReindexSeasonPacks):
+    """
+    Add the hash of the show list to feed_state.
+
+    An unchanged feed is parsed again when a show was added, removed or renamed since the last cache update,
+    as its releases weren't cached.
+    """
+
+    def test(self):
+        """Test if the version is at least 8."""
+        return self.connection.version >= (8, None)
+
+    def execute(self):
+        self.connection.action('ALTER TABLE feed_state ADD COLUMN shows TEXT;')
+        self.inc_major_version()
@@ -9,7 +9,7 @@ import warnings
 
 from medusa import common, db, subtitles
 from medusa.databases import utils
-from medusa.helper.common import dateTimeFormat
+from medusa.helper.common import dateTimeFormat, resource_file_name
 from medusa.indexers.config import STATUS_MAP
 from medusa.logger.adapters.style import BraceAdapter
 from medusa.name_parser.parser import NameParser
@@ -141,6 +141,20 @@ class MainSanityCheck(db.DBSanityCheck):
             log.info(u'Missing idx_sta_epi_sta_air for TV Episodes table detected, fixing...')
             self.connection.action('CREATE INDEX idx_sta_epi_sta_air ON tv_episodes (season, episode, status, quality, airdate)')
 
+        if self.connection.hasColumn('history', 'resource_name') and \
+                not self.connection.select("PRAGMA index_info('idx_history_resource_name')"):
+            log.info(u'Missing idx_history_resource_name for History table detected, fixing...')
+            self.connection.action('CREATE INDEX idx_history_resource_name ON history (resource_name, action)')
+
+        if not self.connection.select("PRAGMA index_info('idx_history_date')"):
+            log.info(u'Missing idx_history_date for History table detected, fixing...')
+            self.connection.action('CREATE INDEX idx_history_date ON history (date)')
+
+        if self.connection.hasColumn('history', 'indexer_id') and \
+                not self.connection.select("PRAGMA index_info('idx_history_indexer_id_showid_date')"):
+            log.info(u'Missing idx_history_indexer_id_showid_date for History table detected, fixing...')
+            self.connection.action('CREATE INDEX idx_history_indexer_id_showid_date ON history (indexer_id, showid, date)')
+
     def fix_unaired_episodes(self):
 
         cur_date = datetime.date.today()
@@ -995,3 +1009,29 @@ class AddHistoryFDHFields(AddCustomLogs):
             self.addColumn('history', 'part_of_batch', 'INTEGER')
 
         self.inc_minor_version()
+
+
+class AddHistoryResourceName(AddHistoryFDHFields):
+    """Add an indexed resource_name column to the history table, to look up a resource by its file name."""
+
+    def test(self):
+        """Test if the version is at least 44.19."""
+        return self.connection.version >= (44, 19)
+
+    def execute(self):
+        utils.backup_database(self.connection.path, self.connection.version)
+
+        log.info(u'Adding column resource_name to the history table')
+        if not self.hasColumn('history', 'resource_name'):
+            self.addColumn('history', 'resource_name', 'TEXT', '')
+
+        log.info(u'Filling the resource_name column of the history table')
+        sql_results = self.connection.select('SELECT rowid, resource FROM history')
+        self.connection.executemany([[
+            'UPDATE history SET resource_name = ? WHERE rowid = ?',
+            [[resource_file_name(result['resource']), result['rowid']] for result in sql_results]
+        ]])
+
+        self.connection.action('CREATE INDEX IF NOT EXISTS idx_history_resource_name ON history (resource_name, action)')
+
+        self.inc_minor_version()
@@ -6,7 +6,7 @@ from __future__ import unicode_literals
 import logging
 import sys
 
-from medusa import helpers
+from medusa import db, helpers
 from medusa.logger.adapters.style import BraceAdapter
 
 from six import itervalues
@@ -19,6 +19,7 @@ log.logger.addHandler(logging.NullHandler())
 def backup_database(path, version):
     """Back up the database."""
     log.info('Backing up database before upgrade')
+    db.checkpoint()
     if not helpers.backup_versioned_file(path, version):
         log.error('Database backup failed, abort upgrading database')
         sys.exit(1)
@@ -27,6 +27,7 @@ import time
 import warnings
 from builtins import object
 from builtins import str
+from contextlib import contextmanager
 
 from medusa import app, logger
 from medusa.helper.exceptions import ex
@@ -34,8 +35,87 @@ from medusa.helper.exceptions import ex
 from six import itervalues, text_type
 
 
+# Number of idle read-only connections kept per database, next to its single writer connection
+READER_CONNECTIONS = 4
+# Most read-only connections open at once per database
+READER_MAX_CONNECTIONS = 8
+
 db_cons = {}
 db_locks = {}
+db_readers = {}
+
+
+class ReaderPool(object):
+    """A pool of read-only connections to a database in WAL mode.
+
+    In WAL mode readers don't block the writer and the writer doesn't block readers,
+    so selects run on one of these connections instead of waiting for the writer connection.
+    At most max_size connections are open, a thread waits for one to be given back. Only a thread
+    that already holds a connection, because it's streaming a query, gets an extra one right away.
+    """
+
+    def __init__(self, path, size=READER_CONNECTIONS, max_size=READER_MAX_CONNECTIONS):
+        """Initialize the pool, the connections are opened when needed."""
+        self.path = path
+        self.size = size
+        self.max_size = max_size
+        self.lock = threading.Condition()
+        self.idle = []
+        self.open = 0
+        self.closed = False
+        self.held = threading.local()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, 20, check_same_thread=False)
+        connection.text_factory = DBConnection._unicode_text_factory
+        connection.execute('PRAGMA query_only = ON')
+        return connection
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection from the pool."""
+        held = getattr(self.held, 'count', 0)
+        with self.lock:
+            # A nested read can't wait for the connections of the thread itself
+            while not self.idle and self.open >= self.max_size and not held:
+                self.lock.wait()
+            connection = self.idle.pop() if self.idle else None
+            if connection is None:
+                self.open += 1
+        if connection is None:
+            try:
+                connection = self._connect()
+            except Exception:
+                self._release(None)
+                raise
+
+        self.held.count = held + 1
+        try:
+            yield connection
+        finally:
+            self.held.count = held
+            self._release(connection)
+
+    def _release(self, connection):
+        """Give a connection back, closing it when it's not kept."""
+        with self.lock:
+            if connection is not None and not self.closed and len(self.idle) < self.size:
+                self.idle.append(connection)
+            else:
+                if connection is not None:
+                    connection.close()
+                self.open -= 1
+            self.lock.notify()
+
+    def close(self):
+        """Close the connections, the ones in use are closed when they are given back."""
+        with self.lock:
+            self.closed = True
+            for connection in self.idle:
+                connection.close()
+            self.open -= len(self.idle)
+            self.idle = []
+            self.lock.notify_all()
 
 
 class DBConnection(object):
@@ -52,6 +132,11 @@ class DBConnection(object):
                 self.connection = sqlite3.connect(self.path, 20, check_same_thread=False)
                 self.connection.text_factory = DBConnection._unicode_text_factory
 
+                readers = db_readers.pop(self.filename, None)
+                if readers:
+                    readers.close()
+                db_readers[self.filename] = self._configure_journal()
+
                 db_cons[self.filename] = self.connection
             else:
                 self.connection = db_cons[self.filename]
@@ -72,6 +157,27 @@ class DBConnection(object):
             logger.log(u'DB error: ' + ex(e), logger.ERROR)
             raise
 
+    def _configure_journal(self):
+        """
+        Switch the database to WAL mode, so it can be read while it's written
+
+        :return: a pool of read-only connections, or None when the database can't use WAL (e.g. on a network share)
+        """
+        journal_mode = self.connection.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+        if journal_mode.lower() != 'wal':
+            logger.log(u'{0}: WAL mode not available, using journal mode {1}'.format(
+                       self.filename, journal_mode), logger.DEBUG)
+            return None
+
+        # Committed transactions are safe after an application crash, only a power loss can undo the last ones
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        return ReaderPool(self.path)
+
+    @property
+    def readers(self):
+        """The pool of read-only connections, None when the database isn't in WAL mode."""
+        return db_readers.get(self.filename)
+
     @property
     def path(self):
         """
@@ -92,12 +198,16 @@ class DBConnection(object):
         once lock is aquired we can configure the connection for
         this particular instance of DBConnection
         """
+        self.connection.row_factory = self._row_factory
+
+    @property
+    def _row_factory(self):
+        """A dict for every row, or a compact sqlite3.Row for any other row_type (e.g. 'row')."""
         if self.row_type == 'dict':
-            self.connection.row_factory = DBConnection._dict_factory
-        else:
-            self.connection.row_factory = sqlite3.Row
+            return DBConnection._dict_factory
+        return sqlite3.Row
 
-    def _execute(self, query, args=None, fetchall=False, fetchone=False):
+    def _execute(self, query, args=None, fetchall=False, fetchone=False, connection=None):
         """
         Executes DB query
 
@@ -105,10 +215,11 @@ class DBConnection(object):
         :param args: Arguments in query
         :param fetchall: Boolean to indicate all results must be fetched
         :param fetchone: Boolean to indicate one result must be fetched (to walk results for instance)
+        :param connection: Connection to use, the writer connection by default
         :return: query results
         """
         try:
-            cursor = self.connection.cursor()
+            cursor = (connection or self.connection).cursor()
             if not args:
                 sql_results = cursor.execute(query)
             else:
@@ -245,6 +356,49 @@ class DBConnection(object):
 
             return sql_results
 
+    def executemany(self, querylist=None):
+        """
+        Execute multiple queries, each of them for a list of argument sets, in a single transaction
+
+        :param querylist: list of [query, list of args] lists
+        :return: list with the number of modified rows for each query
+        """
+        querylist = [q for q in querylist or [] if q and q[1]]
+
+        sql_results = []
+        attempt = 0
+
+        with db_locks[self.filename]:
+            self._set_row_factory()
+            while attempt < 5:
+                try:
+                    cursor = self.connection.cursor()
+                    for query, args in querylist:
+                        logger.log(u'{0}: {1} with {2} argument sets'.format(self.filename, query, len(args)), logger.DB)
+                        sql_results.append(cursor.executemany(query, args).rowcount)
+                    self.connection.commit()
+                    logger.log(u'Transaction with ' + str(len(sql_results)) + u' queries executed', logger.DEBUG)
+
+                    # finished
+                    break
+                except sqlite3.OperationalError as e:
+                    sql_results = []
+                    self._try_rollback()
+                    if 'unable to open database file' in e.args[0] or 'database is locked' in e.args[0]:
+                        logger.log(u'DB error: ' + ex(e), logger.WARNING)
+                        attempt += 1
+                        time.sleep(1)
+                    else:
+                        logger.log(u'DB error: ' + ex(e), logger.ERROR)
+                        raise
+                except sqlite3.DatabaseError as e:
+                    sql_results = []
+                    self._try_rollback()
+                    logger.log(u'Fatal error executing query: ' + ex(e), logger.ERROR)
+                    raise
+
+            return sql_results
+
     def _try_rollback(self):
         if not self.connection:
             return
@@ -303,6 +457,43 @@ class DBConnection(object):
 
             return sql_results
 
+    def _log_query(self, query, args):
+        if args is None:
+            logger.log(self.filename + ': ' + query, logger.DB)
+        else:
+            logger.log(self.filename + ': ' + query + ' with args ' + str(args), logger.DB)
+
+    def _read(self, query, args=None, fetchone=False):
+        """
+        Run a read-only query without a commit, on a reader connection when the database is in WAL mode
+
+        :param query: query string
+        :param args: arguments to query string
+        :param fetchone: Boolean to indicate only one result must be fetched
+        :return: query results
+        """
+        if query is None:
+            return
+
+        self._log_query(query, args)
+
+        readers = self.readers
+        if not readers:
+            with db_locks[self.filename]:
+                self._set_row_factory()
+                return self._execute(query, args, fetchall=not fetchone, fetchone=fetchone)
+
+        with readers.connection() as connection:
+            connection.row_factory = self._row_factory
+            cursor = self._execute(query, args, connection=connection)
+            if cursor is None:
+                return
+            try:
+                return cursor.fetchone() if fetchone else cursor.fetchall()
+            finally:
+                # End the read transaction, a pending statement would keep its snapshot of the database
+                cursor.close()
+
     def select(self, query, args=None):
         """
         Perform single select query on database
@@ -312,7 +503,7 @@ class DBConnection(object):
         :return: query results
         """
 
-        sql_results = self.action(query, args, fetchall=True)
+        sql_results = self._read(query, args)
 
         if sql_results is None:
             return []
@@ -327,13 +518,47 @@ class DBConnection(object):
         :param args: arguments to query string
         :return: query results
         """
-        sql_results = self.action(query, args, fetchone=True)
+        sql_results = self._read(query, args, fetchone=True)
 
         if sql_results is None:
             return []
 
         return sql_results
 
+    def select_iter(self, query, args=None):
+        """
+        Perform single select query on database, yielding the results while they are read
+
+        Large reads only keep the current row in memory, instead of all of them.
+        The rows are read from a snapshot of the database, taken when the iteration starts.
+        Use it with row_type='row' for compact rows, that can be accessed by name and by index.
+        The snapshot and its connection are held until the generator is exhausted or closed, which
+        blocks WAL checkpoints: iterate over all of it, or use it with contextlib.closing.
+
+        :param query: query string
+        :param args: arguments to query string
+        :return: generator of query results
+        """
+        readers = self.readers
+        if not readers:
+            # The writer connection can't be held while the results are used
+            for row in self.select(query, args):
+                yield row
+            return
+
+        self._log_query(query, args)
+
+        with readers.connection() as connection:
+            connection.row_factory = self._row_factory
+            cursor = self._execute(query, args, connection=connection)
+            if cursor is None:
+                return
+            try:
+                for row in cursor:
+                    yield row
+            finally:
+                cursor.close()
+
     def upsert(self, tableName, valueDict, keyDict):
         """
         Update values, or if no updates done, insert values
@@ -426,6 +651,18 @@ class DBConnection(object):
         self.action('UPDATE [%s] SET %s = ?' % (table, column), (default,))
 
 
+def checkpoint():
+    """Write the changes in the WAL files back into the databases, before the database files are copied."""
+    for filename, connection in list(db_cons.items()):
+        if not db_readers.get(filename):
+            continue
+        with db_locks[filename]:
+            try:
+                connection.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            except sqlite3.Error as e:
+                logger.log(u'{0}: WAL checkpoint failed: {1!r}'.format(filename, e), logger.WARNING)
+
+
 def sanityCheckDatabase(connection, sanity_check):
     sanity_check(connection).check()
 
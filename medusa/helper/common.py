@@ -292,6 +292,17 @@ def replace_extension(filename, new_extension):
     return filename
 
 
+def resource_file_name(resource):
+    """
+    Return the lowercase file name of a history ``resource``, used to look up the resource by an index.
+
+    The resource can be a release name or a path, using either path separator.
+    :param resource: The resource of a history item
+    :return: The lowercase file name of the ``resource``
+    """
+    return re.split(r'[\\/]', resource or '')[-1].lower()
+
+
 def sanitize_filename(filename):
     """
     Remove specific characters from the provided ``filename``.
@@ -41,7 +41,7 @@ import guessit
 from medusa import app, db
 from medusa.common import DOWNLOADED, USER_AGENT
 from medusa.helper.common import (http_code_description, media_extensions,
-                                  pretty_file_size, subtitle_extensions)
+                                  pretty_file_size, resource_file_name, subtitle_extensions)
 from medusa.helpers.utils import generate
 from medusa.imdb import Imdb
 from medusa.indexers.exceptions import IndexerException
@@ -1676,8 +1676,9 @@ def is_already_processed_media(full_filename):
     main_db_con = db.DBConnection()
     history_result = main_db_con.select('SELECT action FROM history '
                                         'WHERE action = ? '
+                                        'AND resource_name = ? '
                                         'AND resource LIKE ?',
-                                        [DOWNLOADED, '%' + full_filename])
+                                        [DOWNLOADED, resource_file_name(full_filename), '%' + full_filename])
     return bool(history_result)
 
 
@@ -3,7 +3,9 @@
 """General utility functions."""
 from __future__ import unicode_literals
 
-from builtins import str
+import threading
+from builtins import object, str
+from contextlib import contextmanager
 from datetime import datetime
 
 from dateutil import tz
@@ -142,3 +144,45 @@ def int_default(value, default=0):
     if value is not None:
         return int(value)
     return default
+
+
+class KeyedLock(object):
+    """A lock per key, for the keys that are in use, that can be held by up to size threads at the same time."""
+
+    def __init__(self, size=1):
+        """Initialize the locks."""
+        self.size = size
+        self.lock = threading.Lock()
+        # [lock, number of threads holding or waiting for it] by key
+        self.locks = {}
+
+    @contextmanager
+    def hold(self, *keys):
+        """
+        Hold the locks of all the keys.
+
+        The locks are always acquired in the same order, so two threads holding overlapping keys can't deadlock.
+        """
+        keys = sorted(set(keys))
+        with self.lock:
+            locks = []
+            for key in keys:
+                entry = self.locks.setdefault(key, [threading.Semaphore(self.size), 0])
+                entry[1] += 1
+                locks.append(entry[0])
+
+        acquired = []
+        try:
+            for lock in locks:
+                lock.acquire()
+                acquired.append(lock)
+            yield
+        finally:
+            for lock in reversed(acquired):
+                lock.release()
+            with self.lock:
+                for key in keys:
+                    entry = self.locks[key]
+                    entry[1] -= 1
+                    if not entry[1]:
+                        del self.locks[key]
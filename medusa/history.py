@@ -22,6 +22,7 @@ import datetime
 
 from medusa import db
 from medusa.common import FAILED, SNATCHED, SUBTITLED
+from medusa.helper.common import resource_file_name
 from medusa.schedulers.download_handler import ClientStatusEnum as ClientStatus
 from medusa.show.history import History
 
@@ -73,12 +74,12 @@ def _log_history_item(action, ep_obj, resource=None, provider=None, proper_tags=
         'INSERT INTO history '
         '(action, date, indexer_id, showid, season, episode, quality, '
         'resource, provider, version, proper_tags, manually_searched, '
-        'info_hash, size, provider_type, client_status, part_of_batch) '
-        'VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+        'info_hash, size, provider_type, client_status, part_of_batch, resource_name) '
+        'VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
         [action, log_date, ep_obj.series.indexer, ep_obj.series.series_id,
          ep_obj.season, ep_obj.episode, ep_obj.quality, resource, provider,
          version, proper_tags, manually_searched, info_hash, size,
-         provider_type, client_status, part_of_batch])
+         provider_type, client_status, part_of_batch, resource_file_name(resource)])
 
 
 def log_snatch(search_result):
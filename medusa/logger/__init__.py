@@ -19,12 +19,14 @@
 
 from __future__ import unicode_literals
 
+import copy
 import datetime
 import io
 import logging
 import os
 import pkgutil
 import re
+import sqlite3
 import sys
 from builtins import object
 from builtins import range
@@ -37,7 +39,7 @@ from logging import (
     NullHandler,
     WARNING,
 )
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 import adba
 
@@ -47,7 +49,7 @@ from medusa import app
 from medusa.init.logconfig import standard_logger
 
 from six import itervalues, string_types, text_type, viewitems
-from six.moves import collections_abc
+from six.moves import collections_abc, queue
 from six.moves.urllib.parse import quote
 
 import subliminal
@@ -67,9 +69,14 @@ LOGGING_LEVELS = {
     'DB': DB,
 }
 
+# The lines written to the log file are stored in this database too, for the log viewer
+LOG_STORE_SUFFIX = '.db'
+
 FORMATTER_PATTERN = '%(asctime)s %(levelname)-8s %(threadName)s :: [%(curhash)s] %(message)s'
 censored_items = {}
 censored = []
+# One pattern matching all the censored items, None when there's nothing to censor
+censored_re = None
 
 
 def rebuild_censored_list():
@@ -106,6 +113,9 @@ def rebuild_censored_list():
     # replace
     censored[:] = results
 
+    global censored_re
+    censored_re = re.compile('|'.join(re.escape(item) for item in results)) if results else None
+
 
 def list_modules(package):
     """Return all sub-modules for the specified package.
@@ -605,15 +615,17 @@ class CensoredFormatter(logging.Formatter, object):
 
             # Change the SSL error to a warning with a link to information about how to fix it.
             # Check for u'error [SSL: SSLV3_ALERT_HANDSHAKE_FAILURE] sslv3 alert handshake failure (_ssl.c:590)'
-            for ssl_error in self.ssl_errors:
-                if ssl_error.findall(msg):
-                    record.levelno = WARNING
-                    record.levelname = logging.getLevelName(record.levelno)
-                    msg = super(CensoredFormatter, self).format(record)
-                    msg = ssl_error.sub('See: https://git.io/vVaIj', msg)
-
-            for item in censored:
-                msg = msg.replace(item, '**********')  # must not give any hint about the length
+            if 'SSL' in msg:
+                for ssl_error in self.ssl_errors:
+                    if ssl_error.findall(msg):
+                        record.levelno = WARNING
+                        record.levelname = logging.getLevelName(record.levelno)
+                        msg = super(CensoredFormatter, self).format(record)
+                        msg = ssl_error.sub('See: https://git.io/vVaIj', msg)
+
+            # The longest items come first in the pattern, so an item is censored entirely
+            if censored_re:
+                msg = censored_re.sub('**********', msg)  # must not give any hint about the length
 
         level = record.levelno
         if level in (WARNING, ERROR):
@@ -626,6 +638,62 @@ class CensoredFormatter(logging.Formatter, object):
         return msg
 
 
+class LogQueueListener(QueueListener, object):
+    """Listener thread that flushes its handlers whenever it has written all the queued records."""
+
+    def handle(self, record):
+        """Write the record, and flush the handlers when no record is queued after it.
+
+        :param record:
+        :type record: logging.LogRecord
+        """
+        super(LogQueueListener, self).handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+class LogQueueHandler(QueueHandler, object):
+    """Queue the log records for a listener thread, which formats, censors and writes them.
+
+    The thread that logs only merges the arguments and the traceback into the message.
+    """
+
+    exc_formatter = logging.Formatter()
+
+    def __init__(self, handlers):
+        """Constructor, starts the listener thread."""
+        super(LogQueueHandler, self).__init__(queue.Queue())
+        self.listener = LogQueueListener(self.queue, *handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def prepare(self, record):
+        """Prepare the record to be formatted in another thread.
+
+        :param record:
+        :type record: logging.LogRecord
+        :return:
+        :rtype: logging.LogRecord
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def set_handlers(self, handlers):
+        """Replace the handlers of the listener thread."""
+        self.listener.handlers = tuple(handlers)
+
+    def close(self):
+        """Write the queued records and stop the listener thread."""
+        if self.listener._thread:
+            self.listener.stop()
+        super(LogQueueHandler, self).close()
+
+
 class Logger(object):
     """Custom Logger."""
 
@@ -637,6 +705,17 @@ class Logger(object):
         self.log_file = None
         self.file_handler = None
         self.console_handler = None
+        self.queue_handler = None
+
+    @property
+    def handlers(self):
+        """The handlers that write the log records."""
+        return [handler for handler in (self.console_handler, self.file_handler) if handler]
+
+    @property
+    def log_store(self):
+        """The store of the lines written to the log file, None when it couldn't be opened."""
+        return getattr(self.file_handler, 'store', None)
 
     def init_logging(self, console_logging):
         """Initialize logging.
@@ -670,34 +749,47 @@ class Logger(object):
         if console_logging:
             console = logging.StreamHandler()
             console.setFormatter(CensoredFormatter(FORMATTER_PATTERN, dateTimeFormat))
-
-            for logger in self.loggers:
-                logger.addHandler(console)
             self.console_handler = console
 
         self.reconfigure_levels()
         self.reconfigure_file_handler()
 
+        # The records are written by a listener thread, instead of the thread that logs them
+        self.queue_handler = LogQueueHandler(self.handlers)
+        for logger in self.loggers:
+            logger.addHandler(self.queue_handler)
+
     def reconfigure_file_handler(self):
         """Reconfigure rotating file handler."""
         from medusa.helper.common import dateTimeFormat
+        from medusa.logger.store import LogStore, LogStoreHandler
         target_file = os.path.join(app.LOG_DIR, app.LOG_FILENAME)
         target_size = int(app.LOG_SIZE * 1024 * 1024)
         target_number = int(app.LOG_NR)
         if not self.file_handler or self.log_file != target_file or self.file_handler.backupCount != target_number or self.file_handler.maxBytes != target_size:
-            file_handler = RotatingFileHandler(target_file, maxBytes=target_size, backupCount=target_number, encoding='utf-8')
+            try:
+                store = LogStore(target_file + LOG_STORE_SUFFIX)
+            except sqlite3.Error as error:
+                self.logger.warning('Unable to open the log store, the log viewer reads the log files: %s', error)
+                store = None
+            if store:
+                file_handler = LogStoreHandler(target_file, store, maxBytes=target_size, backupCount=target_number,
+                                               encoding='utf-8')
+            else:
+                file_handler = RotatingFileHandler(target_file, maxBytes=target_size, backupCount=target_number,
+                                                   encoding='utf-8')
             file_handler.setFormatter(CensoredFormatter(FORMATTER_PATTERN, dateTimeFormat))
             file_handler.setLevel(self.log_level)
 
-            for logger in self.loggers:
-                if self.file_handler:
-                    logger.removeHandler(self.file_handler)
-                    self.file_handler.close()
-                logger.addHandler(file_handler)
-
+            previous_handler = self.file_handler
             self.log_file = target_file
             self.file_handler = file_handler
 
+            if self.queue_handler:
+                self.queue_handler.set_handlers(self.handlers)
+            if previous_handler:
+                previous_handler.close()
+
     def reconfigure_levels(self):
         """Adjust the log levels for some modules."""
         self.log_level = get_default_level()
@@ -0,0 +1,295 @@
+# coding=utf-8
+"""Structured store of the log lines, written alongside the log files.
+
+The log viewer filters by level, thread and time and searches the messages with indexes,
+instead of reading the log files backwards for every request.
+"""
+from __future__ import unicode_literals
+
+import io
+import os
+import sqlite3
+import time
+from contextlib import closing
+from logging.handlers import RotatingFileHandler
+
+from medusa.logger import LOGGING_LEVELS, LogLine, read_loglines
+
+from six import text_type
+
+# The id is the rowid, so it's part of every index: the lines of a level or a thread are read newest first
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS log_lines (id INTEGER PRIMARY KEY, timestamp INTEGER NOT NULL, level INTEGER, '
+    'thread TEXT, message TEXT, extra TEXT, line TEXT NOT NULL)',
+    'CREATE INDEX IF NOT EXISTS idx_log_lines_level ON log_lines (level)',
+    'CREATE INDEX IF NOT EXISTS idx_log_lines_thread ON log_lines (thread, level)',
+    'CREATE INDEX IF NOT EXISTS idx_log_lines_timestamp ON log_lines (timestamp)',
+]
+
+# The trigram tokenizer matches any substring of at least 3 characters, like the search of the log files did.
+# The index is written by the store, as triggers make writing it several times slower.
+SEARCH_SCHEMA = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS log_search USING fts5(message, extra, content='log_lines', "
+    "content_rowid='id', tokenize='trigram')",
+]
+SEARCH_MIN_LENGTH = 3
+# Most lines to append in one transaction, they're committed sooner when the handler is flushed
+COMMIT_LINES = 1000
+
+
+def to_timestamp(value):
+    """Return the seconds since the epoch of a local datetime."""
+    return int(time.mktime(value.timetuple()))
+
+
+class LogStore(object):
+    """The log lines in a SQLite database, with the fields the log viewer filters on.
+
+    Lines are only appended, so their id follows the order of the log files.
+    """
+
+    def __init__(self, path):
+        """Open the store, creating it when it doesn't exist.
+
+        :param path: the database file
+        :type path: str
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode = WAL')
+        self.connection.execute('PRAGMA synchronous = NORMAL')
+        for query in SCHEMA:
+            self.connection.execute(query)
+        try:
+            for query in SEARCH_SCHEMA:
+                self.connection.execute(query)
+            self.search = True
+        except sqlite3.OperationalError:
+            # No FTS5 or trigram tokenizer, the messages are searched by scanning
+            self.search = False
+
+        self.pending = 0
+        # A new store is filled with the existing log files first
+        self.pending_import = self.connection.execute('SELECT 1 FROM log_lines LIMIT 1').fetchone() is None
+
+    @staticmethod
+    def _row(logline, line):
+        timestamp = to_timestamp(logline.timestamp)
+        return timestamp, LOGGING_LEVELS.get(logline.level_name), logline.thread_name, logline.message, \
+            logline.extra, line
+
+    def append(self, line):
+        """Append a formatted log line, with its traceback.
+
+        :param line:
+        :type line: str
+        """
+        logline = LogLine.from_line(line)
+        if not logline:
+            return
+
+        if not self.connection.in_transaction:
+            self.connection.execute('BEGIN')
+        row = self._row(logline, line)
+        cursor = self.connection.execute(
+            'INSERT INTO log_lines (timestamp, level, thread, message, extra, line) VALUES (?, ?, ?, ?, ?, ?)', row
+        )
+        if self.search:
+            self.connection.execute('INSERT INTO log_search (rowid, message, extra) VALUES (?, ?, ?)',
+                                    [cursor.lastrowid, logline.message, logline.extra])
+        self.pending += 1
+        if self.pending >= COMMIT_LINES:
+            self.commit()
+
+    def commit(self):
+        """Commit the appended lines, so they can be read. Does nothing once the store is closed."""
+        if self.connection and self.connection.in_transaction:
+            self.connection.execute('COMMIT')
+        self.pending = 0
+
+    def import_files(self, log_file):
+        """Import the lines of the log files, older than the lines already stored.
+
+        :param log_file: the current log file
+        :type log_file: str
+        :return: the number of imported lines
+        :rtype: int
+        """
+        self.pending_import = False
+        self.commit()
+        first_id = self.connection.execute('SELECT MIN(id) FROM log_lines').fetchone()[0] or 1
+
+        rows = []
+        # read_loglines returns the newest lines first, the older ones get lower ids
+        for logline in read_loglines(log_file):
+            if logline.timestamp:
+                first_id -= 1
+                rows.append((first_id,) + self._row(logline, text_type(logline)))
+
+        rows.reverse()
+        with self.connection:
+            self.connection.execute('BEGIN')
+            self.connection.executemany(
+                'INSERT INTO log_lines (id, timestamp, level, thread, message, extra, line) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)', rows
+            )
+            if self.search:
+                # In ascending order, the full-text index is written once
+                self.connection.executemany('INSERT INTO log_search (rowid, message, extra) VALUES (?, ?, ?)',
+                                            [(row[0], row[4], row[5]) for row in rows])
+        return len(rows)
+
+    def prune(self, timestamp):
+        """Remove the lines older than a timestamp.
+
+        :param timestamp: seconds since the epoch
+        :type timestamp: int
+        """
+        if not self.connection.in_transaction:
+            self.connection.execute('BEGIN')
+        if self.search:
+            self.connection.execute(
+                'INSERT INTO log_search (log_search, rowid, message, extra) '
+                "SELECT 'delete', id, message, extra FROM log_lines WHERE timestamp < ?", [timestamp]
+            )
+        self.connection.execute('DELETE FROM log_lines WHERE timestamp < ?', [timestamp])
+        self.commit()
+
+    def read(self, min_level=None, thread_name=None, search_query=None, modification_time=None,
+             offset=0, limit=50):
+        """Return the log lines that match the filter, newest first.
+
+        Without a search, the newest offset + limit lines of every level and thread are read from
+        their index and merged, so the size of the store and the number of lines that don't match
+        don't matter.
+
+        :param min_level:
+        :type min_level: int
+        :param thread_name:
+        :type thread_name: set or text_type
+        :param search_query:
+        :type search_query: str
+        :param modification_time: only the lines from this time on
+        :type modification_time: datetime.datetime
+        :param offset: the number of matching lines to skip
+        :type offset: int
+        :param limit: the maximum number of lines
+        :type limit: int
+        :return:
+        :rtype: list of LogLine
+        """
+        levels = sorted(level for level in LOGGING_LEVELS.values() if min_level is None or level >= min_level)
+        threads = sorted(thread_name) if isinstance(thread_name, set) else [thread_name] if thread_name else []
+
+        with closing(sqlite3.connect(self.path)) as connection:
+            conditions = []
+            args = []
+            if modification_time:
+                first_line = connection.execute(
+                    'SELECT id FROM log_lines WHERE timestamp >= ? ORDER BY timestamp LIMIT 1',
+                    [to_timestamp(modification_time)]
+                ).fetchone()
+                if not first_line:
+                    return []
+                conditions.append('id >= ?')
+                args.append(first_line[0])
+
+            if search_query and self.search and len(search_query) >= SEARCH_MIN_LENGTH:
+                # The matches are looked up in the full-text index, then filtered
+                query = ('SELECT line FROM log_lines WHERE id IN (SELECT rowid FROM log_search WHERE log_search MATCH ?) '
+                         'AND level IN ({levels})'.format(levels=', '.join('?' * len(levels))))
+                args = ['"{0}"'.format(search_query.replace('"', '""'))] + levels + args
+                if threads:
+                    query += ' AND thread IN ({threads})'.format(threads=', '.join('?' * len(threads)))
+                    args += threads
+                query = ' AND '.join([query] + conditions)
+            else:
+                if search_query:
+                    conditions.append('(instr(lower(message), ?) OR instr(lower(extra), ?))')
+                    args += [search_query.lower()] * 2
+
+                # One index range for every level and thread, each limited to the lines that can be on the page
+                selects = []
+                select_args = []
+                for thread in threads or [None]:
+                    for level in levels:
+                        where = ['level = ?'] + (['thread = ?'] if thread else []) + conditions
+                        selects.append('SELECT id FROM (SELECT id FROM log_lines WHERE {where} '
+                                       'ORDER BY id DESC LIMIT ?)'.format(where=' AND '.join(where)))
+                        select_args += [level] + ([thread] if thread else []) + args + [offset + limit]
+                query = 'SELECT line FROM log_lines WHERE id IN ({selects})'.format(selects=' UNION ALL '.join(selects))
+                args = select_args
+
+            query += ' ORDER BY id DESC LIMIT ? OFFSET ?'
+            rows = connection.execute(query, args + [limit, offset]).fetchall()
+
+        return [LogLine.from_line(row[0]) for row in rows]
+
+    def close(self):
+        """Commit the appended lines and close the store."""
+        if self.connection:
+            self.commit()
+            self.connection.close()
+            self.connection = None
+
+
+class LogStoreHandler(RotatingFileHandler, object):
+    """Rotating file handler that appends every line it writes to a log store too."""
+
+    def __init__(self, filename, store, **kwargs):
+        """Constructor.
+
+        :param filename: the log file
+        :param store: the log store
+        :type store: LogStore
+        """
+        super(LogStoreHandler, self).__init__(filename, **kwargs)
+        self.store = store
+
+    def emit(self, record):
+        """Write the record to the log file and the store.
+
+        :param record:
+        :type record: logging.LogRecord
+        """
+        try:
+            # The log files are imported before the first line is written to them
+            if self.store.pending_import:
+                self.store.import_files(self.baseFilename)
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record)
+            self.stream.write(msg + self.terminator)
+            # Only the log file, the store is committed when the handler is flushed after the queued records
+            super(LogStoreHandler, self).flush()
+            self.store.append(msg)
+        except Exception:
+            self.handleError(record)
+
+    def flush(self):
+        """Flush the log file and commit the lines appended to the store."""
+        super(LogStoreHandler, self).flush()
+        self.store.commit()
+
+    def doRollover(self):
+        """Rotate the log files and remove the lines that aren't in any log file anymore."""
+        super(LogStoreHandler, self).doRollover()
+        oldest = time.time()
+        # The first line of the oldest log file that isn't empty
+        for index in range(self.backupCount, 0, -1):
+            log_file = '{0}.{1}'.format(self.baseFilename, index)
+            if not os.path.isfile(log_file):
+                continue
+            with io.open(log_file, 'r', encoding='utf-8', errors='replace') as f:
+                logline = LogLine.from_line(f.readline().rstrip('\n'))
+            if logline:
+                oldest = to_timestamp(logline.timestamp)
+                break
+        self.store.prune(oldest)
+
+    def close(self):
+        """Close the log file and the store."""
+        super(LogStoreHandler, self).close()
+        self.store.close()
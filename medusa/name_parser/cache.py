@@ -1,6 +1,6 @@
 # coding=utf-8
 
-"""A thread-safe cache with a max size."""
+"""A thread-safe LRU cache with a max size."""
 
 import logging
 from collections import OrderedDict
@@ -13,13 +13,21 @@ log.logger.addHandler(logging.NullHandler())
 
 
 class BaseCache(object):
-    """Base cache."""
+    """Base cache.
+
+    The least recently used items are evicted first, when the cache is full.
+    Lookups don't take the lock: the OrderedDict operations are atomic, and only the changes are serialized.
+    """
 
     def __init__(self, max_size=1000):
         """Initialize the cache with a maximum size."""
         self.cache = OrderedDict()
         self.max_size = max_size
         self.lock = Lock()
+        # The counters aren't updated under the lock, so they're approximate with concurrent lookups
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
 
     def add(self, name, value):
         """Add a cache item to the cache.
@@ -30,9 +38,11 @@ class BaseCache(object):
         :type value: object
         """
         with self.lock:
-            while len(self.cache) >= self.max_size:
-                self.cache.popitem(last=False)
+            if name in self.cache:
+                self._removed(name, self.cache.pop(name))
+            self._evict(self.max_size - 1)
             self.cache[name] = value
+            self._added(name, value)
 
     def get(self, name):
         """Return a cache item from the cache.
@@ -42,18 +52,76 @@ class BaseCache(object):
         :return:
         :rtype: object
         """
-        with self.lock:
-            if name in self.cache:
-                log.debug('Using cache item for {name}', {'name': name})
-                return self.cache[name]
+        value = self.cache.get(name)
+        if value is None:
+            self.misses += 1
+            return None
+
+        try:
+            self.cache.move_to_end(name)
+        except KeyError:
+            # Removed by another thread in the meantime
+            pass
+        self.hits += 1
+        return value
+
+    def get_many(self, names):
+        """Return the cache items found for the given names.
+
+        :param names:
+        :type names: list of str
+        :return: the cached items by name
+        :rtype: dict
+        """
+        results = {}
+        for name in names:
+            value = self.get(name)
+            if value is not None:
+                results[name] = value
+        return results
 
     def remove(self, name):
         """Remove a cache item given name."""
         with self.lock:
-            del self.cache[name]
+            self._removed(name, self.cache.pop(name))
             log.debug('Removed cache item for {name}', {'name': name})
 
     def clear(self):
         """Removes all items from the cache."""
         with self.lock:
             self.cache.clear()
+            self._cleared()
+
+    def resize(self, max_size):
+        """Change the maximum size of the cache, evicting the least recently used items that don't fit."""
+        with self.lock:
+            self.max_size = max_size
+            self._evict(max_size)
+
+    def stats(self):
+        """Return the size and the hit, miss and eviction counters of the cache.
+
+        :rtype: dict
+        """
+        return {
+            'size': len(self.cache),
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
+    def _evict(self, size):
+        """Evict the least recently used items, until at most `size` items are left. Called under the lock."""
+        while self.cache and len(self.cache) > max(0, size):
+            self._removed(*self.cache.popitem(last=False))
+            self.evictions += 1
+
+    def _added(self, name, value):
+        """Hook called under the lock, after an item was added."""
+
+    def _removed(self, name, value):
+        """Hook called under the lock, after an item was removed or evicted."""
+
+    def _cleared(self):
+        """Hook called under the lock, after the cache was cleared."""
@@ -5,7 +5,12 @@ from __future__ import unicode_literals
 
 import logging
 import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import timedelta
+from itertools import repeat
 from time import time
 
 from medusa import app
@@ -18,6 +23,9 @@ log.logger.addHandler(logging.NullHandler())
 
 EXPECTED_TITLES_EXPIRATION_TIME = timedelta(days=1).total_seconds()
 
+# Minimum number of names to guess, before the worker pool is used
+POOL_MIN_NAMES = 20
+
 # release group exception list
 expected_groups = [
     # release groups with numbers
@@ -73,21 +81,107 @@ def guessit(name, options=None):
     :rtype: dict
     """
     start_time = time()
+    final_options, invalidation_key = _get_options(options)
+
+    result = guessit_cache.get_or_invalidate(name, invalidation_key)
+    if not result:
+        result = default_api.guessit(name, options=final_options)
+        guessit_cache.add(name, result)
+
+    result['parsing_time'] = time() - start_time
+    return result
+
+
+def guessit_many(names, options=None, workers=1):
+    """Guess the episode information from multiple release names.
+
+    The names that are not cached yet, are guessed in a pool of worker processes
+    when `workers` is more than 1, and there are at least POOL_MIN_NAMES of them.
+
+    :param names: the release names
+    :type names: list of str
+    :param options:
+    :type options: dict
+    :param workers: number of worker processes
+    :type workers: int
+    :return: the guessed properties, or the raised exception, for each name in the same order as `names`
+    :rtype: list of dict or Exception
+    """
+    final_options, invalidation_key = _get_options(options)
+    guessit_cache.validate(invalidation_key)
+    results = guessit_cache.get_many(names)
+    missing = [name for name in OrderedDict.fromkeys(names) if name not in results]
+
+    start_time = time()
+    guesses = []
+    if workers > 1 and len(missing) >= POOL_MIN_NAMES:
+        guesses = _guess_in_pool(missing, final_options, workers)
+    if not guesses:
+        guesses = [_guess(name, final_options, catch=False) for name in missing]
+
+    parsing_time = (time() - start_time) / max(1, len(missing))
+    for name, guess in zip(missing, guesses):
+        if guess is None:
+            # Guess it again, to get the exception raised by the worker
+            guess = _guess(name, final_options, catch=False)
+        if not isinstance(guess, Exception):
+            guess['parsing_time'] = parsing_time
+            guessit_cache.add(name, guess)
+        results[name] = guess
+
+    return [results[name] for name in names]
+
+
+def _get_options(options):
+    """Return the guessit options and the object to invalidate the guessit cache with."""
     final_options = dict(options) if options else dict(show_type='normal')
+    titles, titles_version = expected_titles.get(app.showList)
+
+    # The expected titles are versioned, so they don't have to be compared to invalidate the cache
+    invalidation_key = titles_version, sorted(final_options.items())
     final_options.update(dict(type='episode', implicit=True,
                               episode_prefer_number=final_options.get('show_type') == 'anime',
-                              expected_title=get_expected_titles(app.showList),
+                              expected_title=titles,
                               expected_group=expected_groups,
                               allowed_languages=allowed_languages,
                               allowed_countries=allowed_countries))
 
-    result = guessit_cache.get_or_invalidate(name, final_options)
-    if not result:
-        result = default_api.guessit(name, options=final_options)
-        guessit_cache.add(name, result)
+    return final_options, invalidation_key
 
-    result['parsing_time'] = time() - start_time
-    return result
+
+def _guess(name, options, catch=True):
+    """Guess a single name, returns a plain dict so the result can be sent back from a worker process.
+
+    :param catch: return None instead of raising an exception, as not every exception can be pickled.
+    """
+    try:
+        return OrderedDict(default_api.guessit(name, options=options))
+    except Exception as error:
+        if catch:
+            return None
+        return error
+
+
+def _guess_in_pool(names, options, workers):
+    """Guess the names in the process pool, returns an empty list if the pool can't be used."""
+    global guessit_pool
+
+    with guessit_pool_lock:
+        if guessit_pool is None or guessit_pool[0] != workers:
+            if guessit_pool is not None:
+                guessit_pool[1].shutdown(wait=False)
+            guessit_pool = workers, ProcessPoolExecutor(max_workers=workers)
+        pool = guessit_pool[1]
+
+    chunk_size = max(1, len(names) // (workers * 4))
+    try:
+        return list(pool.map(_guess, names, repeat(options, len(names)), chunksize=chunk_size))
+    except BrokenProcessPool as error:
+        log.warning('GuessIt worker pool stopped working, guessing names in the current process: {error!r}',
+                    {'error': error})
+        with guessit_pool_lock:
+            guessit_pool = None
+        return []
 
 
 def get_expected_titles(show_list):
@@ -103,24 +197,113 @@ def get_expected_titles(show_list):
     """
     expected_titles = []
     for show in show_list:
-        exceptions = {show.name}.union({alias.title for alias in show.aliases})
-        for exception in exceptions:
-            if exception.isdigit():
-                # do not add numbers to expected titles.
-                continue
+        expected_titles.extend(get_series_expected_titles(show))
+
+    return expected_titles
 
-            match = series_re.match(exception)
-            if not match:
-                continue
 
-            if not any(char.isdigit() or char == '-' for char in exception):
-                continue
+def get_series_expected_titles(show):
+    """Return the expected titles of a single show, used by `get_expected_titles`.
 
-            expected_titles.append(exception)
+    :param show:
+    :type show: medusa.tv.Series
+    :return:
+    :rtype: list of str
+    """
+    expected_titles = []
+    exceptions = {show.name}.union({alias.title for alias in show.aliases})
+    for exception in exceptions:
+        if exception.isdigit():
+            # do not add numbers to expected titles.
+            continue
+
+        match = series_re.match(exception)
+        if not match:
+            continue
+
+        if not any(char.isdigit() or char == '-' for char in exception):
+            continue
+
+        expected_titles.append(exception)
 
     return expected_titles
 
 
+class ExpectedTitles(object):
+    """Expected titles of the show list, maintained incrementally.
+
+    The titles of a show are computed once, and again after the show is invalidated.
+    The list of titles is versioned, the version is increased each time the titles change.
+    """
+
+    def __init__(self):
+        """Initialize the expected titles."""
+        self.lock = threading.Lock()
+        self.state = [], 0
+        self.series_titles = {}
+        self.show_list = None
+        self.show_list_version = None
+
+    def get(self, show_list):
+        """Return the expected titles for the show list and their version.
+
+        :param show_list:
+        :type show_list: medusa.show.show_list.ShowList
+        :return: tuple of the expected titles and their version
+        :rtype: tuple(list of str, int)
+        """
+        # A plain list isn't versioned, so the titles are collected every time.
+        show_list_version = getattr(show_list, 'version', None)
+        if show_list_version is not None and show_list is self.show_list and show_list_version == self.show_list_version:
+            return self.state
+
+        with self.lock:
+            titles = []
+            series_titles = {}
+            for show in show_list:
+                cached = self.series_titles.get(id(show))
+                # Keeping a reference to the show, makes sure its id isn't reused
+                if cached is None or cached[0] is not show:
+                    cached = show, get_series_expected_titles(show)
+                series_titles[id(show)] = cached
+                titles.extend(cached[1])
+
+            self.series_titles = series_titles
+            previous_titles, version = self.state
+            if titles != previous_titles:
+                self.state = titles, version + 1
+            self.show_list = show_list
+            self.show_list_version = show_list_version
+            return self.state
+
+    def get_series(self, show):
+        """Return the expected titles of a single show, sorted.
+
+        :param show:
+        :type show: medusa.tv.Series
+        :rtype: list of str
+        """
+        with self.lock:
+            cached = self.series_titles.get(id(show))
+            if cached is None or cached[0] is not show:
+                cached = show, get_series_expected_titles(show)
+                self.series_titles[id(show)] = cached
+            return sorted(cached[1])
+
+    def invalidate(self, show=None):
+        """Compute the expected titles of a show again, or those of all shows if no show is given.
+
+        :param show:
+        :type show: medusa.tv.Series
+        """
+        with self.lock:
+            if show is None:
+                self.series_titles.clear()
+            else:
+                self.series_titles.pop(id(show), None)
+            self.show_list = None
+
+
 class GuessItCache(BaseCache):
     """GuessIt cache."""
 
@@ -130,19 +313,37 @@ class GuessItCache(BaseCache):
         self.invalidation_object = None
 
     def get_or_invalidate(self, name, obj):
-        """Return an item from the cache if the obj matches the previous invalidation object. Clears the cache and returns None if not."""
+        """Return an item from the cache if the obj matches the previous invalidation object. Clears the cache and returns None if not.
+
+        The invalidation object is compared for every lookup, keep it small.
+        """
+        if self.validate(obj):
+            return self.get(name)
+
+        return None
+
+    def validate(self, obj):
+        """Clear the cache if the obj doesn't match the previous invalidation object.
+
+        :return: True if the cache was still valid
+        :rtype: bool
+        """
         if not self.invalidation_object:
             self.invalidation_object = obj
 
         if self.invalidation_object == obj:
-            log.debug('Using guessit cache item for {name}', {'name': name})
-            return self.get(name)
+            return True
 
         log.debug('GuessIt cache was cleared due to invalidation object change: previous={previous} new={new}',
                   {'previous': self.invalidation_object, 'new': obj})
         self.invalidation_object = obj
         self.clear()
-        return None
+        return False
 
 
 guessit_cache = GuessItCache()
+expected_titles = ExpectedTitles()
+
+# Tuple of the number of workers and the ProcessPoolExecutor, created when first used
+guessit_pool = None
+guessit_pool_lock = threading.Lock()
@@ -4,12 +4,19 @@
 from __future__ import unicode_literals
 
 import logging
+import os
+import pickle
+import sqlite3
+import threading
 import time
 from collections import OrderedDict
 
+import diskcache
+
 import guessit
 
 from medusa import (
+    app,
     common,
     db,
     helpers,
@@ -25,12 +32,18 @@ from medusa.indexers.exceptions import (
 )
 from medusa.logger.adapters.style import BraceAdapter
 from medusa.name_parser.cache import BaseCache
+from medusa.name_parser.guessit_parser import expected_titles, guessit_cache, guessit_many
 
-from six import iteritems
 
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
+# Bump when the parsing or the ParseResult changes, to discard the persisted parse results
+PARSE_CACHE_VERSION = 2
+# Parse results that are written to the persistent cache at once, or when the oldest one waited PERSIST_INTERVAL
+PERSIST_BATCH_SIZE = 100
+PERSIST_INTERVAL = 60
+
 
 class NameParser(object):
     """Responsible to parse release names."""
@@ -300,8 +313,9 @@ class NameParser(object):
 
         return new_episode_numbers, new_season_numbers, new_absolute_numbers
 
-    def _parse_string(self, name):
-        guess = guessit.guessit(name, dict(show_type=self.show_type))
+    def _parse_string(self, name, guess=None):
+        if guess is None:
+            guess = guessit.guessit(name, dict(show_type=self.show_type))
 
         result = self.to_parse_result(name, guess)
         search_series = helpers.get_show(result.series_name, self.try_indexers) if not self.naming_pattern else None
@@ -396,8 +410,51 @@ class NameParser(object):
         if cached:
             return cached
 
+        return self._parse(name, cache_result)
+
+    def parse_many(self, names, cache_result=True, workers=None):
+        """Parse multiple names into ParseResults.
+
+        Duplicate names are only parsed once, and the parse cache is checked for all names at once.
+        The release names that are not cached are guessed in a pool of worker processes.
+
+        :param names:
+        :type names: list of str
+        :param cache_result:
+        :type cache_result: bool
+        :param workers: number of worker processes, defaults to app.NAME_PARSER_WORKERS
+        :type workers: int
+        :return: the ParseResult, or the raised exception, for each name in the same order as `names`
+        :rtype: list of ParseResult or Exception
+        """
+        names = [helpers.unicodify(name) for name in names]
+
+        if self.naming_pattern:
+            cache_result = False
+
+        results = name_parser_cache.get_many(names)
+        missing = [name for name in OrderedDict.fromkeys(names) if name not in results]
+        guesses = guessit_many(missing, dict(show_type=self.show_type),
+                               workers=workers if workers is not None else app.NAME_PARSER_WORKERS)
+
+        for name, guess in zip(missing, guesses):
+            try:
+                if isinstance(guess, Exception):
+                    raise guess
+                results[name] = self._parse(name, cache_result, guess)
+            except (InvalidNameException, InvalidShowException) as error:
+                results[name] = error
+            except Exception as error:
+                # One name that can't be parsed doesn't fail the others
+                log.warning('Unable to parse {name}: {error!r}', {'name': name, 'error': error})
+                results[name] = error
+
+        name_parser_cache.flush()
+        return [results[name] for name in names]
+
+    def _parse(self, name, cache_result, guess=None):
         start_time = time.time()
-        result = self._parse_string(name)
+        result = self._parse_string(name, guess)
         if result:
             result.total_time = time.time() - start_time
 
@@ -596,25 +653,233 @@ class ParseResult(object):
 
 
 class NameParserCache(BaseCache):
-    """Name parser cache."""
+    """Name parser cache.
+
+    The parse results can also be kept in a persistent cache on disk, so they survive a restart.
+    They're written to it in batches, and are only restored while the expected titles of their series are the same
+    and their series name still resolves to their series.
+    """
+
+    def __init__(self, max_size=1000):
+        """Initialize the cache with a maximum size."""
+        super().__init__(max_size)
+        # The cached names by indexer and series id
+        self.series_index = {}
+        self.persistent = None
+        # The parse results waiting to be persisted, by name, and the time the first one was added
+        self.pending = OrderedDict()
+        self.pending_since = None
+        self.persist_lock = threading.Lock()
+
+    def add(self, name, value):
+        """Add a parse result to the cache, and to the persistent cache when enabled."""
+        super().add(name, value)
+        if self.persistent is not None:
+            self._persist(name, value)
+
+    def get(self, name):
+        """Return a parse result from the cache, falling back to the persistent cache."""
+        result = super().get(name)
+        if result is None and self.persistent is not None:
+            result = self._restore(name)
+            if result is not None:
+                super().add(name, result)
+        return result
+
+    def get_many(self, names):
+        """Return the parse results found for the given names, falling back to the persistent cache."""
+        results = super().get_many(names)
+        if self.persistent is not None:
+            for name in names:
+                if name not in results:
+                    result = self.get(name)
+                    if result is not None:
+                        results[name] = result
+        return results
 
     def remove_by_indexer(self, indexer, indexer_id):
         """Remove cache item given indexer and indexer_id."""
         with self.lock:
-            to_remove = [
-                cached_name
-                for cached_name, cached_parsed_result in iteritems(self.cache)
-                if cached_parsed_result.series.indexer == indexer
-                and cached_parsed_result.series.indexerid == indexer_id
-            ]
-            for item in to_remove:
-                del self.cache[item]
+            for item in list(self.series_index.get((indexer, indexer_id), ())):
+                self._removed(item, self.cache.pop(item))
                 log.debug('Removed cached parse result for {name}', {'name': item})
 
+        if self.persistent is not None:
+            self._remove_persisted(indexer, indexer_id)
+
+    def _remove_persisted(self, indexer, indexer_id):
+        """Remove the persisted parse results of a series."""
+        tag = self._series_tag(indexer, indexer_id)
+        with self.persist_lock:
+            for name, (_, pending_tag) in list(self.pending.items()):
+                if pending_tag == tag:
+                    del self.pending[name]
+        try:
+            removed = self.persistent.evict(tag)
+        except (sqlite3.Error, OSError, diskcache.Timeout) as error:
+            log.warning('Unable to remove the persisted parse results for {indexer}:{id}: {error!r}',
+                        {'indexer': indexer, 'id': indexer_id, 'error': error})
+        else:
+            log.debug('Removed {count} persisted parse results for {indexer}:{id}',
+                      {'count': removed, 'indexer': indexer, 'id': indexer_id})
+
+    def _added(self, name, result):
+        if result.series:
+            self.series_index.setdefault((result.series.indexer, result.series.indexerid), set()).add(name)
+
+    def _removed(self, name, result):
+        if result.series:
+            key = result.series.indexer, result.series.indexerid
+            names = self.series_index.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self.series_index[key]
+
+    def _cleared(self):
+        self.series_index.clear()
+
+    def open_persistent(self, directory, size_limit):
+        """Store the parse results in a persistent cache on disk, and warm the cache with the stored results.
+
+        :param directory: the persistent cache folder
+        :type directory: str
+        :param size_limit: maximum size of the persistent cache in bytes, the oldest results are evicted first
+        :type size_limit: int
+        """
+        if self.persistent is not None and self.persistent.directory == directory:
+            self.persistent.reset('size_limit', size_limit)
+            return
+
+        self.close_persistent()
+        try:
+            self.persistent = diskcache.Cache(directory, size_limit=size_limit, tag_index=True)
+        except (sqlite3.Error, OSError, diskcache.Timeout) as error:
+            log.warning('Unable to open the persistent parse cache in {directory}: {error!r}',
+                        {'directory': directory, 'error': error})
+            return
+        self.warm()
+
+    def close_persistent(self):
+        """Write the pending parse results and stop using the persistent cache."""
+        if self.persistent is not None:
+            self.flush()
+            persistent, self.persistent = self.persistent, None
+            persistent.close()
+
+    def warm(self):
+        """Fill the cache with the persisted parse results, that are still valid for the current shows."""
+        if self.persistent is None:
+            return
+
+        warmed = 0
+        for name in self.persistent.iterkeys():
+            if warmed >= self.max_size:
+                break
+            result = self._restore(name)
+            if result is not None:
+                super().add(name, result)
+                warmed += 1
+
+        log.info('Loaded {count} parse results from the persistent parse cache', {'count': warmed})
+
+    @staticmethod
+    def config_version():
+        """Return a version of the parser, the persisted parse results are only valid for.
+
+        The expected titles of the shows aren't part of it, the parse results are checked against
+        the titles of their own series instead.
+        """
+        return '{0}:{1}'.format(PARSE_CACHE_VERSION, guessit.__version__)
+
+    def flush(self):
+        """Write the pending parse results to the persistent cache."""
+        with self.persist_lock:
+            pending, self.pending = self.pending, OrderedDict()
+            self.pending_since = None
+        persistent = self.persistent
+        if not pending or persistent is None:
+            return
+
+        for name, (stored, tag) in pending.items():
+            try:
+                persistent.set(name, stored, tag=tag)
+            except (pickle.PicklingError, TypeError, AttributeError) as error:
+                log.debug('Unable to persist the parse result for {name}: {error!r}', {'name': name, 'error': error})
+            except (sqlite3.Error, OSError, diskcache.Timeout) as error:
+                log.warning('Unable to persist {count} parse results: {error!r}', {'count': len(pending), 'error': error})
+                return
+
+    @staticmethod
+    def _series_tag(indexer, indexer_id):
+        return '{0}:{1}'.format(indexer, indexer_id)
+
+    def _persist(self, name, result):
+        if not result.series:
+            return
+
+        state = dict(result.__dict__, guess=OrderedDict(result.guess),
+                     series=(result.series.indexer, result.series.series_id))
+        stored = self.config_version(), expected_titles.get_series(result.series), state
+        with self.persist_lock:
+            self.pending[name] = stored, self._series_tag(result.series.indexer, result.series.series_id)
+            if self.pending_since is None:
+                self.pending_since = time.time()
+            full = len(self.pending) >= PERSIST_BATCH_SIZE or time.time() - self.pending_since >= PERSIST_INTERVAL
+        if full:
+            self.flush()
+
+    def _restore(self, name):
+        pending = self.pending.get(name)
+        try:
+            stored = pending[0] if pending else self.persistent.get(name)
+        except (sqlite3.Error, OSError, diskcache.Timeout) as error:
+            log.warning('Unable to read the persisted parse result for {name}: {error!r}',
+                        {'name': name, 'error': error})
+            return None
+
+        if not stored or stored[0] != self.config_version():
+            return None
+
+        titles, state = stored[1:]
+        state = dict(state)
+        indexer, series_id = state['series']
+        state['series'] = app.showList.find_by_id(indexer, series_id)
+        # The name could be parsed differently, since the expected titles of the series changed
+        if not state['series'] or expected_titles.get_series(state['series']) != titles:
+            return None
+
+        # The series name could belong to another show now, that was added or got it as an alias.
+        # The other parse results of the series could be wrong as well.
+        if helpers.get_show(state['series_name']) is not state['series']:
+            log.debug('The series of the persisted parse result for {name} changed, removing the results of {series}',
+                      {'name': name, 'series': state['series'].name})
+            self._remove_persisted(indexer, series_id)
+            return None
+
+        result = ParseResult.__new__(ParseResult)
+        result.__dict__.update(state)
+        return result
+
 
 name_parser_cache = NameParserCache()
 
 
+def configure_parse_caches():
+    """Apply the parse cache settings.
+
+    Resize the name parser and guessit caches, and open or close the persistent parse cache.
+    """
+    name_parser_cache.resize(app.NAME_PARSER_CACHE_SIZE)
+    guessit_cache.resize(app.GUESSIT_CACHE_SIZE)
+
+    if app.PARSE_CACHE_PERSISTENT and app.CACHE_DIR:
+        name_parser_cache.open_persistent(os.path.join(app.CACHE_DIR, 'parse_cache'),
+                                          app.PARSE_CACHE_SIZE * 1024 * 1024)
+    else:
+        name_parser_cache.close_persistent()
+
+
 class InvalidNameException(Exception):
     """The given release name is not valid."""
 
@@ -58,7 +58,7 @@ from medusa.helper.exceptions import (
 )
 from medusa.helpers import is_subtitle, verify_freespace
 from medusa.helpers.anidb import set_up_anidb_connection
-from medusa.helpers.utils import generate
+from medusa.helpers.utils import KeyedLock, generate
 from medusa.name_parser.parser import (
     InvalidNameException,
     InvalidShowException,
@@ -85,6 +85,9 @@ LANGUAGE_TAGS = {
     'zh-tw': 'zh-TW',
 }
 
+# Locks held while an episode is processed, by series and by show folder
+processing_locks = KeyedLock()
+
 
 class PostProcessor(object):
     """A class which will process a media file according to the post processing settings in the config."""
@@ -1052,6 +1055,17 @@ class PostProcessor(object):
         elif season is None or not episodes:
             raise EpisodePostProcessingFailedException(u'Not enough information to determine what episode this is')
 
+        # Other post-processing workers may be processing an episode of the same show, or for the same show folder
+        with processing_locks.hold(('series', series_obj.indexer, series_obj.series_id),
+                                   ('location', os.path.normcase(os.path.realpath(series_obj.location)))):
+            return self._process_episode(series_obj, season, episodes, quality, version)
+
+    def _process_episode(self, series_obj, season, episodes, quality, version):
+        """
+        Post-process the file for the episodes it was identified as.
+
+        :return: True on success, False on failure
+        """
         # retrieve/create the corresponding Episode objects
         ep_obj = self._get_ep_obj(series_obj, season, episodes)
         old_ep_quality = ep_obj.quality
@@ -4,18 +4,22 @@
 
 from __future__ import unicode_literals
 
+import json
 import logging
 import os
 import shutil
 import stat
+import threading
 import traceback
 from builtins import object
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 
 from medusa import app, db, failed_processor, helpers, notifiers, post_processor, ws
 from medusa.clients import torrent
 from medusa.common import DOWNLOADED, SNATCHED, SNATCHED_BEST, SNATCHED_PROPER
-from medusa.helper.common import is_sync_file
+from medusa.helper.common import is_sync_file, resource_file_name
 from medusa.helper.exceptions import EpisodePostProcessingFailedException, FailedPostProcessingFailedException, ex
 from medusa.logger.adapters.style import CustomBraceAdapter
 from medusa.name_parser.parser import InvalidNameException, InvalidShowException, NameParser
@@ -30,6 +34,102 @@ from six import iteritems
 log = CustomBraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
+MAX_UNRAR_WORKERS = 4
+
+
+class ExtractionManifest(object):
+    """The members of the extracted archives, to skip an archive that was extracted before without reading it."""
+
+    def __init__(self, max_size=500):
+        """Initialize the manifest."""
+        self.lock = threading.Lock()
+        self.max_size = max_size
+        # {'signature': [size, mtime], 'members': [[name, size]]} by archive path, oldest first
+        self.archives = None
+        self.changed = False
+
+    @property
+    def path(self):
+        """Return the path of the manifest file."""
+        if app.CACHE_DIR:
+            return os.path.join(app.CACHE_DIR, 'extracted_archives.json')
+
+    @staticmethod
+    def _signature(archive_path):
+        stat_result = os.stat(archive_path)
+        return [stat_result.st_size, int(stat_result.st_mtime)]
+
+    def _load(self):
+        """Load the manifest file. Called under the lock."""
+        if self.archives is not None:
+            return
+
+        self.archives = OrderedDict()
+        if not self.path or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path) as manifest:
+                self.archives = json.load(manifest, object_pairs_hook=OrderedDict)
+        except (IOError, OSError, ValueError) as error:
+            log.warning('Unable to read the extraction manifest {path}: {error}',
+                        {'path': self.path, 'error': ex(error)})
+
+    def get(self, archive_path):
+        """
+        Get the members of an archive, when it didn't change since it was extracted.
+
+        :return: list of the name and size of the members, or None
+        """
+        with self.lock:
+            self._load()
+            entry = self.archives.get(archive_path)
+            if not entry:
+                return None
+
+            try:
+                signature = self._signature(archive_path)
+            except OSError:
+                return None
+            if entry['signature'] != signature:
+                return None
+
+            return [tuple(member) for member in entry['members']]
+
+    def add(self, archive_path, members):
+        """Record the members of an extracted archive."""
+        with self.lock:
+            self._load()
+            self.archives.pop(archive_path, None)
+            try:
+                self.archives[archive_path] = {
+                    'signature': self._signature(archive_path),
+                    'members': [list(member) for member in members],
+                }
+            except OSError:
+                return
+
+            while len(self.archives) > self.max_size:
+                self.archives.popitem(last=False)
+            self.changed = True
+
+    def save(self):
+        """Write the manifest file, when it changed."""
+        with self.lock:
+            if not self.changed or not self.path:
+                return
+
+            try:
+                with open(self.path, 'w') as manifest:
+                    json.dump(self.archives, manifest)
+                self.changed = False
+            except (IOError, OSError) as error:
+                log.warning('Unable to write the extraction manifest {path}: {error}',
+                            {'path': self.path, 'error': ex(error)})
+
+
+extraction_manifest = ExtractionManifest()
+
 
 class PostProcessQueueItem(generic_queue.QueueItem):
     """Post-process queue item class."""
@@ -702,6 +802,8 @@ class ProcessResult(object):
         """
         Extract RAR files.
 
+        The archive sets are extracted concurrently.
+
         :param path: Path to look for files in
         :param rar_files: Names of RAR files
         :param force: process currently processing items
@@ -712,61 +814,108 @@ class ProcessResult(object):
         if app.UNPACK and rar_files:
             self.log_and_output('Packed files detected: {rar_files}', level=logging.DEBUG, **{'rar_files': rar_files})
 
-            for archive in rar_files:
-                self.log_and_output('Unpacking archive: {archive}', level=logging.DEBUG, **{'archive': archive})
-
-                failure = None
-                try:
-                    rar_handle = RarFile(os.path.join(path, archive))
-
-                    # check that the rar doesnt need a password
-                    if rar_handle.needs_password():
-                        raise ValueError('Rar requires a password')
-
-                    # Skip extraction if any file in archive has previously been extracted
-                    skip_extraction = False
-                    for file_in_archive in [os.path.basename(each.filename)
-                                            for each in rar_handle.infolist()
-                                            if not each.isdir()]:
-                        if not force and self.already_postprocessed(file_in_archive):
-                            self.log_and_output('Archive file already post-processed, extraction skipped: {file_in_archive}',
-                                                level=logging.DEBUG, **{'file_in_archive': file_in_archive})
-                            skip_extraction = True
-                            break
-
-                        if app.POSTPONE_IF_NO_SUBS and os.path.isfile(os.path.join(path, file_in_archive)):
-                            self.log_and_output('Archive file already extracted, extraction skipped: {file_in_archive}',
-                                                level=logging.DEBUG, **{'file_in_archive': file_in_archive})
-                            skip_extraction = True
-                            break
-
-                    if not skip_extraction:
-                        # raise an exception if the rar file is broken
-                        rar_handle.testrar()
-                        rar_handle.extractall(path=path)
-
-                    for each in rar_handle.infolist():
-                        if not each.isdir():
-                            basename = os.path.basename(each.filename)
-                            unpacked_files.append(basename)
-
-                    del rar_handle
-
-                except (BadRarFile, Error, NotRarFile, RarCannotExec, ValueError) as error:
-                    failure = (ex(error), 'Unpacking failed with a Rar error')
-                except Exception as error:
-                    failure = (ex(error), 'Unpacking failed for an unknown reason')
+            thread_name = threading.current_thread().name
+            executor = ThreadPoolExecutor(max_workers=min(MAX_UNRAR_WORKERS, len(rar_files)))
+            try:
+                results = list(executor.map(
+                    lambda archive: self._unrar_archive(path, archive, force, thread_name), rar_files
+                ))
+            finally:
+                executor.shutdown()
 
+            for archive, (members, failure) in zip(rar_files, results):
                 if failure is not None:
                     self.log_and_output('Failed unpacking archive {archive}: {failure}', level=logging.WARNING, **{'archive': archive, 'failure': failure[0]})
                     self.missed_files.append('{0}: Unpacking failed: {1}'.format(archive, failure[1]))
                     self.result = False
                     continue
 
+                unpacked_files.extend(members)
+
+            extraction_manifest.save()
             self.log_and_output('Extracted content: {unpacked_files}', level=logging.DEBUG, **{'unpacked_files': unpacked_files})
 
         return unpacked_files
 
+    def _unrar_archive(self, path, archive, force, thread_name):
+        """
+        Extract a RAR archive set, in a single pass.
+
+        unrar verifies the archive while extracting it, so the archive isn't tested first.
+        The extracted members are recorded in the extraction manifest, to skip the archive on a re-run.
+
+        :return: the file names of the unpacked files and None, or None and the failure
+        """
+        current_thread = threading.current_thread()
+        worker_name = current_thread.name
+        current_thread.name = thread_name
+        try:
+            self.log_and_output('Unpacking archive: {archive}', level=logging.DEBUG, **{'archive': archive})
+            archive_path = os.path.join(path, archive)
+
+            rar_handle = None
+            members = extraction_manifest.get(archive_path)
+            if members is not None and not force and all(
+                    os.path.isfile(os.path.join(path, name)) and os.path.getsize(os.path.join(path, name)) == size
+                    for name, size in members):
+                self.log_and_output('Archive already extracted, extraction skipped: {archive}',
+                                    level=logging.DEBUG, **{'archive': archive})
+                return [os.path.basename(name) for name, _ in members], None
+
+            # The members are recorded with their path in the archive, they're extracted in its folders
+            if members is None:
+                rar_handle = self._open_rar(archive_path)
+                members = [(each.filename, each.file_size)
+                           for each in rar_handle.infolist()
+                           if not each.isdir()]
+            names = [os.path.basename(name) for name, _ in members]
+
+            # Skip extraction if any file in archive has previously been extracted
+            skip_extraction = False
+            for file_in_archive in names:
+                if not force and self.already_postprocessed(file_in_archive):
+                    self.log_and_output('Archive file already post-processed, extraction skipped: {file_in_archive}',
+                                        level=logging.DEBUG, **{'file_in_archive': file_in_archive})
+                    skip_extraction = True
+                    break
+
+                if app.POSTPONE_IF_NO_SUBS and os.path.isfile(os.path.join(path, file_in_archive)):
+                    self.log_and_output('Archive file already extracted, extraction skipped: {file_in_archive}',
+                                        level=logging.DEBUG, **{'file_in_archive': file_in_archive})
+                    skip_extraction = True
+                    break
+
+            if not skip_extraction:
+                rar_handle = rar_handle or self._open_rar(archive_path)
+                existing = {name for name, _ in members if os.path.isfile(os.path.join(path, name))}
+                try:
+                    rar_handle.extractall(path=path)
+                except Exception:
+                    # Don't leave the members of a broken archive behind
+                    self.delete_files(path, [name for name, _ in members if name not in existing], force=True)
+                    raise
+                extraction_manifest.add(archive_path, members)
+
+            return names, None
+
+        except (BadRarFile, Error, NotRarFile, RarCannotExec, ValueError) as error:
+            return None, (ex(error), 'Unpacking failed with a Rar error')
+        except Exception as error:
+            return None, (ex(error), 'Unpacking failed for an unknown reason')
+        finally:
+            current_thread.name = worker_name
+
+    @staticmethod
+    def _open_rar(archive_path):
+        """Open a RAR archive, that doesn't need a password."""
+        rar_handle = RarFile(archive_path)
+
+        # check that the rar doesnt need a password
+        if rar_handle.needs_password():
+            raise ValueError('Rar requires a password')
+
+        return rar_handle
+
     def already_postprocessed(self, video_file):
         """
         Check if we already post-processed an auto snatched file.
@@ -779,9 +928,10 @@ class ProcessResult(object):
             'SELECT showid, season, episode, indexer_id '
             'FROM history '
             'WHERE action = ? '
-            'AND resource LIKE ?'
+            'AND resource_name = ? '
+            'AND resource LIKE ? '
             'ORDER BY date DESC',
-            [DOWNLOADED, '%' + video_file])
+            [DOWNLOADED, resource_file_name(video_file), '%' + video_file])
 
         if history_result:
             snatched_statuses = [SNATCHED, SNATCHED_PROPER, SNATCHED_BEST]
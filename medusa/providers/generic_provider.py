@@ -10,6 +10,7 @@ import re
 from builtins import map
 from builtins import object
 from builtins import str
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from os.path import join
 
@@ -38,11 +39,7 @@ from medusa.helpers import (
 )
 from medusa.indexers.config import INDEXER_TVDBV2
 from medusa.logger.adapters.style import BraceAdapter
-from medusa.name_parser.parser import (
-    InvalidNameException,
-    InvalidShowException,
-    NameParser,
-)
+from medusa.name_parser.parser import NameParser
 from medusa.search import FORCED_SEARCH, PROPER_SEARCH
 from medusa.session.core import ProviderSession
 from medusa.show.show import Show
@@ -51,6 +48,8 @@ from pytimeparse import parse
 
 from requests.utils import add_dict_to_cookiejar, dict_from_cookiejar
 
+from six import itervalues
+
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
@@ -260,7 +259,8 @@ class GenericProvider(object):
         self.series = series
 
         season_search = (len(episodes) > 1 or manual_search_type == 'season') and search_mode == 'sponly'
-        results = []
+        # The unique results by their identifier, in the order they were found
+        unique_results = OrderedDict()
 
         for episode in episodes:
             search_strings = []
@@ -274,39 +274,41 @@ class GenericProvider(object):
                 items = self.search(search_string, ep_obj=episode, manual_search=manual_search)
                 for item in items:
                     result = self.get_result(series=series, item=item)
-                    if result not in results:
+                    identifier = result.identifier
+                    if identifier not in unique_results:
                         result.quality = Quality.quality_from_name(result.name, series.is_anime)
-                        results.append(result)
+                        unique_results[identifier] = result
 
             # In season search, we can't loop in episodes lists as we
             # only need one episode to get the season string
             if search_mode == 'sponly':
                 break
 
-        log.debug('Found {0} unique search results', len(results))
+        log.debug('Found {0} unique search results', len(unique_results))
 
         # sort qualities in descending order
-        results.sort(key=operator.attrgetter('quality'), reverse=True)
+        results = sorted(itervalues(unique_results), key=operator.attrgetter('quality'), reverse=True)
 
         # Move through each item and parse with NameParser()
-        for search_result in results:
+        parsed_results = NameParser(parse_method=('normal', 'anime')[series.is_anime]).parse_many(
+            [search_result.name for search_result in results]
+        )
+        for search_result, parsed_result in zip(results, parsed_results):
 
             if forced_search:
                 search_result.search_type = FORCED_SEARCH
             search_result.download_current_quality = download_current_quality
             search_result.result_wanted = True
 
-            try:
-                search_result.parsed_result = NameParser(
-                    parse_method=('normal', 'anime')[series.is_anime]).parse(
-                        search_result.name)
-            except (InvalidNameException, InvalidShowException) as error:
+            if isinstance(parsed_result, Exception):
                 log.debug('Error during parsing of release name: {release_name}, with error: {error}',
-                          {'release_name': search_result.name, 'error': error})
+                          {'release_name': search_result.name, 'error': parsed_result})
                 search_result.add_cache_entry = False
                 search_result.result_wanted = False
                 continue
 
+            search_result.parsed_result = parsed_result
+
             # I don't know why i'm doing this. Maybe remove it later on all together, now i've added the parsed_result
             # to the search_result.
             search_result.series = search_result.parsed_result.series
@@ -460,9 +462,7 @@ class GenericProvider(object):
                 final_results[search_result.episode_number].append(search_result)
 
         if cl:
-            # Access to a protected member of a client class
-            db = self.cache._get_db()
-            db.mass_action(cl)
+            self.cache.save_cache_entries(cl)
 
         return final_results
 
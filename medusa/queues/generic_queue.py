@@ -2,11 +2,13 @@
 
 from __future__ import unicode_literals
 
+import heapq
 import logging
 import threading
 from builtins import object
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from functools import cmp_to_key
+from itertools import count
 from uuid import uuid4
 
 
@@ -20,15 +22,30 @@ class QueuePriorities(object):
 
 
 class GenericQueue(object):
-    def __init__(self, max_history=100):
+    def __init__(self, max_history=100, max_workers=1):
         self.current_item = None
+        self.running_items = []
+        # A heap of the queue items, by priority descending then by the order they were added
         self.queue = []
         self.history = []
         self.max_history = max_history
+        self.max_workers = max_workers
         self.queue_name = 'QUEUE'
         self.min_priority = 0
         self.lock = threading.Lock()
         self.amActive = False
+        self.sequence = count()
+        self.executor = None
+        self.executor_workers = 0
+        # Metrics about the time the items waited in the queue, in seconds
+        self.started_items = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def workers(self):
+        """Return the number of items that can run at the same time."""
+        return max(self.max_workers, 1)
 
     def pause(self):
         """Pauses this queue."""
@@ -49,10 +66,21 @@ class GenericQueue(object):
         """
         with self.lock:
             item.added = datetime.utcnow()
-            self.queue.append(item)
+            item.queue_order = (-item.priority, next(self.sequence))
+            heapq.heappush(self.queue, item)
 
             return item
 
+    def remove_item(self, item):
+        """
+        Removes an item from this queue
+
+        :param item: Queue object to remove
+        """
+        with self.lock:
+            self.queue.remove(item)
+            heapq.heapify(self.queue)
+
     def run(self, force=False):
         """
         Process items in this queue
@@ -60,49 +88,99 @@ class GenericQueue(object):
         :param force: Force queue processing (currently not implemented)
         """
         with self.lock:
-            # only start a new task if one isn't already going
-            if self.current_item is None or not self.current_item.is_alive():
-
-                # if the thread is dead then the current item should be
-                # finished
-                if self.current_item:
-                    self.current_item.finish()
-                    self.current_item = None
-
-                # if there's something in the queue then run it in a thread
-                # and take it out of the queue
-                if self.queue:
-
-                    # sort by priority
-                    def sorter(x, y):
-                        """
-                        Sorts by priority descending then time ascending
-                        """
-                        if x.priority == y.priority:
-                            if y.added == x.added:
-                                return 0
-                            elif y.added < x.added:
-                                return 1
-                            elif y.added > x.added:
-                                return -1
-                        else:
-                            return y.priority - x.priority
-
-                    self.queue.sort(key=cmp_to_key(sorter))
-                    if self.queue[0].priority < self.min_priority:
-                        return
-
-                    # launch the queue item in a thread
-                    self.current_item = self.queue.pop(0)
-                    self.current_item.name = u'{queue}-{item}'.format(
-                        queue=self.queue_name,
-                        item=self.current_item.name,
-                    )
-                    self.current_item.start()
-                    fifo(self.history, self.current_item, self.max_history)
+            # the items that are done should be finished
+            for item in [item for item in self.running_items if not item.is_alive()]:
+                self._finish_item(item)
+                self.running_items.remove(item)
+
+            # start the items with the highest priority, until all workers are busy
+            while len(self.running_items) < self.workers:
+                item = self._next_item()
+                if not item:
+                    break
+                self.running_items.append(item)
+                self._start_item(item)
+
+            self.current_item = self.running_items[0] if self.running_items else None
 
         self.amActive = False
 
+    def _can_start(self, item):
+        """Check if an item can run next to the running items."""
+        return True
+
+    def _finish_item(self, item):
+        """Finish an item that is done running. Called under the lock."""
+        item.finish()
+
+    def _next_item(self):
+        """
+        Take the next item to run out of the queue. Called under the lock.
+
+        :return: the queue item with the highest priority that can start, or None
+        """
+        skipped = []
+        item = None
+        while self.queue and self.queue[0].priority >= self.min_priority:
+            candidate = heapq.heappop(self.queue)
+            if self._can_start(candidate):
+                item = candidate
+                break
+            skipped.append(candidate)
+
+        for candidate in skipped:
+            heapq.heappush(self.queue, candidate)
+
+        return item
+
+    def _start_item(self, item):
+        """Run the queue item on the worker pool. Called under the lock."""
+        item.name = u'{queue}-{item}'.format(
+            queue=self.queue_name,
+            item=item.name,
+        )
+
+        wait = (datetime.utcnow() - item.added).total_seconds() if item.added else 0.0
+        self.started_items += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+        if self.executor is None or self.executor_workers < self.workers:
+            # Running items keep running on the previous pool
+            if self.executor:
+                self.executor.shutdown(wait=False)
+            self.executor = ThreadPoolExecutor(max_workers=self.workers)
+            self.executor_workers = self.workers
+        item.future = self.executor.submit(self._run_item, item)
+        fifo(self.history, item, self.max_history)
+
+    @staticmethod
+    def _run_item(item):
+        """Run the queue item, in a worker thread named after it."""
+        current_thread = threading.current_thread()
+        worker_name = current_thread.name
+        current_thread.name = item.name
+        try:
+            item.run()
+        except Exception:
+            log.exception(u'Exception in queue item %s', item.name)
+        finally:
+            current_thread.name = worker_name
+
+    def stats(self):
+        """Return the depth of this queue and the time the items waited, in seconds."""
+        with self.lock:
+            now = datetime.utcnow()
+            return {
+                'depth': len(self.queue),
+                'running': len(self.running_items),
+                'workers': self.workers,
+                'started': self.started_items,
+                'average_wait': self.total_wait / self.started_items if self.started_items else 0.0,
+                'max_wait': self.max_wait,
+                'oldest_wait': max([(now - item.added).total_seconds() for item in self.queue if item.added] or [0.0]),
+            }
+
 
 class QueueItem(threading.Thread):
     def __init__(self, name, action_id=0):
@@ -113,6 +191,10 @@ class QueueItem(threading.Thread):
         self.action_id = action_id
         self.stop = threading.Event()
         self.added = None
+        # Position in the queue, set when it's added
+        self.queue_order = None
+        # Set when it runs on the worker pool of the queue
+        self.future = None
         self.queue_time = datetime.utcnow()
         self.start_time = None
         self.success = None
@@ -126,6 +208,14 @@ class QueueItem(threading.Thread):
             'success': self.success
         }
 
+    def __lt__(self, other):
+        """Order the queue items by their position in the queue."""
+        return self.queue_order < other.queue_order
+
+    def is_alive(self):
+        """Return True while the item is running on the worker pool of its queue."""
+        return self.future is not None and not self.future.done()
+
     def run(self):
         """Implementing classes should call this."""
         self.inProgress = True
@@ -18,8 +18,11 @@
 from __future__ import unicode_literals
 
 import logging
+import threading
+import time
 import traceback
 from builtins import object
+from collections import deque
 
 from imdbpie.exceptions import ImdbAPIError
 
@@ -38,6 +41,7 @@ from medusa.helper.exceptions import (
     EpisodeDeletedException,
     ShowDirectoryNotFoundException
 )
+from medusa.helpers.utils import KeyedLock
 from medusa.image_cache import replace_images
 from medusa.indexers.api import indexerApi
 from medusa.indexers.exceptions import (
@@ -62,6 +66,14 @@ from trakt.errors import TraktException
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
+# Fetches from one indexer (or IMDb) of the show updates running at the same time
+MAX_INDEXER_FETCHES = 2
+indexer_fetches = KeyedLock(MAX_INDEXER_FETCHES)
+# The show updates running at the same time write to the database one at a time
+db_write_lock = threading.Lock()
+# Seconds of finished updates the throughput is calculated over
+THROUGHPUT_WINDOW = 600
+
 
 class ShowQueueActions(object):
 
@@ -103,9 +115,54 @@ class ShowQueue(generic_queue.GenericQueue):
         ShowQueueActions.SUBTITLE: 'This show is queued and awaiting subtitles download.',
     }
 
+    # The actions that can run next to each other, for different shows
+    concurrent_actions = (ShowQueueActions.UPDATE, ShowQueueActions.SEASON_UPDATE, ShowQueueActions.REFRESH)
+    update_actions = (ShowQueueActions.UPDATE, ShowQueueActions.SEASON_UPDATE)
+
     def __init__(self):
         generic_queue.GenericQueue.__init__(self)
         self.queue_name = 'SHOWQUEUE'
+        self.updates_done = 0
+        # The times the updates finished, within the throughput window
+        self.update_times = deque()
+
+    @property
+    def workers(self):
+        """Return the number of show updates and refreshes that can run at the same time."""
+        return max(app.SHOW_UPDATE_WORKERS, 1)
+
+    def _can_start(self, item):
+        """Check if an item can run next to the running items."""
+        if not self.running_items:
+            return True
+        if item.action_id not in self.concurrent_actions:
+            return False
+        return all(running_item.action_id in self.concurrent_actions
+                   and running_item.show.identifier != item.show.identifier
+                   for running_item in self.running_items)
+
+    def _finish_item(self, item):
+        generic_queue.GenericQueue._finish_item(self, item)
+        if item.action_id in self.update_actions:
+            now = time.time()
+            self.updates_done += 1
+            self.update_times.append(now)
+            while self.update_times[0] < now - THROUGHPUT_WINDOW:
+                self.update_times.popleft()
+
+    def stats(self):
+        """Add the progress and the throughput of the show updates to the queue stats."""
+        stats = generic_queue.GenericQueue.stats(self)
+        with self.lock:
+            stats.update({
+                'updates_queued': sum(1 for item in self.queue if item.action_id in self.update_actions),
+                'updates_running': sum(1 for item in self.running_items if item.action_id in self.update_actions),
+                'updates_done': self.updates_done,
+                'updates_per_minute': len([update_time for update_time in self.update_times
+                                           if update_time >= time.time() - THROUGHPUT_WINDOW])
+                * 60.0 / THROUGHPUT_WINDOW,
+            })
+        return stats
 
     def _isInQueue(self, show, actions):
         if not show:
@@ -114,7 +171,7 @@ class ShowQueue(generic_queue.GenericQueue):
         return show.series_id in [x.show.series_id if x.show else 0 for x in self.queue if x.action_id in actions]
 
     def _isBeingSomethinged(self, show, actions):
-        return self.current_item is not None and show == self.current_item.show and self.current_item.action_id in actions
+        return any(show == item.show and item.action_id in actions for item in list(self.running_items))
 
     def isInUpdateQueue(self, show):
         return self._isInQueue(show, (ShowQueueActions.UPDATE,))
@@ -150,7 +207,7 @@ class ShowQueue(generic_queue.GenericQueue):
         return self._isBeingSomethinged(show, (ShowQueueActions.REMOVE,))
 
     def _getLoadingShowList(self):
-        return [x for x in self.queue + [self.current_item] if x is not None and x.isLoading]
+        return [x for x in self.queue + self.running_items if x.isLoading]
 
     def getQueueActionMessage(self, show):
         return self.get_queue_action(show)[1]
@@ -251,9 +308,9 @@ class ShowQueue(generic_queue.GenericQueue):
             raise CantRemoveShowException('[{!s}]: Show is already queued to be removed'.format(show.series_id))
 
         # remove other queued actions for this show.
-        for item in self.queue:
+        for item in list(self.queue):
             if item and item.show and item != self.current_item and show.identifier == item.show.identifier:
-                self.queue.remove(item)
+                self.remove_item(item)
 
         queue_item_obj = QueueItemRemove(show=show, full=full)
         self.add_item(queue_item_obj)
@@ -286,8 +343,7 @@ class ShowQueueItem(generic_queue.QueueItem):
         })
 
     def isInQueue(self):
-        return self in app.show_queue_scheduler.action.queue + [
-            app.show_queue_scheduler.action.current_item]  # @UndefinedVariable
+        return self in app.show_queue_scheduler.action.queue + app.show_queue_scheduler.action.running_items
 
     def _getName(self):
         return text_type(self.show.series_id)
@@ -503,11 +559,12 @@ class QueueItemRefresh(ShowQueueItem):
         )
 
         try:
-            self.show.refresh_dir()
-            if self.force:
-                self.show.update_metadata()
-            self.show.write_metadata()
-            self.show.populate_cache()
+            with db_write_lock:
+                self.show.refresh_dir()
+                if self.force:
+                    self.show.update_metadata()
+                self.show.write_metadata()
+                self.show.populate_cache()
 
             # Load XEM data to DB for show
             scene_numbering.xem_refresh(self.show, force=True)
@@ -614,8 +671,11 @@ class QueueItemUpdate(ShowQueueItem):
         )
         try:
             # Let's make sure we refresh the indexer_api object attached to the show object.
-            self.show.create_indexer()
-            self.show.load_from_indexer()
+            # The show is fetched with its episodes, which are loaded from this api in the database write
+            with indexer_fetches.hold(self.show.indexer):
+                self.show.create_indexer()
+                self.show.load_from_indexer()
+                tvapi = self.show.indexer_api
         except IndexerError as error:
             log.warning(
                 '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
@@ -649,7 +709,8 @@ class QueueItemUpdate(ShowQueueItem):
             {'id': self.show.series_id}
         )
         try:
-            self.show.load_imdb_info()
+            with indexer_fetches.hold('imdb'):
+                self.show.load_imdb_info()
         except ImdbAPIError as error:
             log.info(
                 '{id}: Something wrong on IMDb api: {error_msg}',
@@ -661,88 +722,90 @@ class QueueItemUpdate(ShowQueueItem):
                 {'id': self.show.series_id, 'error_msg': error}
             )
 
-        # have to save show before reading episodes from db
-        try:
-            log.debug(
-                '{id}: Saving new IMDb show info to database',
-                {'id': self.show.series_id}
-            )
-            self.show.save_to_db()
-        except Exception as error:
-            log.warning(
-                '{id}: Error saving new IMDb show info to database: {error_msg}',
-                {'id': self.show.series_id, 'error_msg': error}
-            )
-            log.error(traceback.format_exc())
+        # Write to the database one show at a time, the other updates keep fetching from the indexers
+        with db_write_lock:
+            # have to save show before reading episodes from db
+            try:
+                log.debug(
+                    '{id}: Saving new IMDb show info to database',
+                    {'id': self.show.series_id}
+                )
+                self.show.save_to_db()
+            except Exception as error:
+                log.warning(
+                    '{id}: Error saving new IMDb show info to database: {error_msg}',
+                    {'id': self.show.series_id, 'error_msg': error}
+                )
+                log.error(traceback.format_exc())
 
-        # get episode list from DB
-        try:
-            episodes_from_db = self.show.load_episodes_from_db()
-        except IndexerException as error:
-            log.warning(
-                '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
-                 'error_msg': error}
-            )
-            return
+            # get episode list from DB
+            try:
+                episodes_from_db = self.show.load_episodes_from_db()
+            except IndexerException as error:
+                log.warning(
+                    '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
+                     'error_msg': error}
+                )
+                return
 
-        # get episode list from the indexer
-        try:
-            episodes_from_indexer = self.show.load_episodes_from_indexer()
-        except IndexerException as error:
-            log.warning(
-                '{id}: Unable to get info from {indexer}. The show info will not be refreshed.'
-                ' Error: {error_msg}',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
-                 'error_msg': error}
-            )
-            episodes_from_indexer = None
+            # get episode list from the indexer
+            try:
+                episodes_from_indexer = self.show.load_episodes_from_indexer(tvapi=tvapi)
+            except IndexerException as error:
+                log.warning(
+                    '{id}: Unable to get info from {indexer}. The show info will not be refreshed.'
+                    ' Error: {error_msg}',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
+                     'error_msg': error}
+                )
+                episodes_from_indexer = None
 
-        if episodes_from_indexer is None:
-            log.warning(
-                '{id}: No data returned from {indexer} during full show update.'
-                ' Unable to update this show',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name}
-            )
-        else:
-            # for each ep we found on the Indexer delete it from the DB list
-            for cur_season in episodes_from_indexer:
-                for cur_episode in episodes_from_indexer[cur_season]:
-                    if cur_season in episodes_from_db and cur_episode in episodes_from_db[cur_season]:
-                        del episodes_from_db[cur_season][cur_episode]
-
-            # remaining episodes in the DB list are not on the indexer, just delete them from the DB
-            for cur_season in episodes_from_db:
-                for cur_episode in episodes_from_db[cur_season]:
-                    log.debug(
-                        '{id}: Permanently deleting episode {show} {ep} from the database',
-                        {'id': self.show.series_id, 'show': self.show.name,
-                         'ep': episode_num(cur_season, cur_episode)}
-                    )
-                    # Create the ep object only because Im going to delete it
-                    ep_obj = self.show.get_episode(cur_season, cur_episode)
-                    try:
-                        ep_obj.delete_episode()
-                    except EpisodeDeletedException:
+            if episodes_from_indexer is None:
+                log.warning(
+                    '{id}: No data returned from {indexer} during full show update.'
+                    ' Unable to update this show',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name}
+                )
+            else:
+                # for each ep we found on the Indexer delete it from the DB list
+                for cur_season in episodes_from_indexer:
+                    for cur_episode in episodes_from_indexer[cur_season]:
+                        if cur_season in episodes_from_db and cur_episode in episodes_from_db[cur_season]:
+                            del episodes_from_db[cur_season][cur_episode]
+
+                # remaining episodes in the DB list are not on the indexer, just delete them from the DB
+                for cur_season in episodes_from_db:
+                    for cur_episode in episodes_from_db[cur_season]:
                         log.debug(
-                            '{id}: Episode {show} {ep} successfully deleted from the database',
+                            '{id}: Permanently deleting episode {show} {ep} from the database',
                             {'id': self.show.series_id, 'show': self.show.name,
                              'ep': episode_num(cur_season, cur_episode)}
                         )
-
-        # Save only after all changes were applied
-        try:
-            log.debug(
-                '{id}: Saving all updated show info to database',
-                {'id': self.show.series_id}
-            )
-            self.show.save_to_db()
-        except Exception as error:
-            log.warning(
-                '{id}: Error saving all updated show info to database: {error_msg}',
-                {'id': self.show.series_id, 'error_msg': error}
-            )
-            log.error(traceback.format_exc())
+                        # Create the ep object only because Im going to delete it
+                        ep_obj = self.show.get_episode(cur_season, cur_episode)
+                        try:
+                            ep_obj.delete_episode()
+                        except EpisodeDeletedException:
+                            log.debug(
+                                '{id}: Episode {show} {ep} successfully deleted from the database',
+                                {'id': self.show.series_id, 'show': self.show.name,
+                                 'ep': episode_num(cur_season, cur_episode)}
+                            )
+
+            # Save only after all changes were applied
+            try:
+                log.debug(
+                    '{id}: Saving all updated show info to database',
+                    {'id': self.show.series_id}
+                )
+                self.show.save_to_db()
+            except Exception as error:
+                log.warning(
+                    '{id}: Error saving all updated show info to database: {error_msg}',
+                    {'id': self.show.series_id, 'error_msg': error}
+                )
+                log.error(traceback.format_exc())
 
         # Replace the images in cache
         log.info(
@@ -791,8 +854,11 @@ class QueueItemSeasonUpdate(ShowQueueItem):
         )
         try:
             # Let's make sure we refresh the indexer_api object attached to the show object.
-            self.show.create_indexer()
-            self.show.load_from_indexer()
+            # The show is fetched with its episodes, which are loaded from this api in the database write
+            with indexer_fetches.hold(self.show.indexer):
+                self.show.create_indexer()
+                self.show.load_from_indexer()
+                tvapi = self.show.indexer_api
         except IndexerError as error:
             log.warning(
                 '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
@@ -814,7 +880,8 @@ class QueueItemSeasonUpdate(ShowQueueItem):
             {'id': self.show.series_id}
         )
         try:
-            self.show.load_imdb_info()
+            with indexer_fetches.hold('imdb'):
+                self.show.load_imdb_info()
         except ImdbAPIError as error:
             log.info(
                 '{id}: Something wrong on IMDb api: {error_msg}',
@@ -826,88 +893,90 @@ class QueueItemSeasonUpdate(ShowQueueItem):
                 {'id': self.show.series_id, 'error_msg': error}
             )
 
-        # have to save show before reading episodes from db
-        try:
-            log.debug(
-                '{id}: Saving new IMDb show info to database',
-                {'id': self.show.series_id}
-            )
-            self.show.save_to_db()
-        except Exception as error:
-            log.warning(
-                '{id}: Error saving new IMDb show info to database: {error_msg}',
-                {'id': self.show.series_id, 'error_msg': error}
-            )
-            log.error(traceback.format_exc())
+        # Write to the database one show at a time, the other updates keep fetching from the indexers
+        with db_write_lock:
+            # have to save show before reading episodes from db
+            try:
+                log.debug(
+                    '{id}: Saving new IMDb show info to database',
+                    {'id': self.show.series_id}
+                )
+                self.show.save_to_db()
+            except Exception as error:
+                log.warning(
+                    '{id}: Error saving new IMDb show info to database: {error_msg}',
+                    {'id': self.show.series_id, 'error_msg': error}
+                )
+                log.error(traceback.format_exc())
 
-        # get episode list from DB
-        try:
-            episodes_from_db = self.show.load_episodes_from_db(self.seasons)
-        except IndexerException as error:
-            log.warning(
-                '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
-                 'error_msg': error}
-            )
-            return
+            # get episode list from DB
+            try:
+                episodes_from_db = self.show.load_episodes_from_db(self.seasons)
+            except IndexerException as error:
+                log.warning(
+                    '{id}: Unable to contact {indexer}. Aborting: {error_msg}',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
+                     'error_msg': error}
+                )
+                return
 
-        # get episode list from the indexer
-        try:
-            episodes_from_indexer = self.show.load_episodes_from_indexer(self.seasons)
-        except IndexerException as error:
-            log.warning(
-                '{id}: Unable to get info from {indexer}. The show info will not be refreshed.'
-                ' Error: {error_msg}',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
-                 'error_msg': error}
-            )
-            episodes_from_indexer = None
+            # get episode list from the indexer
+            try:
+                episodes_from_indexer = self.show.load_episodes_from_indexer(self.seasons, tvapi=tvapi)
+            except IndexerException as error:
+                log.warning(
+                    '{id}: Unable to get info from {indexer}. The show info will not be refreshed.'
+                    ' Error: {error_msg}',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name,
+                     'error_msg': error}
+                )
+                episodes_from_indexer = None
 
-        if episodes_from_indexer is None:
-            log.warning(
-                '{id}: No data returned from {indexer} during season show update.'
-                ' Unable to update this show',
-                {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name}
-            )
-        else:
-            # for each ep we found on the Indexer delete it from the DB list
-            for cur_season in episodes_from_indexer:
-                for cur_episode in episodes_from_indexer[cur_season]:
-                    if cur_season in episodes_from_db and cur_episode in episodes_from_db[cur_season]:
-                        del episodes_from_db[cur_season][cur_episode]
-
-            # remaining episodes in the DB list are not on the indexer, just delete them from the DB
-            for cur_season in episodes_from_db:
-                for cur_episode in episodes_from_db[cur_season]:
-                    log.debug(
-                        '{id}: Permanently deleting episode {show} {ep} from the database',
-                        {'id': self.show.series_id, 'show': self.show.name,
-                         'ep': episode_num(cur_season, cur_episode)}
-                    )
-                    # Create the ep object only because Im going to delete it
-                    ep_obj = self.show.get_episode(cur_season, cur_episode)
-                    try:
-                        ep_obj.delete_episode()
-                    except EpisodeDeletedException:
+            if episodes_from_indexer is None:
+                log.warning(
+                    '{id}: No data returned from {indexer} during season show update.'
+                    ' Unable to update this show',
+                    {'id': self.show.series_id, 'indexer': indexerApi(self.show.indexer).name}
+                )
+            else:
+                # for each ep we found on the Indexer delete it from the DB list
+                for cur_season in episodes_from_indexer:
+                    for cur_episode in episodes_from_indexer[cur_season]:
+                        if cur_season in episodes_from_db and cur_episode in episodes_from_db[cur_season]:
+                            del episodes_from_db[cur_season][cur_episode]
+
+                # remaining episodes in the DB list are not on the indexer, just delete them from the DB
+                for cur_season in episodes_from_db:
+                    for cur_episode in episodes_from_db[cur_season]:
                         log.debug(
-                            '{id}: Episode {show} {ep} successfully deleted from the database',
+                            '{id}: Permanently deleting episode {show} {ep} from the database',
                             {'id': self.show.series_id, 'show': self.show.name,
                              'ep': episode_num(cur_season, cur_episode)}
                         )
-
-        # Save only after all changes were applied
-        try:
-            log.debug(
-                '{id}: Saving all updated show info to database',
-                {'id': self.show.series_id}
-            )
-            self.show.save_to_db()
-        except Exception as error:
-            log.warning(
-                '{id}: Error saving all updated show info to database: {error_msg}',
-                {'id': self.show.series_id, 'error_msg': error}
-            )
-            log.error(traceback.format_exc())
+                        # Create the ep object only because Im going to delete it
+                        ep_obj = self.show.get_episode(cur_season, cur_episode)
+                        try:
+                            ep_obj.delete_episode()
+                        except EpisodeDeletedException:
+                            log.debug(
+                                '{id}: Episode {show} {ep} successfully deleted from the database',
+                                {'id': self.show.series_id, 'show': self.show.name,
+                                 'ep': episode_num(cur_season, cur_episode)}
+                            )
+
+            # Save only after all changes were applied
+            try:
+                log.debug(
+                    '{id}: Saving all updated show info to database',
+                    {'id': self.show.series_id}
+                )
+                self.show.save_to_db()
+            except Exception as error:
+                log.warning(
+                    '{id}: Error saving all updated show info to database: {error_msg}',
+                    {'id': self.show.series_id, 'error_msg': error}
+                )
+                log.error(traceback.format_exc())
 
         log.info(
             '{id}: Finished update of {show}',
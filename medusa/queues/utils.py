@@ -56,9 +56,8 @@ def generate_show_queue():
 
     # Make a shallow copy of the current queue.
     queue = []
-    queue.extend(app.show_queue_scheduler.action.queue)
-    if app.show_queue_scheduler.action.current_item is not None:
-        queue.insert(0, app.show_queue_scheduler.action.current_item)
+    queue.extend(app.show_queue_scheduler.action.running_items)
+    queue.extend(sorted(app.show_queue_scheduler.action.queue))
 
     return [_queued_show_to_json(item) for item in queue]
 
@@ -74,9 +73,8 @@ def generate_postprocessing_queue():
 
     # Make a shallow copy of the current queue.
     queue = []
-    queue.extend(app.post_processor_queue_scheduler.action.queue)
-    if app.post_processor_queue_scheduler.action.current_item is not None:
-        queue.insert(0, app.post_processor_queue_scheduler.action.current_item)
+    queue.extend(app.post_processor_queue_scheduler.action.running_items)
+    queue.extend(sorted(app.post_processor_queue_scheduler.action.queue))
 
     def map_fields(queue_item):
         """Translate fields with Enums."""
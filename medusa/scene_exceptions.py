@@ -16,6 +16,7 @@ from medusa.helpers import sanitize_scene_name
 from medusa.indexers.api import indexerApi
 from medusa.indexers.config import INDEXER_TVDBV2
 from medusa.logger.adapters.style import BraceAdapter
+from medusa.name_parser.guessit_parser import expected_titles
 from medusa.session.core import MedusaSafeSession
 
 from six import iteritems
@@ -77,6 +78,7 @@ def refresh_exceptions_cache(series_obj=None):
         if series_exception not in exceptions_cache[series][season]:
             exceptions_cache[series][season].add(series_exception)
 
+    expected_titles.invalidate()
     logger.info('Finished processing {x} scene exceptions.', x=len(exceptions))
 
 
@@ -219,6 +221,7 @@ def update_scene_exceptions(series_obj, scene_exceptions):
     main_db_con = db.DBConnection()
 
     exceptions_cache[(series_obj.indexer, series_obj.series_id)].clear()
+    expected_titles.invalidate(series_obj)
     # Remove exceptions for this show, so removed exceptions also become visible.
     main_db_con.action(
         'DELETE FROM scene_exceptions '
@@ -21,6 +21,7 @@ from __future__ import unicode_literals
 import datetime
 import logging
 from builtins import object
+from collections import OrderedDict
 from enum import Enum
 from uuid import uuid4
 
@@ -153,12 +154,42 @@ class DownloadHandler(object):
 
     def save_status_to_history(self, history_row, status):
         """Update history record with a new status."""
-        log.info('Updating status to [{status}] for {resource} with info_hash {info_hash}',
-                 {'status': status, 'resource': history_row['resource'], 'info_hash': history_row['info_hash']})
-        self.main_db_con.action('UPDATE history set client_status = ? WHERE info_hash = ? AND resource = ?',
-                                [status.status, history_row['info_hash'], history_row['resource']])
+        self.save_statuses_to_history([(history_row, status)])
 
-    def _update_status(self, client):
+    def save_statuses_to_history(self, changes):
+        """Update history records with their new status, in one transaction.
+
+        :param changes: tuples of the history row and its new ClientStatus
+        :type changes: list of tuple
+        """
+        if not changes:
+            return
+
+        for history_row, status in changes:
+            log.info('Updating status to [{status}] for {resource} with info_hash {info_hash}',
+                     {'status': status, 'resource': history_row['resource'], 'info_hash': history_row['info_hash']})
+
+        self.main_db_con.executemany([[
+            'UPDATE history set client_status = ? WHERE info_hash = ? AND resource = ?',
+            [[status.status, history_row['info_hash'], history_row['resource']] for history_row, status in changes]
+        ]])
+
+    def _get_client_statuses(self, client, client_type):
+        """Get the status of all the tracked downloads from the client at once.
+
+        :return: the ClientStatus by info_hash of the downloads found on the client,
+            None when the client couldn't be queried.
+        :rtype: dict
+        """
+        info_hashes = list(OrderedDict.fromkeys(
+            history_result['info_hash'] for history_result in self._get_history_results_from_db(client_type)
+        ))
+        if not info_hashes:
+            return {}
+
+        return client.get_statuses(info_hashes)
+
+    def _update_status(self, client, statuses):
         """Update status (in db) with current state on client."""
         excluded = [
             ClientStatusEnum.COMPLETED.value | ClientStatusEnum.POSTPROCESSED.value,
@@ -169,8 +200,9 @@ class DownloadHandler(object):
         ]
 
         client_type = 'torrent' if isinstance(client, GenericClient) else 'nzb'
+        changes = []
         for history_result in self._get_history_results_from_db(client_type, exclude_status=excluded):
-            status = client.get_status(history_result['info_hash'])
+            status = statuses.get(history_result['info_hash'])
             if status:
                 log.debug(
                     'Found {client_type} on {client} with info_hash {info_hash}',
@@ -181,9 +213,11 @@ class DownloadHandler(object):
                     }
                 )
                 if history_result['client_status'] != status.status:
-                    self.save_status_to_history(history_result, status)
+                    changes.append((history_result, status))
+
+        self.save_statuses_to_history(changes)
 
-    def _check_postprocess(self, client):
+    def _check_postprocess(self, client, statuses):
         """Check the history table for ready available downlaods, that need to be post-processed."""
         client_type = 'torrent' if isinstance(client, GenericClient) else 'nzb'
 
@@ -195,7 +229,7 @@ class DownloadHandler(object):
                 ClientStatusEnum.SEEDED.value,
             ],
         ):
-            status = client.get_status(history_result['info_hash'])
+            status = statuses.get(history_result['info_hash'])
             if not status:
                 continue
 
@@ -213,14 +247,18 @@ class DownloadHandler(object):
                 failed=str(status) == 'Failed'
             )
 
-    def _check_torrent_ratio(self, client):
-        """Perform configured action after seed ratio reached (or by configuration)."""
+    def _check_torrent_ratio(self, client, statuses):
+        """Perform configured action after seed ratio reached (or by configuration).
+
+        :return: True when torrents were removed from the client
+        :rtype: bool
+        """
         if app.TORRENT_SEED_ACTION == '':
             log.debug(
                 'No global ratio or provider ratio configured for {client}, skipping actions.',
                 {'client': client.name}
             )
-            return
+            return False
 
         # The base ClienStatus to include in the query.
         include = [
@@ -230,6 +268,7 @@ class DownloadHandler(object):
         from medusa.providers import get_provider_class
         from medusa.providers.generic_provider import GenericProvider
 
+        changes = []
         for history_result in self._get_history_results_from_db(
             'torrent', include_status=include,
         ):
@@ -247,7 +286,7 @@ class DownloadHandler(object):
                 # Not sure if this option is of use.
                 continue
 
-            status = client.get_status(history_result['info_hash'])
+            status = statuses.get(history_result['info_hash'])
             if not status:
                 continue
 
@@ -281,7 +320,10 @@ class DownloadHandler(object):
                 log.debug('Invalid action {action}', {'action': app.TORRENT_SEED_ACTION})
                 continue
 
-            self.save_status_to_history(history_result, ClientStatus(status_string='SeededAction'))
+            changes.append((history_result, ClientStatus(status_string='SeededAction')))
+
+        self.save_statuses_to_history(changes)
+        return bool(changes) and app.TORRENT_SEED_ACTION in ('remove', 'remove_with_data')
 
     def _postprocess(self, path, info_hash, resource_name, failed=False):
         """Queue a postprocess action."""
@@ -301,7 +343,7 @@ class DownloadHandler(object):
                 return False
             return result[0]
 
-    def _clean(self, client):
+    def _clean(self, client, statuses):
         """Update status in the history table for torrents/nzb's that can't be located anymore."""
         client_type = 'torrent' if isinstance(client, GenericClient) else 'nzb'
 
@@ -311,8 +353,9 @@ class DownloadHandler(object):
             log.warning('The client cannot be reached or authentication is failing. Abandon cleanup.')
             return
 
+        changes = []
         for history_result in self._get_history_results_from_db(client_type):
-            if not client.get_status(history_result['info_hash']):
+            if not statuses.get(history_result['info_hash']):
                 log.debug(
                     'Cannot find {client_type} on {client} with info_hash {info_hash}'
                     'Adding status Removed, to prevent from future processing.',
@@ -324,7 +367,9 @@ class DownloadHandler(object):
                 )
                 new_status = ClientStatus(int(history_result['client_status']))
                 new_status.add_status_string('Removed')
-                self.save_status_to_history(history_result, new_status)
+                changes.append((history_result, new_status))
+
+        self.save_statuses_to_history(changes)
 
     def run(self, force=False):
         """Start the Download Handler Thread."""
@@ -339,16 +384,28 @@ class DownloadHandler(object):
         try:
             if app.USE_TORRENTS and app.TORRENT_METHOD != 'blackhole':
                 torrent_client = torrent.get_client_class(app.TORRENT_METHOD)()
-                self._update_status(torrent_client)
-                self._check_postprocess(torrent_client)
-                self._check_torrent_ratio(torrent_client)
-                self._clean(torrent_client)
+                statuses = self._get_client_statuses(torrent_client, 'torrent')
+                if statuses is None:
+                    log.warning('Unable to get the torrents status from {torrent_client}',
+                                torrent_client=app.TORRENT_METHOD)
+                else:
+                    self._update_status(torrent_client, statuses)
+                    self._check_postprocess(torrent_client, statuses)
+                    if self._check_torrent_ratio(torrent_client, statuses):
+                        # The removed torrents are marked Removed by the cleanup
+                        statuses = self._get_client_statuses(torrent_client, 'torrent')
+                    if statuses is not None:
+                        self._clean(torrent_client, statuses)
 
             if app.USE_NZBS and app.NZB_METHOD != 'blackhole':
                 nzb_client = sab if app.NZB_METHOD == 'sabnzbd' else nzbget
-                self._update_status(nzb_client)
-                self._check_postprocess(nzb_client)
-                self._clean(nzb_client)
+                statuses = self._get_client_statuses(nzb_client, 'nzb')
+                if statuses is None:
+                    log.warning('Unable to get the nzbs status from {nzb_client}', nzb_client=app.NZB_METHOD)
+                else:
+                    self._update_status(nzb_client, statuses)
+                    self._check_postprocess(nzb_client, statuses)
+                    self._clean(nzb_client, statuses)
 
         except NotImplementedError:
             log.warning('Feature not currently implemented for this torrent client({torrent_client})',
@@ -4,32 +4,266 @@ from __future__ import division
 from __future__ import unicode_literals
 
 import datetime
+import heapq
+import itertools
 import logging
 import threading
 import time
+from builtins import object
+from concurrent.futures import ThreadPoolExecutor
 
-from medusa import exception_handler
+from medusa import app, exception_handler
 from medusa.logger.adapters.style import BraceAdapter
 
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
+# Longest time the dispatcher sleeps, so it notices a change of the system clock
+MAX_WAIT = 60
+
+
+class SchedulerEngine(object):
+    """Run the scheduled actions from one dispatcher thread, on a bounded pool of worker threads.
+
+    The next run of every started and enabled scheduler is kept in a heap ordered by due time.
+    The dispatcher sleeps until the first one is due, instead of every scheduler polling on its own.
+    The pool has app.SCHEDULER_WORKERS threads, or one for every started scheduler when it's 0,
+    so a long action never delays the others.
+    """
+
+    def __init__(self, max_workers=None):
+        """Initialize the engine.
+
+        :param max_workers: a fixed size of the worker pool, instead of app.SCHEDULER_WORKERS
+        """
+        self.max_workers = max_workers
+        self.condition = threading.Condition()
+        self.schedulers = set()
+        # (due timestamp, sequence, version, scheduler), entries of an older version of a scheduler are skipped
+        self.timers = []
+        self.sequence = itertools.count()
+        self.busy = 0
+        self.executor = None
+        self.executor_workers = 0
+        self.dispatcher = None
+
+    def schedule(self, scheduler):
+        """Schedule the next run of a scheduler, replacing the previous one."""
+        with self.condition:
+            scheduler._version += 1
+            if scheduler._started and not scheduler.stop.is_set():
+                self.schedulers.add(scheduler)
+            else:
+                self.schedulers.discard(scheduler)
+            if scheduler._started and scheduler.enable and not scheduler.stop.is_set() and not scheduler._running:
+                due = time.time()
+                if not scheduler.force:
+                    due += scheduler._time_left().total_seconds()
+                heapq.heappush(self.timers, (due, next(self.sequence), scheduler._version, scheduler))
+                self._start_dispatcher()
+            self.condition.notify()
+
+    def workers(self):
+        """Return the size of the worker pool. Called under the lock."""
+        return self.max_workers or app.SCHEDULER_WORKERS or max(len(self.schedulers), 1)
+
+    def _resize_executor(self):
+        """Replace the worker pool when its size changed, the running actions finish in the old one."""
+        workers = self.workers()
+        if self.executor and self.executor_workers == workers:
+            return
+
+        if self.executor:
+            self.executor.shutdown(wait=False)
+        self.executor = ThreadPoolExecutor(max_workers=workers)
+        self.executor_workers = workers
+
+    def _start_dispatcher(self):
+        """Start the dispatcher thread. Called under the lock."""
+        if self.dispatcher and self.dispatcher.is_alive():
+            return
+
+        self.dispatcher = threading.Thread(target=self._dispatch, name='SCHEDULER')
+        self.dispatcher.daemon = True
+        self.dispatcher.start()
+
+    def _next_due(self):
+        """Wait for the next scheduler that is due, and mark it as running. Called under the lock."""
+        while True:
+            while self.timers and self.timers[0][2] != self.timers[0][3]._version:
+                heapq.heappop(self.timers)
+
+            now = time.time()
+            if self.timers and self.timers[0][0] <= now:
+                due, _, _, scheduler = heapq.heappop(self.timers)
+                if scheduler.stop.is_set():
+                    continue
+                # The system clock changed since it was scheduled
+                if not scheduler.force and scheduler._time_left().total_seconds() > 1:
+                    self.schedule(scheduler)
+                    continue
+
+                scheduler._version += 1
+                scheduler._running = True
+                scheduler._idle.clear()
+                self.busy += 1
+                return scheduler, due
+
+            timeout = MAX_WAIT
+            if self.timers:
+                timeout = min(timeout, self.timers[0][0] - now)
+            self.condition.wait(timeout)
+
+    def _dispatch(self):
+        while True:
+            with self.condition:
+                scheduler, due = self._next_due()
+                self._resize_executor()
+            self.executor.submit(self._run, scheduler, due)
+
+    def _run(self, scheduler, due):
+        """Run the action of a scheduler in a worker thread, named after the scheduler."""
+        current_thread = threading.current_thread()
+        worker_name = current_thread.name
+        current_thread.name = scheduler.name
+
+        start = time.time()
+        scheduler.last_latency = max(start - due, 0)
+        force = scheduler.force
+        # A run forced while this one is running, runs again right after it
+        scheduler._force = False
+        try:
+            if not scheduler.silent:
+                log.debug('Starting new thread: {name}', {'name': scheduler.name})
+            scheduler.action.run(force)
+        except Exception as e:
+            exception_handler.handle(e)
+        finally:
+            scheduler.last_duration = time.time() - start
+            scheduler.run_count += 1
+            with self.condition:
+                scheduler._lastRun = datetime.datetime.now()
+                scheduler._running = False
+                scheduler._idle.set()
+                self.busy -= 1
+                self.schedule(scheduler)
+            current_thread.name = worker_name
+
+    def stats(self):
+        """Return the number of workers, busy workers and scheduled runs."""
+        with self.condition:
+            return {
+                'workers': self.workers(),
+                'busy': self.busy,
+                'scheduled': len({timer[3] for timer in self.timers if timer[2] == timer[3]._version}),
+            }
+
+
+scheduler_engine = SchedulerEngine()
+
+
+class Scheduler(object):
+    """Run an action every cycleTime, or every day at start_time.
+
+    The runs are dispatched by the scheduler engine. Setting any of the scheduling attributes reschedules it.
+    """
 
-class Scheduler(threading.Thread):
     def __init__(self, action, cycleTime=datetime.timedelta(minutes=10), start_time=None,
                  threadName='ScheduledThread', silent=True):
-        super(Scheduler, self).__init__()
-
         self.action = action
-        self.cycleTime = cycleTime if start_time is None else datetime.timedelta(days=1)
-        self.start_time = start_time
+        self._cycleTime = cycleTime if start_time is None else datetime.timedelta(days=1)
+        self._start_time = start_time
 
-        self.lastRun = datetime.datetime.now()
+        self._lastRun = datetime.datetime.now()
         self.name = threadName
         self.silent = silent
         self.stop = threading.Event()
-        self.force = False
-        self.enable = False
+        self._force = False
+        self._enable = False
+
+        self._started = False
+        self._running = False
+        self._version = 0
+        self._idle = threading.Event()
+        self._idle.set()
+        # Observability: seconds the last run took, seconds it started late and the number of runs
+        self.last_duration = None
+        self.last_latency = None
+        self.run_count = 0
+
+    def _reschedule(self):
+        if self._started:
+            scheduler_engine.schedule(self)
+
+    @property
+    def cycleTime(self):
+        return self._cycleTime
+
+    @cycleTime.setter
+    def cycleTime(self, value):
+        self._cycleTime = value
+        self._reschedule()
+
+    @property
+    def start_time(self):
+        return self._start_time
+
+    @start_time.setter
+    def start_time(self, value):
+        self._start_time = value
+        self._reschedule()
+
+    @property
+    def lastRun(self):
+        return self._lastRun
+
+    @lastRun.setter
+    def lastRun(self, value):
+        self._lastRun = value
+        self._reschedule()
+
+    @property
+    def force(self):
+        return self._force
+
+    @force.setter
+    def force(self, value):
+        self._force = value
+        self._reschedule()
+
+    @property
+    def enable(self):
+        return self._enable
+
+    @enable.setter
+    def enable(self, value):
+        self._enable = value
+        self._reschedule()
+
+    def start(self):
+        """Start scheduling the action."""
+        self._started = True
+        scheduler_engine.schedule(self)
+
+    def join(self, timeout=None):
+        """Wait for a running action to finish, once the scheduler is stopped."""
+        scheduler_engine.schedule(self)
+        self._idle.wait(timeout)
+
+    def is_alive(self):
+        """Return True when the scheduler was started and isn't stopped."""
+        return self._started and not self.stop.is_set()
+
+    def _time_left(self):
+        if self.start_time is None:
+            return self.cycleTime - (datetime.datetime.now() - self.lastRun)
+        else:
+            last_run = self.lastRun
+            start_time_next = datetime.datetime.combine(last_run.date(), self.start_time)
+            if last_run > start_time_next:
+                start_time_next += self.cycleTime
+
+            return start_time_next - datetime.datetime.now()
 
     def timeLeft(self):
         """
@@ -38,15 +272,7 @@ class Scheduler(threading.Thread):
         :return: timedelta
         """
         if self.is_alive():
-            if self.start_time is None:
-                return self.cycleTime - (datetime.datetime.now() - self.lastRun)
-            else:
-                last_run = self.lastRun
-                start_time_next = datetime.datetime.combine(last_run.date(), self.start_time)
-                if last_run > start_time_next:
-                    start_time_next += self.cycleTime
-
-                return start_time_next - datetime.datetime.now()
+            return self._time_left()
         else:
             return datetime.timedelta(seconds=0)
 
@@ -55,34 +281,3 @@ class Scheduler(threading.Thread):
             self.force = True
             return True
         return False
-
-    def run(self):
-        """Run the thread."""
-        try:
-            while not self.stop.is_set():
-                if self.enable:
-                    should_run = False
-                    time_left = self.timeLeft()
-
-                    # Is self.force enable
-                    if self.force:
-                        should_run = True
-
-                    # check if interval has passed
-                    elif time_left.total_seconds() <= 0:
-                        should_run = True
-
-                    if should_run:
-                        if not self.silent:
-                            log.debug('Starting new thread: {name}', {'name': self.name})
-                        self.action.run(self.force)
-                        self.lastRun = datetime.datetime.now()
-
-                    if self.force:
-                        self.force = False
-
-                time.sleep(1)
-            # exiting thread
-            self.stop.clear()
-        except Exception as e:
-            exception_handler.handle(e)
@@ -3,8 +3,12 @@
 from __future__ import unicode_literals
 
 from medusa import app
+from medusa.helpers.utils import to_camel_case
+from medusa.queues.generic_queue import GenericQueue
 from medusa.sbdatetime import sbdatetime
 
+from six import viewitems
+
 
 all_schedulers = [
     ('dailySearch', 'Daily Search', 'daily_search_scheduler'),
@@ -22,6 +26,7 @@ all_schedulers = [
     ('snatchQueue', 'Snatch Queue', 'manual_snatch_scheduler'),
     ('downloadHandler', 'Download Handler', 'download_handler_scheduler'),
     ('episodeUpdater', 'Episode Updater', 'episode_update_scheduler'),
+    ('diskUsage', 'Disk Usage', 'disk_usage_scheduler'),
 ]
 
 
@@ -54,6 +59,16 @@ def _queue_length(key, scheduler):
     return 0
 
 
+def _queue_stats(scheduler):
+    if not isinstance(scheduler.action, GenericQueue):
+        return None
+
+    return {
+        to_camel_case(key): round(value, 3) if isinstance(value, float) else value
+        for key, value in viewitems(scheduler.action.stats())
+    }
+
+
 def _scheduler_to_json(key, name, scheduler):
     scheduler = getattr(app, scheduler)
     if not scheduler:
@@ -73,8 +88,12 @@ def _scheduler_to_json(key, name, scheduler):
         'cycleTime': int(scheduler.cycleTime.total_seconds()) or None,
         'nextRun': int(scheduler.timeLeft().total_seconds()) if scheduler.enable else None,
         'lastRun': sbdatetime.convert_to_setting(scheduler.lastRun.replace(microsecond=0)).isoformat(),
+        'lastDuration': round(scheduler.last_duration, 3) if scheduler.last_duration is not None else None,
+        'lastLatency': round(scheduler.last_latency, 3) if scheduler.last_latency is not None else None,
+        'runCount': scheduler.run_count,
         'isSilent': bool(scheduler.silent),
         'queueLength': _queue_length(key, scheduler),
+        'queueStats': _queue_stats(scheduler),
     }
 
 
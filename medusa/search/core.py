@@ -28,6 +28,7 @@ from medusa.clients.nzb import (
     sab,
 )
 from medusa.common import (
+    DOWNLOADED,
     MULTI_EP_RESULT,
     Quality,
     SEASON_RESULT,
@@ -35,6 +36,7 @@ from medusa.common import (
     SNATCHED_BEST,
     SNATCHED_PROPER,
     UNSET,
+    WANTED,
 )
 from medusa.helper.common import (
     enabled_providers,
@@ -48,6 +50,7 @@ from medusa.helpers import chmod_as_parent
 from medusa.helpers.utils import to_timestamp
 from medusa.logger.adapters.style import CustomBraceAdapter
 from medusa.network_timezones import app_timezone
+from medusa.search.provider_pool import ProviderPool, ProviderTimeout
 from medusa.show import naming
 
 from six import iteritems, itervalues
@@ -433,6 +436,10 @@ def is_first_best_match(result):
     return Quality.wanted_quality(result.quality, [], preferred_qualities)
 
 
+# Statuses for which Quality.should_search can ever return True
+SEARCHABLE_STATUSES = (WANTED, DOWNLOADED, SNATCHED, SNATCHED_PROPER, SNATCHED_BEST)
+
+
 def wanted_episodes(series_obj, from_date):
     """
     Get a list of episodes that we want to download.
@@ -441,32 +448,89 @@ def wanted_episodes(series_obj, from_date):
     :param from_date: Search from a certain date
     :return: list of wanted episodes
     """
-    wanted = []
-    allowed_qualities, preferred_qualities = series_obj.current_qualities
-    all_qualities = list(set(allowed_qualities + preferred_qualities))
+    return wanted_episodes_for_shows([series_obj], from_date)
 
-    log.debug(u'Seeing if we need anything from {0}', series_obj.name)
-    con = db.DBConnection()
 
-    sql_results = con.select(
-        'SELECT status, quality, season, episode, manually_searched '
-        'FROM tv_episodes '
-        'WHERE indexer = ? '
-        ' AND showid = ?'
-        ' AND season > 0'
-        ' AND airdate > ?',
-        [series_obj.indexer, series_obj.series_id, from_date.toordinal()]
+def wanted_episodes_for_shows(series_list, from_date):
+    """
+    Get a list of episodes that we want to download, for a list of shows at once.
+
+    All candidate episodes are fetched with a single query, which already filters out the episodes
+    that won't be searched because of their status, quality or being manually searched.
+    The remaining rows are checked once per show and quality with Quality.should_search,
+    and only the wanted episodes are loaded as Episode objects.
+
+    :param series_list: List of Series objects
+    :param from_date: Search from a certain date
+    :return: list of wanted episodes, grouped per show in the order of `series_list`
+    """
+    series_by_id = {(series_obj.indexer, series_obj.series_id): series_obj for series_obj in series_list}
+    if not series_by_id:
+        return []
+
+    # The quality column of tv_shows holds the allowed qualities in the lower 16 bits,
+    # and the preferred qualities in the upper 16 bits. See Quality.combine_qualities.
+    # Episodes that are not WANTED are only searched, when their quality is not preferred and
+    # either there are preferred qualities or the quality isn't allowed. See Quality.should_search.
+    # An episode without a quality has Quality.NA.
+    query = (
+        'SELECT e.indexer, e.showid, e.status, e.quality, e.season, e.episode '
+        'FROM tv_episodes e '
+        'JOIN tv_shows s ON s.indexer = e.indexer AND s.indexer_id = e.showid '
+        'WHERE e.status IN ({statuses})'
+        ' AND e.season > 0'
+        ' AND e.airdate > ?'
+        ' AND IFNULL(e.manually_searched, 0) = 0'
+        ' AND (e.status = ?'
+        '  OR (IFNULL(e.quality, 0) & (s.quality >> 16)) = 0'
+        '  AND ((s.quality >> 16) != 0 OR (IFNULL(e.quality, 0) & (s.quality & 65535)) = 0))'.format(
+            statuses=','.join('?' * len(SEARCHABLE_STATUSES))
+        )
     )
+    params = list(SEARCHABLE_STATUSES) + [from_date.toordinal(), WANTED]
+
+    if len(series_by_id) == 1:
+        query += ' AND e.indexer = ? AND e.showid = ?'
+        params += list(next(iter(series_by_id)))
+
+    con = db.DBConnection()
+    sql_results = con.select(query, params)
 
-    # check through the list of statuses to see if we want any
+    rows_per_show = {}
     for episode in sql_results:
-        cur_status, cur_quality = int(episode['status'] or UNSET), int(episode['quality'] or Quality.NA)
-        should_search, should_search_reason = Quality.should_search(
-            cur_status, cur_quality, series_obj, episode['manually_searched']
-        )
-        if not should_search:
-            continue
-        else:
+        series_id = (episode['indexer'], episode['showid'])
+        if series_id in series_by_id:
+            rows_per_show.setdefault(series_id, []).append(episode)
+
+    wanted = []
+    for series_obj in series_list:
+        series_id = (series_obj.indexer, series_obj.series_id)
+        log.debug(u'Seeing if we need anything from {0}', series_obj.name)
+        allowed_qualities, preferred_qualities = series_obj.current_qualities
+        all_qualities = list(set(allowed_qualities + preferred_qualities))
+        # Only a handful of status/quality combinations exist for a show, so evaluate each one only once
+        decisions = {}
+
+        for episode in rows_per_show.get(series_id, []):
+            cur_status, cur_quality = int(episode['status'] or UNSET), int(episode['quality'] or Quality.NA)
+            key = (cur_status == WANTED, cur_quality)
+            if key not in decisions:
+                should_search, should_search_reason = Quality.should_search(
+                    cur_status, cur_quality, series_obj, False
+                )
+                wanted_quality = [
+                    quality
+                    for quality in all_qualities
+                    if Quality.is_higher_quality(
+                        cur_quality, quality, allowed_qualities, preferred_qualities
+                    )
+                ] if should_search else None
+                decisions[key] = should_search, should_search_reason, wanted_quality
+
+            should_search, should_search_reason, wanted_quality = decisions[key]
+            if not should_search:
+                continue
+
             log.debug(
                 u'Searching for {show} {ep}. Reason: {reason}', {
                     u'show': series_obj.name,
@@ -475,15 +539,9 @@ def wanted_episodes(series_obj, from_date):
                 }
             )
 
-        ep_obj = series_obj.get_episode(episode['season'], episode['episode'])
-        ep_obj.wanted_quality = [
-            quality
-            for quality in all_qualities
-            if Quality.is_higher_quality(
-                cur_quality, quality, allowed_qualities, preferred_qualities
-            )
-        ]
-        wanted.append(ep_obj)
+            ep_obj = series_obj.get_episode(episode['season'], episode['episode'])
+            ep_obj.wanted_quality = list(wanted_quality)
+            wanted.append(ep_obj)
 
     return wanted
 
@@ -495,18 +553,19 @@ def search_for_needed_episodes(scheduler_start_time, force=False):
     :param scheduler_start_time: timestamp of the start of the search scheduler
     :return: list of found episodes
     """
-    show_list = app.showList
     from_date = datetime.date.fromordinal(1)
-    episodes = []
+    show_list = []
 
-    for cur_show in show_list:
+    for cur_show in app.showList:
         if cur_show.paused:
             log.debug(
                 u'Not checking for needed episodes of {0} because the show is paused',
                 cur_show.name,
             )
             continue
-        episodes.extend(wanted_episodes(cur_show, from_date))
+        show_list.append(cur_show)
+
+    episodes = wanted_episodes_for_shows(show_list, from_date)
 
     if not episodes and not force:
         # nothing wanted so early out, ie: avoid whatever arbitrarily
@@ -525,11 +584,17 @@ def search_for_needed_episodes(scheduler_start_time, force=False):
     original_thread_name = threading.currentThread().name
     log.info(u'Using daily search providers')
 
-    for cur_provider in providers:
-        threading.currentThread().name = u'{thread} :: [{provider}]'.format(
-            thread=original_thread_name, provider=cur_provider.name
-        )
-        cur_provider.cache.update_cache(scheduler_start_time)
+    if ProviderPool.enabled():
+        tasks = ProviderPool().map(lambda provider: provider.cache.update_cache(scheduler_start_time), providers)
+        for task in tasks:
+            if task.error is not None and not isinstance(task.error, ProviderTimeout):
+                log.error(u'Failed to update the cache of provider {0}: {1}', task.provider.name, ex(task.error))
+    else:
+        for cur_provider in providers:
+            threading.currentThread().name = u'{thread} :: [{provider}]'.format(
+                thread=original_thread_name, provider=cur_provider.name
+            )
+            cur_provider.cache.update_cache(scheduler_start_time)
 
     single_results = {}
     multi_results = []
@@ -641,6 +706,9 @@ def search_providers(series_obj, episodes, forced_search=False, down_cur_quality
     """
     Walk providers for information on shows.
 
+    When concurrent provider searches are enabled, the providers are queried in parallel and their
+    results are merged afterwards, in the same order as they would have been when searching serially.
+
     :param series_obj: Show we are looking for
     :param episodes: List, episodes we hope to find
     :param forced_search: Boolean, is this a forced search?
@@ -649,7 +717,6 @@ def search_providers(series_obj, episodes, forced_search=False, down_cur_quality
     :param manual_search_type: Episode or Season search
     :return: results for search
     """
-    found_results = {}
     manual_search_results = []
     multi_results = []
     single_results = []
@@ -672,81 +739,37 @@ def search_providers(series_obj, episodes, forced_search=False, down_cur_quality
 
     threading.currentThread().name = original_thread_name
 
-    for cur_provider in providers:
-        threading.currentThread().name = '{original_thread_name} :: [{provider}]'.format(
-            original_thread_name=original_thread_name, provider=cur_provider.name
-        )
-
-        if cur_provider.anime_only and not series_obj.is_anime:
-            log.debug(u'{0} is not an anime, skipping', series_obj.name)
-            continue
-
-        found_results[cur_provider.name] = {}
-        search_count = 0
-        search_mode = cur_provider.search_mode
-
-        # Always search for episode when manually searching when in sponly
-        if search_mode == u'sponly' and (forced_search or manual_search):
-            search_mode = u'eponly'
-
-        if manual_search and manual_search_type == u'season':
-            search_mode = u'sponly'
-
-        while True:
-            search_count += 1
+    if not series_obj.is_anime and any(provider.anime_only for provider in providers):
+        log.debug(u'{0} is not an anime, skipping anime only providers', series_obj.name)
+        providers = [provider for provider in providers if not provider.anime_only]
 
-            if search_mode == u'eponly':
-                log.info(u'Performing episode search for {0}', series_obj.name)
-            else:
-                log.info(u'Performing season pack search for {0}', series_obj.name)
-
-            try:
-                search_results = []
-                needed_eps = episodes
-
-                if not manual_search:
-                    cache_search_results = cur_provider.search_results_in_cache(episodes)
-                    if cache_search_results:
-                        cache_found_results = list_results_for_provider(cache_search_results, found_results, cur_provider)
-                        multi_results, single_results = collect_candidates(
-                            cache_found_results, cur_provider, multi_results, single_results
-                        )
-                        found_eps = itertools.chain(*(result.episodes for result in multi_results + single_results))
-                        needed_eps = [ep for ep in episodes if ep not in found_eps]
-
-                # We only search if we didn't get any useful results from cache
-                if needed_eps:
-                    log.debug(u'Could not find all candidates in cache, searching provider.')
-                    search_results = cur_provider.find_search_results(series_obj, needed_eps, search_mode, forced_search,
-                                                                      down_cur_quality, manual_search, manual_search_type)
-                    # Update the list found_results
-                    found_results = list_results_for_provider(search_results, found_results, cur_provider)
-                    multi_results, single_results = collect_candidates(
-                        found_results, cur_provider, multi_results, single_results
-                    )
-                    found_eps = itertools.chain(*(result.episodes for result in multi_results + single_results))
-                    needed_eps = [ep for ep in episodes if ep not in found_eps]
+    search_args = (series_obj, episodes, forced_search, down_cur_quality, manual_search, manual_search_type)
+    provider_results = []
 
-            except AuthException as error:
-                log.error(u'Authentication error: {0!r}', error)
-                break
-
-            if not needed_eps and found_results:
-                break
-            elif not cur_provider.search_fallback or search_count == 2:
-                break
-
-            # Don't fallback when doing manual season search
-            if manual_search_type == u'season':
-                break
+    if ProviderPool.enabled():
+        for task in ProviderPool().map(lambda provider: _search_provider(provider, *search_args), providers):
+            if task.error is not None:
+                if not isinstance(task.error, ProviderTimeout):
+                    log.error(u'Error while searching {0}, skipping: {1!r}', task.provider.name, task.error)
+                continue
 
-            if search_mode == u'sponly':
-                log.debug(u'Fallback episode search initiated')
-                search_mode = u'eponly'
-            else:
-                log.debug(u'Fallback season pack search initiated')
-                search_mode = u'sponly'
+            # Merge the candidates per provider, in the same order as a serial search would have
+            found_results, search_results, _, _ = task.result
+            multi_results, single_results = collect_candidates(
+                found_results, task.provider, multi_results, single_results
+            )
+            provider_results.append((task.provider, found_results, search_results))
+    else:
+        for cur_provider in providers:
+            threading.currentThread().name = '{original_thread_name} :: [{provider}]'.format(
+                original_thread_name=original_thread_name, provider=cur_provider.name
+            )
+            found_results, search_results, multi_results, single_results = _search_provider(
+                cur_provider, *search_args, multi_results=multi_results, single_results=single_results
+            )
+            provider_results.append((cur_provider, found_results, search_results))
 
+    for cur_provider, found_results, search_results in provider_results:
         # skip to next provider if we have no results to process
         if not found_results[cur_provider.name]:
             continue
@@ -764,8 +787,6 @@ def search_providers(series_obj, episodes, forced_search=False, down_cur_quality
                         cur_provider.cache.update_cache_manual_search(search_results[searched_episode])):
                     # If we have at least a result from one provider, it's good enough to be marked as result
                     manual_search_results.append(True)
-            # Continue because we don't want to pick best results as we are running a manual search by user
-            continue
 
     # Remove provider from thread name before return results
     threading.currentThread().name = original_thread_name
@@ -777,6 +798,88 @@ def search_providers(series_obj, episodes, forced_search=False, down_cur_quality
         return combine_results(multi_results, single_results)
 
 
+def _search_provider(cur_provider, series_obj, episodes, forced_search, down_cur_quality,
+                     manual_search, manual_search_type, multi_results=None, single_results=None):
+    """
+    Search a single provider, falling back between episode and season pack searches.
+
+    :param cur_provider: Provider object to search
+    :param multi_results: Multi-episode candidates collected from previous providers
+    :param single_results: Single-episode candidates collected from previous providers
+    :return: tuple of the providers found results, its last search results and the updated candidates
+    """
+    found_results = {cur_provider.name: {}}
+    multi_results = multi_results or []
+    single_results = single_results or []
+    search_results = {}
+    search_count = 0
+    search_mode = cur_provider.search_mode
+
+    # Always search for episode when manually searching when in sponly
+    if search_mode == u'sponly' and (forced_search or manual_search):
+        search_mode = u'eponly'
+
+    if manual_search and manual_search_type == u'season':
+        search_mode = u'sponly'
+
+    while True:
+        search_count += 1
+
+        if search_mode == u'eponly':
+            log.info(u'Performing episode search for {0}', series_obj.name)
+        else:
+            log.info(u'Performing season pack search for {0}', series_obj.name)
+
+        try:
+            search_results = {}
+            needed_eps = episodes
+
+            if not manual_search:
+                cache_search_results = cur_provider.search_results_in_cache(episodes)
+                if cache_search_results:
+                    cache_found_results = list_results_for_provider(cache_search_results, found_results, cur_provider)
+                    multi_results, single_results = collect_candidates(
+                        cache_found_results, cur_provider, multi_results, single_results
+                    )
+                    found_eps = itertools.chain(*(result.episodes for result in multi_results + single_results))
+                    needed_eps = [ep for ep in episodes if ep not in found_eps]
+
+            # We only search if we didn't get any useful results from cache
+            if needed_eps:
+                log.debug(u'Could not find all candidates in cache, searching provider.')
+                search_results = cur_provider.find_search_results(series_obj, needed_eps, search_mode, forced_search,
+                                                                  down_cur_quality, manual_search, manual_search_type)
+                # Update the list found_results
+                found_results = list_results_for_provider(search_results, found_results, cur_provider)
+                multi_results, single_results = collect_candidates(
+                    found_results, cur_provider, multi_results, single_results
+                )
+                found_eps = itertools.chain(*(result.episodes for result in multi_results + single_results))
+                needed_eps = [ep for ep in episodes if ep not in found_eps]
+
+        except AuthException as error:
+            log.error(u'Authentication error: {0!r}', error)
+            break
+
+        if not needed_eps and found_results:
+            break
+        elif not cur_provider.search_fallback or search_count == 2:
+            break
+
+        # Don't fallback when doing manual season search
+        if manual_search_type == u'season':
+            break
+
+        if search_mode == u'sponly':
+            log.debug(u'Fallback episode search initiated')
+            search_mode = u'eponly'
+        else:
+            log.debug(u'Fallback season pack search initiated')
+            search_mode = u'sponly'
+
+    return found_results, search_results, multi_results, single_results
+
+
 def collect_candidates(found_results, provider, multi_results, single_results):
     """Collect candidates for episode, multi-episode or season results."""
     # Collect candidates for multi-episode or season results
@@ -0,0 +1,149 @@
+# coding=utf-8
+
+"""Run provider operations concurrently on a bounded pool of worker threads."""
+from __future__ import unicode_literals
+
+import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from medusa import app
+from medusa.logger.adapters.style import BraceAdapter
+
+from six.moves.urllib.parse import urlparse
+
+log = BraceAdapter(logging.getLogger(__name__))
+log.logger.addHandler(logging.NullHandler())
+
+# Interval (seconds) used to re-check running providers against their timeout
+POLL_INTERVAL = 0.5
+
+
+class ProviderTimeout(Exception):
+    """A provider did not finish within the configured timeout."""
+
+
+class ProviderTask(object):
+    """The outcome of running a callable for a single provider."""
+
+    def __init__(self, provider):
+        """Initialize the task."""
+        self.provider = provider
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def duration(self):
+        """Return the run time of this task in seconds, or None when it didn't finish."""
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class ProviderPool(object):
+    """
+    Run a callable for each provider on a bounded pool of worker threads.
+
+    Tasks are returned in the same order the providers were given, so callers can merge
+    the results exactly as they would have done when walking the providers one by one.
+    """
+
+    def __init__(self, max_workers=None, timeout=None, max_per_host=None):
+        """
+        Initialize the pool.
+
+        :param max_workers: Maximum number of providers queried at the same time.
+        :param timeout: Seconds a provider is allowed to run, before its result is discarded.
+        :param max_per_host: Maximum number of concurrent requests against the same host.
+        """
+        self.max_workers = max(1, max_workers if max_workers is not None else app.PROVIDER_SEARCH_WORKERS)
+        self.timeout = timeout if timeout is not None else app.PROVIDER_SEARCH_TIMEOUT
+        self.max_per_host = max(1, max_per_host if max_per_host is not None else app.PROVIDER_SEARCH_MAX_PER_HOST)
+        self._host_locks = defaultdict(lambda: threading.BoundedSemaphore(self.max_per_host))
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def enabled():
+        """Return True if providers should be queried concurrently."""
+        return app.PROVIDER_SEARCH_WORKERS > 1
+
+    @staticmethod
+    def get_host(provider):
+        """Return the host a provider sends its requests to."""
+        return urlparse(getattr(provider, 'url', '') or '').hostname or provider.get_id()
+
+    def _host_lock(self, provider):
+        with self._lock:
+            return self._host_locks[self.get_host(provider)]
+
+    def _run(self, func, task, thread_name):
+        with self._host_lock(task.provider):
+            current_thread = threading.current_thread()
+            worker_name = current_thread.name
+            current_thread.name = '{thread} :: [{provider}]'.format(
+                thread=thread_name, provider=task.provider.name
+            )
+            task.started = time.time()
+            try:
+                return func(task.provider)
+            finally:
+                task.finished = time.time()
+                current_thread.name = worker_name
+
+    def map(self, func, providers):
+        """
+        Call `func(provider)` for every provider.
+
+        Exceptions raised by `func` are not propagated, but stored on the returned task.
+        A provider that exceeds the timeout gets a `ProviderTimeout` error, its worker is
+        left to finish in the background and its result is discarded.
+
+        :param func: Callable taking a provider as its only argument.
+        :param providers: List of providers.
+        :return: List of ProviderTask, in the same order as `providers`.
+        """
+        tasks = [ProviderTask(provider) for provider in providers]
+        if not tasks:
+            return tasks
+
+        thread_name = threading.current_thread().name
+        executor = ThreadPoolExecutor(max_workers=min(self.max_workers, len(tasks)))
+        futures = {
+            executor.submit(self._run, func, task, thread_name): task
+            for task in tasks
+        }
+
+        pending = set(futures)
+        timed_out = set()
+        try:
+            while pending:
+                _, pending = wait(pending, timeout=POLL_INTERVAL)
+                if not self.timeout:
+                    continue
+
+                now = time.time()
+                for future in list(pending):
+                    task = futures[future]
+                    if task.started is not None and task.finished is None and now - task.started > self.timeout:
+                        log.warning('Provider {provider} did not respond within {timeout} seconds, skipping it',
+                                    {'provider': task.provider.name, 'timeout': self.timeout})
+                        pending.discard(future)
+                        timed_out.add(future)
+        finally:
+            executor.shutdown(wait=False)
+
+        for future, task in futures.items():
+            if future in timed_out:
+                # A late result must never be merged, as the caller already moved on.
+                task.error = ProviderTimeout(task.provider.name)
+                continue
+            try:
+                task.result = future.result()
+            except Exception as error:
+                task.error = error
+
+        return tasks
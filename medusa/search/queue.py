@@ -1145,13 +1145,30 @@ class ProperSearchQueueItem(generic_queue.QueueItem):
 
 
 class PostProcessQueue(generic_queue.GenericQueue):
-    """Queue for queuing PostProcess queue objects."""
+    """Queue for queuing PostProcess queue objects.
+
+    Runs up to app.POSTPROCESS_WORKERS items at the same time. An item without a resource_name
+    processes a whole folder, so it only runs on its own.
+    """
 
     def __init__(self):
         """Initialize the PostProcess queue object."""
         generic_queue.GenericQueue.__init__(self)
         self.queue_name = 'POSTPROCESSQUEUE'
 
+    @property
+    def workers(self):
+        """Return the number of post-process workers."""
+        return max(app.POSTPROCESS_WORKERS, 1)
+
+    def _can_start(self, item):
+        """Check if an item can run next to the running items."""
+        if not self.running_items:
+            return True
+        if not item.resource_name:
+            return False
+        return all(running_item.resource_name for running_item in self.running_items)
+
     def is_in_queue(self, item):
         """
         Check if the postprocess job is in queue based on it's path and resource_name.
@@ -1174,10 +1191,8 @@ class PostProcessQueue(generic_queue.GenericQueue):
 
         :return: True or False
         """
-        if not self.current_item:
-            return False
-
-        return item.path == self.current_item.path and item.resource_name == self.current_item.resource_name
+        return any(item.path == running_item.path and item.resource_name == running_item.resource_name
+                   for running_item in self.running_items)
 
     def queue_length(self):
         """
@@ -18,7 +18,7 @@ from babelfish.language import Language
 
 import jwt
 
-from medusa import app
+from medusa import app, db
 from medusa.logger.adapters.style import BraceAdapter
 
 from six import ensure_text, iteritems, string_types, text_type, viewitems
@@ -361,13 +361,73 @@ class BaseRequestHandler(RequestHandler):
                     return self._bad_request('Invalid sort query parameter')
 
             count = len(results)
-            headers['X-Pagination-Count'] = count
             results = results[start:end]
-            next_page = None if end > count else arg_page + 1
-            last_page = ((count - 1) // arg_limit) + 1
-            headers['X-Pagination-Total'] = last_page
-            if last_page <= arg_page:
-                last_page = None
+            next_page, last_page = self._count_pages(count, arg_page, arg_limit, headers)
+
+        return self._paginated(results, headers, next_page, first_page, previous_page, last_page)
+
+    def _paginate_query(self, query, args=None, formatter=None, sort_fields=None, sort=None, tiebreaker=None,
+                        default_limit=20):
+        """Paginate the results of a select query in the database.
+
+        The database sorts, counts and limits the results to the requested page,
+        so only the rows of that page are read and formatted.
+
+        :param query: select query, without ORDER BY and LIMIT
+        :param args: the query arguments
+        :param formatter: function to format a row, the rows it returns None for are left out
+        :param sort_fields: the SQL expression of every field the results can be sorted on
+        :type sort_fields: dict
+        :param sort: the default sort
+        :param tiebreaker: the SQL order of the rows with the same sort values
+        :param default_limit: the number of results per page, when it isn't requested
+        """
+        arg_page = self._get_page()
+        arg_limit = self._get_limit(default=default_limit)
+        arg_sort = self._get_sort(default=sort)
+        args = list(args or [])
+        formatter = formatter or dict
+
+        order = []
+        for field, reverse in arg_sort or []:
+            if field not in (sort_fields or {}):
+                return self._bad_request('Invalid sort query parameter')
+            order.append('{0} {1}'.format(sort_fields[field], 'DESC' if reverse else 'ASC'))
+        if tiebreaker:
+            order.append(tiebreaker)
+
+        headers = {
+            'X-Pagination-Page': arg_page,
+            'X-Pagination-Limit': arg_limit
+        }
+
+        main_db_con = db.DBConnection(row_type='row')
+        count = main_db_con.selectOne('SELECT COUNT(*) FROM ({query})'.format(query=query), args)[0]
+        if order:
+            query += ' ORDER BY ' + ', '.join(order)
+        rows = main_db_con.select(query + ' LIMIT ? OFFSET ?', args + [arg_limit, (arg_page - 1) * arg_limit])
+
+        results = [result for result in (formatter(row) for row in rows) if result is not None]
+        next_page, last_page = self._count_pages(count, arg_page, arg_limit, headers)
+
+        return self._paginated(results, headers, next_page, arg_page, None if arg_page <= 1 else arg_page - 1,
+                               last_page)
+
+    @staticmethod
+    def _count_pages(count, arg_page, arg_limit, headers):
+        """Return the next and the last page, and add the count and the number of pages to the headers."""
+        headers['X-Pagination-Count'] = count
+        next_page = None if arg_page * arg_limit > count else arg_page + 1
+        last_page = ((count - 1) // arg_limit) + 1
+        headers['X-Pagination-Total'] = last_page
+        if last_page <= arg_page:
+            last_page = None
+
+        return next_page, last_page
+
+    def _paginated(self, results, headers, next_page, first_page, previous_page, last_page):
+        """Return a page of results, with the links to the other pages."""
+        arg_limit = headers['X-Pagination-Limit']
 
         # Reconstruct the query parameters
         query_params = []
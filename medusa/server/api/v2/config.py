@@ -23,6 +23,8 @@ from medusa.common import IGNORED, Quality, SKIPPED, WANTED, cpu_presets
 from medusa.helpers.utils import int_default, to_camel_case
 from medusa.indexers.config import INDEXER_TVDBV2, get_indexer_config
 from medusa.logger.adapters.style import BraceAdapter
+from medusa.name_parser.guessit_parser import guessit_cache
+from medusa.name_parser.parser import configure_parse_caches, name_parser_cache
 from medusa.queues.utils import (
     generate_location_disk_space,
     generate_postprocessing_queue,
@@ -63,6 +65,12 @@ def theme_name_setter(object, name, value):
     config.change_theme(value)
 
 
+def parse_cache_setter(object, name, value):
+    """Apply the parse cache settings."""
+    setattr(object, name, value)
+    configure_parse_caches()
+
+
 def season_folders_validator(value):
     """Validate default season folders setting."""
     return not (app.NAMING_FORCE_FOLDERS and value is False)
@@ -104,6 +112,8 @@ class ConfigHandler(BaseRequestHandler):
 
         'indexerDefaultLanguage': StringField(app, 'INDEXER_DEFAULT_LANGUAGE'),
         'showUpdateHour': IntegerField(app, 'SHOWUPDATE_HOUR'),
+        'showUpdateWorkers': IntegerField(app, 'SHOW_UPDATE_WORKERS'),
+        'schedulerWorkers': IntegerField(app, 'SCHEDULER_WORKERS'),
         'indexerTimeout': IntegerField(app, 'INDEXER_TIMEOUT'),
         'indexerDefault': IntegerField(app, 'INDEXER_DEFAULT'),
         'plexFallBack.enable': BooleanField(app, 'FALLBACK_PLEX_ENABLE'),
@@ -226,6 +236,7 @@ class ConfigHandler(BaseRequestHandler):
         'postProcessing.noDelete': BooleanField(app, 'NO_DELETE'),
         'postProcessing.postponeIfSyncFiles': BooleanField(app, 'POSTPONE_IF_SYNC_FILES'),
         'postProcessing.autoPostprocessorFrequency': IntegerField(app, 'AUTOPOSTPROCESSOR_FREQUENCY'),
+        'postProcessing.postprocessWorkers': IntegerField(app, 'POSTPROCESS_WORKERS'),
         'postProcessing.airdateEpisodes': BooleanField(app, 'AIRDATE_EPISODES'),
 
         'postProcessing.moveAssociatedFiles': BooleanField(app, 'MOVE_ASSOCIATED_FILES'),
@@ -256,6 +267,18 @@ class ConfigHandler(BaseRequestHandler):
         'postProcessing.downloadHandler.torrentSeedAction': StringField(app, 'TORRENT_SEED_ACTION'),
 
         'search.general.randomizeProviders': BooleanField(app, 'RANDOMIZE_PROVIDERS'),
+        'search.general.providerSearchWorkers': IntegerField(app, 'PROVIDER_SEARCH_WORKERS'),
+        'search.general.providerSearchTimeout': IntegerField(app, 'PROVIDER_SEARCH_TIMEOUT'),
+        'search.general.providerSearchMaxPerHost': IntegerField(app, 'PROVIDER_SEARCH_MAX_PER_HOST'),
+        'search.general.nameParserWorkers': IntegerField(app, 'NAME_PARSER_WORKERS'),
+        'search.general.persistentParseCache': BooleanField(app, 'PARSE_CACHE_PERSISTENT',
+                                                            setter=parse_cache_setter),
+        'search.general.parseCacheSize': IntegerField(app, 'PARSE_CACHE_SIZE', validator=lambda v: v > 0,
+                                                      setter=parse_cache_setter),
+        'search.general.nameParserCacheSize': IntegerField(app, 'NAME_PARSER_CACHE_SIZE', validator=lambda v: v > 0,
+                                                           setter=parse_cache_setter),
+        'search.general.guessitCacheSize': IntegerField(app, 'GUESSIT_CACHE_SIZE', validator=lambda v: v > 0,
+                                                        setter=parse_cache_setter),
         'search.general.downloadPropers': BooleanField(app, 'DOWNLOAD_PROPERS'),
         'search.general.checkPropersInterval': StringField(app, 'CHECK_PROPERS_INTERVAL'),
         # 'search.general.propersIntervalLabels': IntegerField(app, 'PROPERS_INTERVAL_LABELS'),
@@ -644,6 +667,8 @@ class DataGenerator(object):
 
         section_data['indexerDefaultLanguage'] = app.INDEXER_DEFAULT_LANGUAGE
         section_data['showUpdateHour'] = int_default(app.SHOWUPDATE_HOUR, app.DEFAULT_SHOWUPDATE_HOUR)
+        section_data['showUpdateWorkers'] = int(app.SHOW_UPDATE_WORKERS)
+        section_data['schedulerWorkers'] = int(app.SCHEDULER_WORKERS)
         section_data['indexerTimeout'] = int_default(app.INDEXER_TIMEOUT, 20)
         section_data['indexerDefault'] = app.INDEXER_DEFAULT
 
@@ -799,6 +824,14 @@ class DataGenerator(object):
 
         section_data['general'] = {}
         section_data['general']['randomizeProviders'] = bool(app.RANDOMIZE_PROVIDERS)
+        section_data['general']['providerSearchWorkers'] = int_default(app.PROVIDER_SEARCH_WORKERS, 1)
+        section_data['general']['providerSearchTimeout'] = int_default(app.PROVIDER_SEARCH_TIMEOUT, 300)
+        section_data['general']['providerSearchMaxPerHost'] = int_default(app.PROVIDER_SEARCH_MAX_PER_HOST, 1)
+        section_data['general']['nameParserWorkers'] = int_default(app.NAME_PARSER_WORKERS, 1)
+        section_data['general']['persistentParseCache'] = bool(app.PARSE_CACHE_PERSISTENT)
+        section_data['general']['parseCacheSize'] = int_default(app.PARSE_CACHE_SIZE, 100)
+        section_data['general']['nameParserCacheSize'] = int_default(app.NAME_PARSER_CACHE_SIZE, 1000)
+        section_data['general']['guessitCacheSize'] = int_default(app.GUESSIT_CACHE_SIZE, 25000)
         section_data['general']['downloadPropers'] = bool(app.DOWNLOAD_PROPERS)
         section_data['general']['checkPropersInterval'] = app.CHECK_PROPERS_INTERVAL
         # This can be moved to the frontend. No need to keep in config. The selected option is stored in CHECK_PROPERS_INTERVAL.
@@ -1050,6 +1083,10 @@ class DataGenerator(object):
         section_data['showQueue'] = generate_show_queue()
         section_data['postProcessQueue'] = generate_postprocessing_queue()
         section_data['diskSpace'] = generate_location_disk_space()
+        section_data['parseCache'] = {
+            'nameParser': {to_camel_case(key): value for key, value in iteritems(name_parser_cache.stats())},
+            'guessit': {to_camel_case(key): value for key, value in iteritems(guessit_cache.stats())},
+        }
 
         section_data['branch'] = app.BRANCH
         section_data['commitHash'] = app.CUR_COMMIT_HASH
@@ -1169,6 +1206,7 @@ class DataGenerator(object):
         section_data['processMethod'] = app.PROCESS_METHOD
         section_data['reflinkAvailable'] = bool(pkgutil.find_loader('reflink'))
         section_data['autoPostprocessorFrequency'] = int(app.AUTOPOSTPROCESSOR_FREQUENCY)
+        section_data['postprocessWorkers'] = int(app.POSTPROCESS_WORKERS)
         section_data['syncFiles'] = app.SYNC_FILES
         section_data['fileTimestampTimezone'] = app.FILE_TIMESTAMP_TIMEZONE
         section_data['allowedExtensions'] = app.ALLOWED_EXTENSIONS
@@ -69,63 +69,59 @@ class EpisodeHistoryHandler(BaseRequestHandler):
 
         params = [series.series_id, series.indexer, episode.season, episode.episode]
 
-        sql_base += ' ORDER BY date DESC'
-        results = db.DBConnection().select(sql_base, params)
-
-        def data_generator():
-            """Read history data and normalize key/value pairs."""
-            for item in results:
-                provider = {}
-                release_group = None
-                release_name = None
-                file_name = None
-                subtitle_language = None
-
-                if item['action'] in (SNATCHED, FAILED):
-                    provider.update({
-                        'id': GenericProvider.make_id(item['provider']),
-                        'name': item['provider']
-                    })
-                    release_name = item['resource']
-
-                if item['action'] == DOWNLOADED:
-                    release_group = item['provider']
-                    file_name = item['resource']
-
-                if item['action'] == SUBTITLED:
-                    subtitle_language = item['resource']
-                    provider.update({
-                        'id': item['provider'],
-                        'name': item['provider']
-                    })
-
-                if item['action'] == SUBTITLED:
-                    subtitle_language = item['resource']
-
-                yield {
-                    'id': item['rowid'],
-                    'series': SeriesIdentifier.from_id(item['indexer_id'], item['showid']).slug,
-                    'status': item['action'],
-                    'statusName': statusStrings.get(item['action']),
-                    'actionDate': item['date'],
-                    'quality': item['quality'],
-                    'resource': basename(item['resource']),
-                    'size': item['size'],
-                    'properTags': item['proper_tags'],
-                    'season': item['season'],
-                    'episode': item['episode'],
-                    'manuallySearched': bool(item['manually_searched']),
-                    'infoHash': item['info_hash'],
-                    'provider': provider,
-                    'release_name': release_name,
-                    'releaseGroup': release_group,
-                    'fileName': file_name,
-                    'subtitleLanguage': subtitle_language
-                }
-
-        if not results:
+        main_db_con = db.DBConnection(row_type='row')
+        if not main_db_con.selectOne('SELECT EXISTS ({query})'.format(query=sql_base), params)[0]:
             return self._not_found('History data not found for show {show} and episode {episode}'.format(
                 show=series.identifier.slug, episode=episode.slug
             ))
 
-        return self._ok(data=list(data_generator()))
+        def format_item(item):
+            """Normalize the key/value pairs of a history record."""
+            provider = {}
+            release_group = None
+            release_name = None
+            file_name = None
+            subtitle_language = None
+
+            if item['action'] in (SNATCHED, FAILED):
+                provider.update({
+                    'id': GenericProvider.make_id(item['provider']),
+                    'name': item['provider']
+                })
+                release_name = item['resource']
+
+            if item['action'] == DOWNLOADED:
+                release_group = item['provider']
+                file_name = item['resource']
+
+            if item['action'] == SUBTITLED:
+                subtitle_language = item['resource']
+                provider.update({
+                    'id': item['provider'],
+                    'name': item['provider']
+                })
+
+            return {
+                'id': item['rowid'],
+                'series': SeriesIdentifier.from_id(item['indexer_id'], item['showid']).slug,
+                'status': item['action'],
+                'statusName': statusStrings.get(item['action']),
+                'actionDate': item['date'],
+                'quality': item['quality'],
+                'resource': basename(item['resource']),
+                'size': item['size'],
+                'properTags': item['proper_tags'],
+                'season': item['season'],
+                'episode': item['episode'],
+                'manuallySearched': bool(item['manually_searched']),
+                'infoHash': item['info_hash'],
+                'provider': provider,
+                'release_name': release_name,
+                'releaseGroup': release_group,
+                'fileName': file_name,
+                'subtitleLanguage': subtitle_language
+            }
+
+        # The history of an episode used to be returned at once, it fits on a page
+        return self._paginate_query(sql_base, params, formatter=format_item, sort_fields=HistoryHandler.sort_fields,
+                                    sort='-actionDate', tiebreaker='rowid DESC', default_limit=1000)
@@ -38,6 +38,17 @@ class EpisodeHandler(BaseRequestHandler):
     path_param = ('path_param', r'\w+')
     #: allowed HTTP methods
     allowed_methods = ('GET', 'PATCH', 'DELETE',)
+    #: the fields the episodes can be sorted on, and their column
+    sort_fields = {
+        'airDate': 'airdate',
+        'season': 'season',
+        'episode': 'episode',
+        'absoluteNumber': 'absolute_number',
+        'title': 'name',
+        'description': 'description',
+        'watched': 'watched',
+        'quality': 'quality',
+    }
 
     def get(self, series_slug, episode_slug, path_param):
         """Query episode information.
@@ -57,8 +68,15 @@ class EpisodeHandler(BaseRequestHandler):
         if not episode_slug:
             detailed = self._parse_boolean(self.get_argument('detailed', default=False))
             season = self._parse(self.get_argument('season', None), int)
-            data = [e.to_json(detailed=detailed) for e in series.get_all_episodes(season=season)]
-            return self._paginate(data, sort='airDate')
+            query, args = series.get_episodes_query(season=season)
+
+            def format_episode(result):
+                episode = series.get_episode_from_result(result)
+                return episode.to_json(detailed=detailed) if episode else None
+
+            # Only the episodes of the requested page are loaded
+            return self._paginate_query(query, args, formatter=format_episode, sort_fields=self.sort_fields,
+                                        sort='airDate', tiebreaker='season ASC, episode ASC')
 
         episode_number = EpisodeNumber.from_slug(episode_slug)
         if not episode_number:
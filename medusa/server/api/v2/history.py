@@ -24,6 +24,17 @@ class HistoryHandler(BaseRequestHandler):
     #: allowed HTTP methods
     allowed_methods = ('GET', 'POST', 'PUT', 'DELETE')
 
+    #: the fields the history can be sorted on, and their column
+    sort_fields = {
+        'id': 'rowid',
+        'actionDate': 'date',
+        'status': 'action',
+        'quality': 'quality',
+        'size': 'size',
+        'season': 'season',
+        'episode': 'episode',
+    }
+
     def get(self, series_slug, path_param):
         """
         Get history records.
@@ -39,9 +50,6 @@ class HistoryHandler(BaseRequestHandler):
         """
         params = []
 
-        arg_page = self._get_page()
-        arg_limit = self._get_limit(default=50)
-
         if series_slug is not None:
             series_identifier = SeriesIdentifier.from_slug(series_slug)
             if not series_identifier:
@@ -50,77 +58,70 @@ class HistoryHandler(BaseRequestHandler):
             sql_base += ' WHERE indexer_id = ? AND showid = ?'
             params += [series_identifier.indexer.id, series_identifier.id]
 
-        sql_base += ' ORDER BY date DESC'
-        results = db.DBConnection().select(sql_base, params)
-
-        def data_generator():
-            """Read and paginate history records."""
-            start = arg_limit * (arg_page - 1)
-
-            for item in results[start:start + arg_limit]:
-                provider = {}
-                release_group = None
-                release_name = None
-                file_name = None
-                subtitle_language = None
-                show_slug = None
-                client_status = None
-
-                if item['action'] in (SNATCHED, FAILED):
-                    provider.update({
-                        'id': GenericProvider.make_id(item['provider']),
-                        'name': item['provider']
-                    })
-                    release_name = item['resource']
-
-                if item['action'] == DOWNLOADED:
-                    release_group = item['provider']
-                    file_name = item['resource']
-
-                if item['action'] == SUBTITLED:
-                    subtitle_language = item['resource']
-
-                if item['action'] == SUBTITLED:
-                    subtitle_language = item['resource']
-
-                if item['client_status'] is not None:
-                    status = ClientStatus(status=item['client_status'])
-                    client_status = {
-                        'status': [s.value for s in status],
-                        'string': status.status_to_array_string()
-                    }
-
-                if item['indexer_id'] and item['showid']:
-                    show_slug = SeriesIdentifier.from_id(item['indexer_id'], item['showid']).slug
-
-                yield {
-                    'id': item['rowid'],
-                    'series': show_slug,
-                    'status': item['action'],
-                    'statusName': statusStrings.get(item['action']),
-                    'actionDate': item['date'],
-                    'quality': item['quality'],
-                    'resource': basename(item['resource']),
-                    'size': item['size'],
-                    'properTags': item['proper_tags'],
-                    'season': item['season'],
-                    'episode': item['episode'],
-                    'manuallySearched': bool(item['manually_searched']),
-                    'infoHash': item['info_hash'],
-                    'provider': provider,
-                    'releaseName': release_name,
-                    'releaseGroup': release_group,
-                    'fileName': file_name,
-                    'subtitleLanguage': subtitle_language,
-                    'providerType': item['provider_type'],
-                    'clientStatus': client_status,
-                    'partOfBatch': bool(item['part_of_batch'])
-                }
-
-        if not results:
+        main_db_con = db.DBConnection(row_type='row')
+        if not main_db_con.selectOne('SELECT EXISTS ({query})'.format(query=sql_base), params)[0]:
             return self._not_found('History data not found')
 
-        return self._paginate(data_generator=data_generator)
+        def format_item(item):
+            """Format a history record."""
+            provider = {}
+            release_group = None
+            release_name = None
+            file_name = None
+            subtitle_language = None
+            show_slug = None
+            client_status = None
+
+            if item['action'] in (SNATCHED, FAILED):
+                provider.update({
+                    'id': GenericProvider.make_id(item['provider']),
+                    'name': item['provider']
+                })
+                release_name = item['resource']
+
+            if item['action'] == DOWNLOADED:
+                release_group = item['provider']
+                file_name = item['resource']
+
+            if item['action'] == SUBTITLED:
+                subtitle_language = item['resource']
+
+            if item['client_status'] is not None:
+                status = ClientStatus(status=item['client_status'])
+                client_status = {
+                    'status': [s.value for s in status],
+                    'string': status.status_to_array_string()
+                }
+
+            if item['indexer_id'] and item['showid']:
+                show_slug = SeriesIdentifier.from_id(item['indexer_id'], item['showid']).slug
+
+            return {
+                'id': item['rowid'],
+                'series': show_slug,
+                'status': item['action'],
+                'statusName': statusStrings.get(item['action']),
+                'actionDate': item['date'],
+                'quality': item['quality'],
+                'resource': basename(item['resource']),
+                'size': item['size'],
+                'properTags': item['proper_tags'],
+                'season': item['season'],
+                'episode': item['episode'],
+                'manuallySearched': bool(item['manually_searched']),
+                'infoHash': item['info_hash'],
+                'provider': provider,
+                'releaseName': release_name,
+                'releaseGroup': release_group,
+                'fileName': file_name,
+                'subtitleLanguage': subtitle_language,
+                'providerType': item['provider_type'],
+                'clientStatus': client_status,
+                'partOfBatch': bool(item['part_of_batch'])
+            }
+
+        return self._paginate_query(sql_base, params, formatter=format_item, sort_fields=self.sort_fields,
+                                    sort='-actionDate', tiebreaker='rowid DESC', default_limit=50)
 
     def delete(self, identifier, **kwargs):
         """Delete a history record."""
@@ -8,7 +8,7 @@ import threading
 from contextlib import contextmanager
 from datetime import datetime, timedelta
 
-from medusa.logger import LOGGING_LEVELS, filter_logline, read_loglines
+from medusa.logger import LOGGING_LEVELS, filter_logline, instance, read_loglines
 from medusa.logger.adapters.style import BraceAdapter
 from medusa.server.api.v2.base import BaseRequestHandler
 
@@ -115,20 +115,32 @@ class LogHandler(BaseRequestHandler):
 
         def data_generator():
             """Read log lines based on the specified criteria."""
-            start = arg_limit * (arg_page - 1) + 1
-            reader_kwargs = dict(
-                modification_time=modification_time,
-                start_index=start,
-                max_lines=arg_limit * arg_page,
-                predicate=lambda li: filter_logline(
-                    li,
+            log_store = instance.log_store
+            if log_store:
+                lines = log_store.read(
                     min_level=min_level,
                     thread_name=thread_name,
-                    search_query=search_query
-                ),
-            )
-
-            for line in read_loglines(**reader_kwargs):
+                    search_query=search_query,
+                    modification_time=modification_time,
+                    offset=arg_limit * (arg_page - 1),
+                    limit=arg_limit,
+                )
+            else:
+                start = arg_limit * (arg_page - 1) + 1
+                reader_kwargs = dict(
+                    modification_time=modification_time,
+                    start_index=start,
+                    max_lines=arg_limit * arg_page,
+                    predicate=lambda li: filter_logline(
+                        li,
+                        min_level=min_level,
+                        thread_name=thread_name,
+                        search_query=search_query
+                    ),
+                )
+                lines = read_loglines(**reader_kwargs)
+
+            for line in lines:
                 yield line.to_json() if not raw_text else text_type(line)
 
         if not raw_text:
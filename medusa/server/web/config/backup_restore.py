@@ -7,6 +7,7 @@ import time
 
 from medusa import (
     app,
+    db,
     helpers,
 )
 from medusa.server.web.config.handler import Config
@@ -43,6 +44,7 @@ class ConfigBackupRestore(Config):
                 for filename in files:
                     source.append(os.path.join(path, filename))
 
+            db.checkpoint()
             if helpers.backup_config_zip(source, target, app.DATA_DIR):
                 final_result += 'Successful backup to {location}'.format(location=target)
             else:
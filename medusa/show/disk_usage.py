@@ -0,0 +1,156 @@
+# coding=utf-8
+"""Keep track of the disk usage of the shows, without walking their folders for every request."""
+from __future__ import unicode_literals
+
+import logging
+import os
+import threading
+
+from medusa import app, db, helpers
+from medusa.logger.adapters.style import BraceAdapter
+
+log = BraceAdapter(logging.getLogger(__name__))
+log.logger.addHandler(logging.NullHandler())
+
+
+class DiskUsage(object):
+    """The disk usage of the shows.
+
+    The size of a show is the sum of its episode file sizes, as stored in tv_episodes.file_size,
+    plus the size of the other files in the show folder (metadata, subtitles, ...).
+    A multi-episode file is stored for each of its episodes, it's counted once by its location.
+    The episode file sizes are updated when an episode file changes, the size of the other files
+    is only known after the show folder was walked by the DiskUsageReconciler.
+    """
+
+    def __init__(self):
+        """Initialize the disk usage."""
+        self.lock = threading.Lock()
+        # The episode file locations by (season, episode), for every (indexer, series id)
+        self.episodes = {}
+        # The size of every episode file and the number of episodes in it by location, for every (indexer, series id)
+        self.files = {}
+        # The total of the episode file sizes for every (indexer, series id)
+        self.totals = {}
+        # The size of the files that aren't episode files for every (indexer, series id),
+        # None when the show folder doesn't exist
+        self.other_files = {}
+
+    @staticmethod
+    def _key(series):
+        return series.indexer, series.series_id
+
+    def _load(self, key):
+        """Load the episode file sizes of a show from the database. Called under the lock."""
+        if key in self.episodes:
+            return self.episodes[key]
+
+        main_db_con = db.DBConnection()
+        sql_results = main_db_con.select(
+            'SELECT season, episode, location, file_size '
+            'FROM tv_episodes '
+            'WHERE indexer = ? AND showid = ? AND file_size > 0 AND location != ?',
+            list(key) + [''])
+
+        episodes = {}
+        files = {}
+        for row in sql_results:
+            location = os.path.normpath(row['location'])
+            episodes[(row['season'], row['episode'])] = location
+            files.setdefault(location, [0, 0])
+            files[location][0] = int(row['file_size'])
+            files[location][1] += 1
+
+        self.episodes[key] = episodes
+        self.files[key] = files
+        self.totals[key] = sum(size for size, _ in files.values())
+        return episodes
+
+    def get_size(self, series):
+        """Return the size of the show on disk.
+
+        :param series:
+        :type series: medusa.tv.series.Series
+        :return: the size in bytes, or -1 when the show folder doesn't exist
+        :rtype: int
+        """
+        key = self._key(series)
+        with self.lock:
+            self._load(key)
+            if key in self.other_files and self.other_files[key] is None:
+                return -1
+            return self.totals[key] + self.other_files.get(key, 0)
+
+    def update_episode(self, series, season, episode, file_size, location=None):
+        """Update the file of an episode, when the disk usage of the show is loaded.
+
+        :param file_size: the new file size, 0 or None when the episode has no file anymore
+        :type file_size: int
+        :param location: the new file
+        :type location: str
+        """
+        key = self._key(series)
+        with self.lock:
+            # Not loaded yet, the new file size will be loaded from the database
+            episodes = self.episodes.get(key)
+            if episodes is None:
+                return
+            files = self.files[key]
+
+            old_location = episodes.pop((season, episode), None)
+            if old_location is not None:
+                files[old_location][1] -= 1
+                if not files[old_location][1]:
+                    self.totals[key] -= files.pop(old_location)[0]
+
+            if file_size and location:
+                location = os.path.normpath(location)
+                episodes[(season, episode)] = location
+                old_size, count = files.get(location, (0, 0))
+                files[location] = [file_size, count + 1]
+                self.totals[key] += file_size - old_size
+
+    def remove(self, series):
+        """Forget the disk usage of a show."""
+        key = self._key(series)
+        with self.lock:
+            self.episodes.pop(key, None)
+            self.files.pop(key, None)
+            self.totals.pop(key, None)
+            self.other_files.pop(key, None)
+
+    def reconcile(self, series):
+        """Walk the show folder, to correct the size of the files that aren't episode files.
+
+        :return: the size of the show on disk
+        :rtype: int
+        """
+        size = helpers.get_size(series.location)
+
+        key = self._key(series)
+        with self.lock:
+            self._load(key)
+            self.other_files[key] = size - self.totals[key] if size >= 0 else None
+
+        return size
+
+
+class DiskUsageReconciler(object):
+    """Walk the show folders in the background, to correct the drift of the tracked disk usage."""
+
+    def __init__(self):
+        """Initialize the reconciler."""
+        self.amActive = False
+
+    def run(self, force=False):
+        """Reconcile the disk usage of all shows."""
+        self.amActive = True
+        try:
+            for series in list(app.showList):
+                disk_usage.reconcile(series)
+            log.debug('Reconciled the disk usage of {count} shows', {'count': len(app.showList)})
+        finally:
+            self.amActive = False
+
+
+disk_usage = DiskUsage()
@@ -20,6 +20,7 @@ from __future__ import unicode_literals
 
 import logging
 from builtins import object
+from contextlib import closing
 from datetime import date
 
 from medusa import app
@@ -40,6 +41,7 @@ from medusa.helper.exceptions import (
     ex,
 )
 from medusa.logger.adapters.style import BraceAdapter
+from medusa.show.show_list import ShowList
 
 
 log = BraceAdapter(logging.getLogger(__name__))
@@ -112,6 +114,16 @@ class Show(object):
 
         raise MultipleShowObjectsException()
 
+    @staticmethod
+    def find_by_slug(slug):
+        """
+        Find a show by its slug in app.showList.
+
+        :param slug: The slug of the desired show, for example: tvdb1234
+        :return: The desired show if found, ``None`` if not found
+        """
+        return app.showList.find_by_slug(slug)
+
     @staticmethod
     def find_by_id(series, indexer_id, series_id):
         """
@@ -140,6 +152,9 @@ class Show(object):
         if series_id is None or series is None or len(series) == 0:
             return None
 
+        if isinstance(series, ShowList):
+            return series.find_by_id(indexer_id, series_id)
+
         # indexer_ids = [show_id] if not isinstance(show_id, list) else show_id
         results = [show for show in series if show.indexer == indexer_id and show.indexerid == series_id]
 
@@ -151,7 +166,7 @@ class Show(object):
 
     @staticmethod
     def overall_stats():
-        db = DBConnection()
+        db = DBConnection(row_type='row')
         shows = app.showList
         today = date.today().toordinal()
 
@@ -159,14 +174,6 @@ class Show(object):
         snatched_status = [SNATCHED, SNATCHED_PROPER, SNATCHED_BEST]
         total_status = [SKIPPED, WANTED]
 
-        results = db.select(
-            'SELECT airdate, status, quality '
-            'FROM tv_episodes '
-            'WHERE season > 0 '
-            'AND episode > 0 '
-            'AND airdate > 1'
-        )
-
         stats = {
             'episodes': {
                 'downloaded': 0,
@@ -179,15 +186,22 @@ class Show(object):
             },
         }
 
-        for result in results:
-            if result['status'] in downloaded_status:
-                stats['episodes']['downloaded'] += 1
-                stats['episodes']['total'] += 1
-            elif result['status'] in snatched_status:
-                stats['episodes']['snatched'] += 1
-                stats['episodes']['total'] += 1
-            elif result['airdate'] <= today and result['status'] in total_status:
-                stats['episodes']['total'] += 1
+        with closing(db.select_iter(
+            'SELECT airdate, status, quality '
+            'FROM tv_episodes '
+            'WHERE season > 0 '
+            'AND episode > 0 '
+            'AND airdate > 1'
+        )) as results:
+            for result in results:
+                if result['status'] in downloaded_status:
+                    stats['episodes']['downloaded'] += 1
+                    stats['episodes']['total'] += 1
+                elif result['status'] in snatched_status:
+                    stats['episodes']['snatched'] += 1
+                    stats['episodes']['total'] += 1
+                elif result['airdate'] <= today and result['status'] in total_status:
+                    stats['episodes']['total'] += 1
 
         return stats
 
@@ -0,0 +1,149 @@
+# coding=utf-8
+"""List of series, indexed by indexer id and slug."""
+from __future__ import unicode_literals
+
+import threading
+
+
+class ShowList(list):
+    """
+    A list of series, which keeps a lookup index on (indexer, series_id) and slug.
+
+    The index is maintained on every change to the list. Series that change their indexer or series id
+    should call `reindex`, so the lookups stay O(1).
+    `version` is increased on every change, so data derived from the list can be cached until it changes.
+    """
+
+    def __init__(self, iterable=()):
+        """Initialize the list and build the index."""
+        super(ShowList, self).__init__(iterable)
+        self._lock = threading.RLock()
+        self.version = 0
+        self._rebuild()
+
+    @staticmethod
+    def _key(series):
+        return getattr(series, 'indexer', None), getattr(series, 'indexerid', None)
+
+    def _rebuild(self):
+        with self._lock:
+            self.version += 1
+            self._by_id = {}
+            self._by_slug = {}
+            self._keys = {}
+            for series in self:
+                self._add(series)
+
+    def _add(self, series):
+        self.version += 1
+        if series is None:
+            return
+
+        key = self._key(series)
+        slug = getattr(series, 'slug', None)
+        self._by_id.setdefault(key, series)
+        if slug:
+            self._by_slug.setdefault(slug, series)
+        self._keys[id(series)] = key, slug
+
+    def _discard(self, series):
+        self.version += 1
+        keys = self._keys.pop(id(series), None)
+        if keys is None:
+            return
+
+        key, slug = keys
+        if self._by_id.get(key) is series:
+            del self._by_id[key]
+        if self._by_slug.get(slug) is series:
+            del self._by_slug[slug]
+
+        # Another series with the same id can still be in the list
+        if any(self._key(other) == key for other in self if other is not series and other is not None):
+            self._rebuild()
+
+    def find_by_id(self, indexer_id, series_id):
+        """Return the series matching the indexer and series id, or None when not in the list."""
+        series = self._by_id.get((indexer_id, series_id))
+        if series is not None and self._key(series) != (indexer_id, series_id):
+            # Changed its ids without being reindexed
+            self._rebuild()
+            series = self._by_id.get((indexer_id, series_id))
+        return series
+
+    def find_by_slug(self, slug):
+        """Return the series matching the slug, or None when not in the list."""
+        series = self._by_slug.get(slug)
+        if series is not None and getattr(series, 'slug', None) != slug:
+            self._rebuild()
+            series = self._by_slug.get(slug)
+        return series
+
+    def reindex(self, series):
+        """Update the index of a series that is part of this list, after its indexer or series id changed."""
+        with self._lock:
+            if id(series) not in self._keys:
+                return
+            self._discard(series)
+            self._add(series)
+
+    def append(self, series):
+        """Add a series to the end of the list."""
+        with self._lock:
+            super(ShowList, self).append(series)
+            self._add(series)
+
+    def extend(self, iterable):
+        """Add multiple series to the end of the list."""
+        with self._lock:
+            iterable = list(iterable)
+            super(ShowList, self).extend(iterable)
+            for series in iterable:
+                self._add(series)
+
+    def __iadd__(self, iterable):
+        """Add multiple series to the end of the list."""
+        self.extend(iterable)
+        return self
+
+    def insert(self, index, series):
+        """Insert a series before index."""
+        with self._lock:
+            super(ShowList, self).insert(index, series)
+            self._add(series)
+
+    def remove(self, series):
+        """Remove the first occurrence of a series."""
+        with self._lock:
+            for index, other in enumerate(self):
+                if other is series:
+                    break
+            else:
+                index = self.index(series)
+                series = self[index]
+            super(ShowList, self).__delitem__(index)
+            self._discard(series)
+
+    def pop(self, index=-1):
+        """Remove and return the series at index."""
+        with self._lock:
+            series = super(ShowList, self).pop(index)
+            self._discard(series)
+            return series
+
+    def clear(self):
+        """Remove all series from the list."""
+        with self._lock:
+            del self[:]
+
+    def __setitem__(self, index, value):
+        """Replace one or more series and rebuild the index."""
+        with self._lock:
+            super(ShowList, self).__setitem__(index, value)
+            self._rebuild()
+
+    def __delitem__(self, index):
+        """Delete one or more series and rebuild the index."""
+        with self._lock:
+            super(ShowList, self).__delitem__(index)
+            self._rebuild()
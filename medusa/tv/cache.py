@@ -4,12 +4,16 @@
 
 from __future__ import unicode_literals
 
+import hashlib
 import itertools
 import logging
+import sqlite3
+import threading
 import traceback
 from builtins import object
 from builtins import str
-from collections import defaultdict
+from collections import OrderedDict, defaultdict
+from contextlib import closing
 from time import time
 
 from medusa import (
@@ -31,11 +35,105 @@ from medusa.show.show import Show
 from medusa.tv.series import SeriesIdentifier
 
 from six import text_type, viewitems
+from six.moves.urllib.parse import urlencode
 
 log = BraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
 
+# Columns of a provider cache table, that are written for each cache entry
+CACHE_COLUMNS = (
+    'identifier', 'name', 'season', 'episodes', 'indexer', 'indexerid', 'url', 'time', 'quality',
+    'release_group', 'version', 'seeders', 'leechers', 'size', 'pubdate', 'proper_tags', 'date_added',
+)
+
+EPISODE_INDEX_QUERY = (
+    'INSERT OR IGNORE INTO provider_episodes '
+    '   (provider, indexer, indexerid, season, episode, identifier) '
+    'VALUES (?,?,?,?,?,?)'
+)
+
+# Episode number a season pack is indexed as, episode 0 is a special
+SEASON_PACK_EPISODE = -1
+
+# Max number of variables in a single query, for SQLite versions prior to 3.32.0
+MAX_VARIABLES = 999
+
+# Number of feed entries parsed at once, so a cache update that hits the recent results stops parsing
+PARSE_CHUNK_SIZE = 20
+
+
+def episode_index_rows(provider_id, identifier, indexer, series_id, season, episodes):
+    """
+    Return the provider_episodes rows for a cache entry, to be inserted with `EPISODE_INDEX_QUERY`.
+
+    :param provider_id: Provider id, the name of the provider's cache table
+    :param identifier: Identifier of the cache entry
+    :param indexer: Indexer id of the series
+    :param series_id: Series id
+    :param season: Season number
+    :param episodes: Episodes stored as a separated string, like `|1|2|`.
+        A season pack (`||`) is stored as `SEASON_PACK_EPISODE`.
+    :return: list of rows, empty when there is nothing to index
+    """
+    if indexer is None or series_id is None or season is None:
+        return []
+
+    episode_numbers = {int(episode) for episode in (episodes or '').split('|') if episode} or {SEASON_PACK_EPISODE}
+    return [
+        [provider_id, indexer, series_id, season, episode, identifier]
+        for episode in sorted(episode_numbers)
+    ]
+
+
+def create_episode_index(connection, provider_id):
+    """
+    Keep the provider_episodes table in sync with a provider's cache table.
+
+    The episodes of new and updated cache entries are added by `Cache.save_cache_entries`.
+    Triggers remove them again, when an entry is deleted or its episodes are changed.
+    Entries cached before the triggers existed are indexed once.
+
+    :param connection: Connection to the cache database
+    :param provider_id: Provider id, the name of the provider's cache table
+    """
+    if not connection.hasTable('provider_episodes'):
+        return
+
+    trigger = 'provider_episodes_delete_{name}'.format(name=provider_id)
+    if connection.select("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name = ?", [trigger]):
+        return
+
+    log.debug('Creating episode index for {0}', provider_id)
+    provider = provider_id.replace("'", "''")
+    connection.action(
+        'CREATE TRIGGER IF NOT EXISTS {trigger} '
+        'AFTER DELETE ON [{name}] '
+        'BEGIN '
+        "   DELETE FROM provider_episodes WHERE provider = '{provider}' AND identifier = OLD.identifier; "
+        'END'.format(trigger=trigger, name=provider_id, provider=provider)
+    )
+    connection.action(
+        'CREATE TRIGGER IF NOT EXISTS provider_episodes_update_{name} '
+        'AFTER UPDATE OF season, episodes, indexer, indexerid ON [{name}] '
+        'BEGIN '
+        "   DELETE FROM provider_episodes WHERE provider = '{provider}' AND identifier = OLD.identifier; "
+        'END'.format(name=provider_id, provider=provider)
+    )
+
+    connection.action('DELETE FROM provider_episodes WHERE provider = ?', [provider_id])
+    sql_results = connection.select(
+        'SELECT identifier, indexer, indexerid, season, episodes '
+        'FROM [{name}]'.format(name=provider_id)
+    )
+    connection.executemany([[EPISODE_INDEX_QUERY, [
+        index_row
+        for row in sql_results
+        for index_row in episode_index_rows(provider_id, row['identifier'], row['indexer'],
+                                            row['indexerid'], row['season'], row['episodes'])
+    ]]])
+
+
 class CacheDBConnection(db.DBConnection):
     """Cache database class."""
 
@@ -102,6 +200,8 @@ class CacheDBConnection(db.DBConnection):
                 if not self.hasColumn(provider_id, column):
                     self.addColumn(provider_id, column, data_type, default)
 
+            create_episode_index(self, provider_id)
+
         except Exception as error:
             msg = 'table [{name}] already exists'.format(name=provider_id)
             if str(error) != msg:
@@ -134,6 +234,8 @@ class Cache(object):
         self.provider_db = None
         self.minTime = kwargs.pop('min_time', 10)
         self.search_params = kwargs.pop('search_params', dict(RSS=['']))
+        # The feed of the cache update running in the current thread
+        self.feed = threading.local()
 
     def _get_db(self):
         """Initialize provider database if not done already."""
@@ -223,7 +325,30 @@ class Cache(object):
             return
 
         try:
-            data = self._get_rss_data()
+            self.feed.state = self._get_feed_state()
+            shows = self._hash_shows()
+            if self.feed.state.get('shows') != shows:
+                # The releases of an added or renamed show weren't cached, parse the whole feed again
+                self.feed.state = {}
+            self.feed.new_state = None
+            self.feed.unchanged = False
+            try:
+                data = self._get_rss_data()
+            finally:
+                state, self.feed.state = self.feed.state, None
+
+            entries = (data['entries'] or []) if data else []
+            if not self.feed.unchanged and self.feed.new_state is None:
+                # Not a conditional feed request, compare the entries returned by the provider
+                entries_hash = self._hash_entries(entries)
+                self.feed.unchanged = state.get('url') == '' and state.get('hash') == entries_hash
+                self.feed.new_state = {'url': '', 'etag': None, 'last_modified': None, 'hash': entries_hash}
+
+            if self.feed.unchanged:
+                log.debug('The feed of {0} is unchanged since the last update, not parsing it', self.provider_id)
+                self.updated = search_start_time
+                return
+
             if self._check_auth(data):
                 # clear cache
                 self._clear_cache()
@@ -237,14 +362,12 @@ class Cache(object):
                 # counter for number of items found in cache
                 found_recent_results = 0
                 search_results = []
-                query_results = []
+                cache_entries = []
                 index = 0
 
-                for index, item in enumerate(data['entries'] or []):
-                    try:
-                        parsed_result = NameParser().parse(item['title'])
-                    except (InvalidNameException, InvalidShowException) as error:
-                        log.debug('{0}', error)
+                for index, (item, parsed_result) in enumerate(self._parse_entries(entries)):
+                    if isinstance(parsed_result, Exception):
+                        log.debug('{0}', parsed_result)
                         continue
 
                     search_result = self.provider.get_result(series=parsed_result.series,
@@ -252,9 +375,9 @@ class Cache(object):
                     if search_result in search_results:
                         continue
 
-                    query_result = self._parse_item(search_result, parsed_result)
-                    if query_result is not None:
-                        query_results.append(query_result)
+                    cache_entry = self._parse_item(search_result, parsed_result)
+                    if cache_entry is not None:
+                        cache_entries.append(cache_entry)
                         search_results.append(search_result)
 
                     if search_result in recent_results:
@@ -265,18 +388,28 @@ class Cache(object):
                                   self.provider_id)
                         break
 
-                if query_results:
-                    cache_db_con = self._get_db()
-                    cache_db_con.mass_action(query_results)
+                if cache_entries:
+                    self.save_cache_entries(cache_entries)
 
                 # finished processing, let's save the newest x (index) items
                 # and store up to max_recent_items in cache
                 limit = min(index, self.provider.max_recent_items)
                 self.provider.recent_results = search_results[0:limit]
 
+                self._set_feed_state(dict(self.feed.new_state, shows=shows))
+
         except AuthException as error:
             log.error('Authentication error: {0!r}', error)
 
+    @staticmethod
+    def _parse_entries(entries):
+        """Yield the feed entries with their parsed title, parsing the titles in chunks."""
+        parser = NameParser()
+        for start in range(0, len(entries), PARSE_CHUNK_SIZE):
+            chunk = entries[start:start + PARSE_CHUNK_SIZE]
+            for item, parsed_result in zip(chunk, parser.parse_many([item['title'] for item in chunk])):
+                yield item, parsed_result
+
     def update_cache_manual_search(self, manual_data=None):
         """Update cache using manual search results."""
         # clear cache
@@ -295,20 +428,95 @@ class Cache(object):
                         ' for provider {0}, skipping: {1!r}',
                         self.provider.name, error)
 
-        cache_db_con = self._get_db()
         if results:
             log.debug('Mass updating cache table with manual results'
                       ' for provider: {0}', self.provider.name)
-            return bool(cache_db_con.mass_action(results))
+            return bool(sum(self.save_cache_entries(results)))
 
     def get_rss_feed(self, url, params=None):
         """Get rss feed entries."""
         if self.provider.login():
             # TODO: Check the usage of get_url.
+            # A cache update only needs the feed when it changed since the last update
+            request_hook = self._get_changed_feed if getattr(self.feed, 'state', None) is not None \
+                else self.provider.session.get
             return getFeed(url, params=params,
-                           request_hook=self.provider.session.get)
+                           request_hook=request_hook)
         return {'entries': []}
 
+    def _get_changed_feed(self, url, params=None, **kwargs):
+        """
+        Request a feed with the validators of the last cache update.
+
+        :return: the response, or None when the feed didn't change
+        """
+        state = self.feed.state
+        feed_url = '{0}?{1}'.format(url, urlencode(sorted(viewitems(params)))) if params else url
+        headers = {}
+        if state.get('url') == feed_url:
+            if state.get('etag'):
+                headers['If-None-Match'] = state['etag']
+            if state.get('last_modified'):
+                headers['If-Modified-Since'] = state['last_modified']
+
+        response = self.provider.session.get(url, params=params, headers=headers, **kwargs)
+        if response is None:
+            return response
+
+        if response.status_code == 304:
+            self.feed.unchanged = True
+            return None
+
+        feed_hash = hashlib.sha1(response.content).hexdigest()
+        if state.get('url') == feed_url and state.get('hash') == feed_hash:
+            self.feed.unchanged = True
+            return None
+
+        self.feed.new_state = {
+            'url': feed_url,
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'hash': feed_hash,
+        }
+        return response
+
+    def _hash_entries(self, entries):
+        """Return a hash of the titles and urls of the entries returned by the provider."""
+        feed_hash = hashlib.sha1()
+        for item in entries:
+            title, url = self._get_title_and_url(item)
+            feed_hash.update('{0}\n{1}\n'.format(title, url).encode('utf-8'))
+        return feed_hash.hexdigest()
+
+    @staticmethod
+    def _hash_shows():
+        """Return a hash of the indexer ids, names and aliases of the shows in the show list."""
+        shows_hash = hashlib.sha1()
+        for indexer, series_id, name, aliases in sorted(
+                (series_obj.indexer, series_obj.series_id, series_obj.name,
+                 sorted(alias.title for alias in series_obj.aliases))
+                for series_obj in app.showList):
+            shows_hash.update('{0}\n{1}\n{2}\n{3}\n'.format(indexer, series_id, name, '\n'.join(aliases)).encode('utf-8'))
+        return shows_hash.hexdigest()
+
+    def _get_feed_state(self):
+        """Get the validators and the hash of the feed and of the show list of the last cache update."""
+        cache_db_con = self._get_db()
+        sql_results = cache_db_con.select(
+            'SELECT url, etag, last_modified, hash, shows '
+            'FROM feed_state '
+            'WHERE provider = ?',
+            [self.provider_id]
+        )
+        return dict(sql_results[0]) if sql_results else {}
+
+    def _set_feed_state(self, state):
+        """Save the validators and the hash of the feed and of the show list of the cache update."""
+        if not state:
+            return
+        cache_db_con = self._get_db()
+        cache_db_con.upsert('feed_state', state, {'provider': self.provider_id})
+
     @staticmethod
     def _translate_title(title):
         """Sanitize title."""
@@ -392,7 +600,13 @@ class Cache(object):
         return True
 
     def add_cache_entry(self, search_result, parsed_result=None):
-        """Add item into cache database."""
+        """
+        Create a cache entry for the item.
+
+        The entry isn't written to the database yet, pass it to `save_cache_entries` for that.
+
+        :return: dict with a value for each of the CACHE_COLUMNS, or None if the item can't be cached.
+        """
         if parsed_result is None:
             try:
                 parsed_result = NameParser().parse(search_result.name)
@@ -419,56 +633,103 @@ class Cache(object):
             # get the current timestamp
             cur_timestamp = int(time())
 
-            # get quality of release
-            quality = parsed_result.quality
-
             name = search_result.name
             assert isinstance(name, text_type)
 
-            # get release group
-            release_group = parsed_result.release_group
-
-            # get version
-            version = parsed_result.version
-
-            # Store proper_tags as proper1|proper2|proper3
-            proper_tags = '|'.join(parsed_result.proper_tags)
-
-            identifier = self._get_identifier(search_result)
-            url = search_result.url
-            seeders = search_result.seeders
-            leechers = search_result.leechers
-            size = search_result.size
-            pubdate = search_result.pubdate
-
-            if not self.item_in_cache(identifier):
-                log.debug('Added item: {0} to cache: {1} with url: {2}', name, self.provider_id, url)
-                return [
-                    'INSERT INTO [{name}] '
-                    '   (identifier, name, season, episodes, indexerid, url, time, quality, '
-                    '    release_group, version, seeders, leechers, size, pubdate, '
-                    '    proper_tags, date_added, indexer ) '
-                    'VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)'.format(
-                        name=self.provider_id
-                    ),
-                    [identifier, name, season, episode_text, parsed_result.series.series_id, url,
-                     cur_timestamp, quality, release_group, version,
-                     seeders, leechers, size, pubdate, proper_tags, cur_timestamp, parsed_result.series.indexer]
-                ]
-            else:
-                log.debug('Updating item: {0} to cache: {1}', name, self.provider_id)
-                return [
+            return {
+                'identifier': self._get_identifier(search_result),
+                'name': name,
+                'season': season,
+                'episodes': episode_text,
+                'indexer': parsed_result.series.indexer,
+                'indexerid': parsed_result.series.series_id,
+                'url': search_result.url,
+                'time': cur_timestamp,
+                'quality': parsed_result.quality,
+                'release_group': parsed_result.release_group,
+                'version': parsed_result.version,
+                'seeders': search_result.seeders,
+                'leechers': search_result.leechers,
+                'size': search_result.size,
+                'pubdate': search_result.pubdate,
+                # Store proper_tags as proper1|proper2|proper3
+                'proper_tags': '|'.join(parsed_result.proper_tags),
+                'date_added': cur_timestamp,
+            }
+
+    def save_cache_entries(self, cache_entries):
+        """
+        Write cache entries to the database, in a single transaction.
+
+        New entries are inserted, entries that are already cached are updated,
+        except for the date they were first added.
+
+        :param cache_entries: list of cache entries, as returned by `add_cache_entry`
+        :return: tuple with the number of inserted and updated entries
+        """
+        # When an item is added twice, the last one wins
+        cache_entries = list(OrderedDict(
+            (cache_entry['identifier'], cache_entry)
+            for cache_entry in cache_entries if cache_entry
+        ).values())
+        if not cache_entries:
+            return 0, 0
+
+        cache_db_con = self._get_db()
+        identifiers = [cache_entry['identifier'] for cache_entry in cache_entries]
+        updated = 0
+        for i in range(0, len(identifiers), MAX_VARIABLES):
+            chunk = identifiers[i:i + MAX_VARIABLES]
+            updated += cache_db_con.select(
+                'SELECT COUNT(*) AS count '
+                'FROM [{name}] '
+                'WHERE identifier IN ({params})'.format(name=self.provider_id, params=','.join(['?'] * len(chunk))),
+                chunk
+            )[0]['count']
+
+        update_columns = [column for column in CACHE_COLUMNS if column not in ('identifier', 'date_added')]
+        rows = [[cache_entry[column] for column in CACHE_COLUMNS] for cache_entry in cache_entries]
+        insert_query = (
+            'INSERT {{conflict}}INTO [{name}] ({columns}) '
+            'VALUES ({params})'.format(name=self.provider_id, columns=', '.join(CACHE_COLUMNS),
+                                       params=','.join(['?'] * len(CACHE_COLUMNS)))
+        )
+
+        if sqlite3.sqlite_version_info >= (3, 24, 0):
+            queries = [[
+                insert_query.format(conflict='') + ' '
+                'ON CONFLICT (identifier) DO UPDATE '
+                'SET {values}'.format(values=', '.join('{0}=excluded.{0}'.format(column) for column in update_columns)),
+                rows
+            ]]
+        else:
+            # UPSERT isn't supported, update the existing entries and insert the others
+            queries = [
+                [
                     'UPDATE [{name}] '
-                    'SET name=?, url=?, season=?, episodes=?, indexer=?, indexerid=?, '
-                    '    time=?, quality=?, release_group=?, version=?, '
-                    '    seeders=?, leechers=?, size=?, pubdate=?, proper_tags=? '
-                    'WHERE identifier=?'.format(
-                        name=self.provider_id
-                    ),
-                    [name, url, season, episode_text, parsed_result.series.indexer, parsed_result.series.series_id,
-                     cur_timestamp, quality, release_group, version,
-                     seeders, leechers, size, pubdate, proper_tags, identifier]
-                ]
+                    'SET {values} '
+                    'WHERE identifier=?'.format(name=self.provider_id,
+                                                values=', '.join('{0}=?'.format(column) for column in update_columns)),
+                    [[cache_entry[column] for column in update_columns] + [cache_entry['identifier']]
+                     for cache_entry in cache_entries]
+                ],
+                [insert_query.format(conflict='OR IGNORE '), rows],
+            ]
+
+        queries.append([EPISODE_INDEX_QUERY, [
+            index_row
+            for cache_entry in cache_entries
+            for index_row in episode_index_rows(self.provider_id, cache_entry['identifier'], cache_entry['indexer'],
+                                                cache_entry['indexerid'], cache_entry['season'],
+                                                cache_entry['episodes'])
+        ]])
+        cache_db_con.executemany(queries)
+
+        inserted = len(cache_entries) - updated
+        log.debug('Saved {total} items to cache: {provider}, {inserted} inserted and {updated} updated', {
+            'total': len(cache_entries), 'provider': self.provider_id, 'inserted': inserted, 'updated': updated,
+        })
+        return inserted, updated
 
     def item_in_cache(self, identifier):
         """Check if the url is already available for the specific provider."""
@@ -534,6 +795,19 @@ class Cache(object):
 
         return results
 
+    def _episode_query(self):
+        """Return the query selecting the cache entries for a single episode, using the provider_episodes index."""
+        return (
+            'SELECT * FROM [{name}] '
+            'WHERE identifier IN ('
+            '   SELECT identifier FROM provider_episodes '
+            '   WHERE provider = ? AND '
+            '   indexer = ? AND '
+            '   indexerid = ? AND '
+            '   season = ? AND '
+            '   episode = ?)'.format(name=self.provider_id)
+        )
+
     def find_episodes(self, episodes):
         """
         Search cache for episodes.
@@ -546,47 +820,34 @@ class Cache(object):
 
         :return list of SearchResult objects.
         """
-        cache_results = defaultdict(list)
         results = []
 
-        cache_db_con = self._get_db()
+        # Make sure the provider table exists
+        self._get_db()
+        # The search results only read the cached items by name, compact rows are enough
+        cache_db_con = db.DBConnection('cache.db', row_type='row')
         if not episodes:
-            sql_results = cache_db_con.select(
-                'SELECT * FROM [{name}]'.format(name=self.provider_id))
+            with closing(cache_db_con.select_iter('SELECT * FROM [{name}]'.format(name=self.provider_id))) as sql_results:
+                return self._get_search_results(sql_results)
         elif not isinstance(episodes, list):
             sql_results = cache_db_con.select(
-                'SELECT * FROM [{name}] '
-                'WHERE indexer = ? AND '
-                'indexerid = ? AND '
-                'season = ? AND '
-                'episodes LIKE ?'.format(name=self.provider_id),
-                [episodes.series.indexer, episodes.series.series_id, episodes.season,
-                 '%|{0}|%'.format(episodes.episode)]
+                self._episode_query(),
+                [self.provider_id, episodes.series.indexer, episodes.series.series_id,
+                 episodes.season, episodes.episode]
             )
         else:
             for ep_obj in episodes:
                 results.append([
-                    'SELECT * FROM [{name}] '
-                    'WHERE indexer = ? AND '
-                    'indexerid = ? AND '
-                    'season = ? AND '
-                    'episodes LIKE ?'.format(
-                        name=self.provider_id
-                    ),
-                    [ep_obj.series.indexer, ep_obj.series.series_id, ep_obj.season,
-                     '%|{0}|%'.format(ep_obj.episode)]]
-                )
+                    self._episode_query(),
+                    [self.provider_id, ep_obj.series.indexer, ep_obj.series.series_id,
+                     ep_obj.season, ep_obj.episode]
+                ])
 
             if len(episodes) > 1:
                 results.append([
-                    'SELECT * FROM [{name}] '
-                    'WHERE indexer = ? AND '
-                    'indexerid = ? AND '
-                    'season = ? AND '
-                    'episodes == "||"'.format(
-                        name=self.provider_id
-                    ),
-                    [ep_obj.series.indexer, ep_obj.series.series_id, ep_obj.season]
+                    self._episode_query(),
+                    [self.provider_id, ep_obj.series.indexer, ep_obj.series.series_id, ep_obj.season,
+                     SEASON_PACK_EPISODE]
                 ])
 
             if results:
@@ -604,6 +865,12 @@ class Cache(object):
                     }
                 )
 
+        return self._get_search_results(sql_results)
+
+    def _get_search_results(self, sql_results):
+        """Return the search results of the cache entries, by episode number."""
+        cache_results = defaultdict(list)
+
         # for each cache entry
         for cur_result in sql_results:
             if cur_result['indexer'] is None:
@@ -79,6 +79,7 @@ from medusa.scene_numbering import (
     get_scene_absolute_numbering,
     get_scene_numbering,
 )
+from medusa.show.disk_usage import disk_usage
 from medusa.tv.base import Identifier, TV
 
 from six import itervalues, viewitems
@@ -380,9 +381,11 @@ class Episode(TV):
 
         if value and self.is_location_valid(new_location):
             self.file_size = os.path.getsize(new_location)
+            disk_usage.update_episode(self.series, self.season, self.episode, self.file_size, new_location)
         else:
             self._location = ''
             self.file_size = 0
+            disk_usage.update_episode(self.series, self.season, self.episode, 0)
             return
 
         if new_location == old_location:
@@ -1229,6 +1232,7 @@ class Episode(TV):
             ' AND episode = ?',
             [self.series.series_id, self.season, self.episode]
         )
+        disk_usage.update_episode(self.series, self.season, self.episode, 0)
         raise EpisodeDeletedException()
 
     def get_sql(self):
@@ -14,11 +14,11 @@ import shutil
 import stat
 import traceback
 import warnings
-from builtins import map
 from builtins import str
 from collections import (
     OrderedDict, namedtuple
 )
+from contextlib import closing
 from itertools import chain, groupby
 
 from medusa import (
@@ -88,6 +88,7 @@ from medusa.media.fan_art import ShowFanArt
 from medusa.media.network_logo import ShowNetworkLogo
 from medusa.media.poster import ShowPoster
 from medusa.name_cache import build_name_cache
+from medusa.name_parser.guessit_parser import expected_titles
 from medusa.name_parser.parser import (
     InvalidNameException,
     InvalidShowException,
@@ -101,6 +102,7 @@ from medusa.scene_numbering import (
     numbering_tuple_to_dict, xem_refresh
 )
 from medusa.search import FORCED_SEARCH
+from medusa.show.disk_usage import disk_usage
 from medusa.show.show import Show
 from medusa.subtitles import (
     code_from_code,
@@ -126,6 +128,55 @@ log = CustomBraceAdapter(logging.getLogger(__name__))
 log.logger.addHandler(logging.NullHandler())
 
 
+def _airdate_ordinal(firstaired):
+    """Return the air date of an episode from the indexer as stored, or None when it's malformed."""
+    if not firstaired or firstaired == '0000-00-00':
+        return datetime.date.fromordinal(1).toordinal()
+    try:
+        return datetime.date(*[int(x) for x in firstaired.split('-')][:3]).toordinal()
+    except (ValueError, TypeError):
+        return None
+
+
+def _is_synced(stored_episode, indexed_episode, scene_numbering, episode_obj=None):
+    """
+    Check if a stored episode is up to date with the episode from the indexer and the scene numbering.
+
+    An episode that can change its status on an update (while it's about to air, or when its file
+    isn't processed yet or isn't a media file) is never up to date, it always goes through
+    Episode.load_from_indexer.
+
+    :param stored_episode: the row of the episode in tv_episodes
+    :param indexed_episode: the episode from the indexer
+    :param scene_numbering: the scene season, episode and absolute number Episode.load_from_indexer gives the episode
+    :type scene_numbering: tuple
+    :param episode_obj: the episode when it's loaded, with the scene numbering of its last load
+    :type episode_obj: Episode
+    :rtype: bool
+    """
+    if stored_episode['location']:
+        if stored_episode['status'] not in (SNATCHED, SNATCHED_PROPER, SNATCHED_BEST, DOWNLOADED, ARCHIVED):
+            return False
+        if not helpers.is_media_file(stored_episode['location']):
+            return False
+    elif stored_episode['status'] in (UNSET, UNAIRED, WANTED):
+        return False
+
+    indexerid = getattr(indexed_episode, 'id', None)
+    absolute_number = getattr(indexed_episode, 'absolute_number', None)
+    airdate = _airdate_ordinal(getattr(indexed_episode, 'firstaired', None))
+    return (
+        indexerid is not None and airdate is not None
+        and stored_episode['indexerid'] == try_int(indexerid, None)
+        and (stored_episode['name'] or '') == (getattr(indexed_episode, 'episodename', None) or '')
+        and (stored_episode['description'] or '') == (getattr(indexed_episode, 'overview', None) or '')
+        and stored_episode['airdate'] == airdate
+        and (absolute_number is None or stored_episode['absolute_number'] == try_int(absolute_number, None))
+        and (episode_obj is None or (episode_obj.scene_season, episode_obj.scene_episode,
+                                     episode_obj.scene_absolute_number) == scene_numbering)
+    )
+
+
 class SaveSeriesException(Exception):
     """Generic exception used for adding a new series."""
 
@@ -266,6 +317,14 @@ class Series(TV):
 
         self._load_from_db()
 
+    def __setattr__(self, key, value):
+        """Keep the index of app.showList and the expected titles up to date, when the series changes."""
+        super(Series, self).__setattr__(key, value)
+        if key in ('indexer', 'indexerid'):
+            app.showList.reindex(self)
+        elif key in ('name', '_aliases'):
+            expected_titles.invalidate(self)
+
     @classmethod
     def find_series(cls, predicate=None):
         """Find series based on given predicate."""
@@ -282,7 +341,7 @@ class Series(TV):
         :return:
         :rtype:
         """
-        result = Show.find_by_id(app.showList, identifier.indexer.id, identifier.id)
+        result = app.showList.find_by_id(identifier.indexer.id, identifier.id)
         if result and (not predicate or predicate(result)):
             return result
 
@@ -504,7 +563,7 @@ class Series(TV):
     @property
     def size(self):
         """Size of the show on disk."""
-        return helpers.get_size(self.location)
+        return disk_usage.get_size(self)
 
     def show_size(self, pretty=False):
         """
@@ -809,6 +868,33 @@ class Series(TV):
         :return:
         :rtype: list of Episode
         """
+        sql_selection, sql_args = self.get_episodes_query(season=season, has_location=has_location)
+
+        # need ORDER episode ASC to rename multi-episodes in order S01E01-02
+        sql_selection += ' ORDER BY season ASC, episode ASC'
+
+        main_db_con = db.DBConnection(row_type='row')
+        ep_list = []
+        with closing(main_db_con.select_iter(sql_selection, sql_args)) as results:
+            for cur_result in results:
+                cur_ep = self.get_episode_from_result(cur_result)
+                if cur_ep:
+                    ep_list.append(cur_ep)
+
+        return ep_list
+
+    def get_episodes_query(self, season=None, has_location=False):
+        """Return the query that selects the episodes for this show given the specified filter.
+
+        It selects the season, the episode and share_location, the number of other episodes with the same location.
+
+        :param season:
+        :type season: int or list of int
+        :param has_location:
+        :type has_location: bool
+        :return: the query, without ORDER BY, and its arguments
+        :rtype: tuple(str, list)
+        """
         # subselection to detect multi-episodes early, share_location > 0
         # If a multi-episode release has been downloaded. For example my.show.S01E1E2.1080p.WEBDL.mkv, you'll find the same location
         # in the database for those episodes (S01E01 and S01E02). The query is to mark that the location for each episode is shared with another episode.
@@ -828,48 +914,49 @@ class Series(TV):
 
         if season is not None:
             season = helpers.ensure_list(season)
-            sql_selection += ' AND season IN (?)'
-            sql_args.append(','.join(map(text_type, season)))
+            sql_selection += ' AND season IN ({0})'.format(', '.join('?' * len(season)))
+            sql_args += season
 
         if has_location:
             sql_selection += " AND location != ''"
 
-        # need ORDER episode ASC to rename multi-episodes in order S01E01-02
-        sql_selection += ' ORDER BY season ASC, episode ASC'
-
-        main_db_con = db.DBConnection()
-        results = main_db_con.select(sql_selection, sql_args)
+        return sql_selection, sql_args
 
-        ep_list = []
-        for cur_result in results:
-            cur_ep = self.get_episode(cur_result['season'], cur_result['episode'])
-            if not cur_ep:
-                continue
+    def get_episode_from_result(self, result):
+        """Return the episode of a get_episodes_query result, with its related episodes.
 
-            cur_ep.related_episodes = []
-            if cur_ep.location:
-                # if there is a location, check if it's a multi-episode (share_location > 0)
-                # and put them in related_episodes
-                if cur_result['share_location'] > 0:
-                    related_eps_result = main_db_con.select(
-                        'SELECT '
-                        '  season, episode '
-                        'FROM '
-                        '  tv_episodes '
-                        'WHERE '
-                        '  showid = ? '
-                        '  AND season = ? '
-                        '  AND location = ? '
-                        '  AND episode != ? '
-                        'ORDER BY episode ASC',
-                        [self.series_id, cur_ep.season, cur_ep.location, cur_ep.episode])
-                    for cur_related_ep in related_eps_result:
-                        related_ep = self.get_episode(cur_related_ep['season'], cur_related_ep['episode'])
-                        if related_ep and related_ep not in cur_ep.related_episodes:
-                            cur_ep.related_episodes.append(related_ep)
-            ep_list.append(cur_ep)
+        :param result: the row with the season, the episode and share_location
+        :return:
+        :rtype: Episode
+        """
+        cur_ep = self.get_episode(result['season'], result['episode'])
+        if not cur_ep:
+            return
 
-        return ep_list
+        cur_ep.related_episodes = []
+        if cur_ep.location:
+            # if there is a location, check if it's a multi-episode (share_location > 0)
+            # and put them in related_episodes
+            if result['share_location'] > 0:
+                main_db_con = db.DBConnection(row_type='row')
+                related_eps_result = main_db_con.select(
+                    'SELECT '
+                    '  season, episode '
+                    'FROM '
+                    '  tv_episodes '
+                    'WHERE '
+                    '  showid = ? '
+                    '  AND season = ? '
+                    '  AND location = ? '
+                    '  AND episode != ? '
+                    'ORDER BY episode ASC',
+                    [self.series_id, cur_ep.season, cur_ep.location, cur_ep.episode])
+                for cur_related_ep in related_eps_result:
+                    related_ep = self.get_episode(cur_related_ep['season'], cur_related_ep['episode'])
+                    if related_ep and related_ep not in cur_ep.related_episodes:
+                        cur_ep.related_episodes.append(related_ep)
+
+        return cur_ep
 
     def get_episode(self, season=None, episode=None, filepath=None, no_create=False, absolute_number=None,
                     air_date=None, should_cache=True):
@@ -1154,7 +1241,7 @@ class Series(TV):
         scanned_eps = {}
 
         try:
-            main_db_con = db.DBConnection()
+            main_db_con = db.DBConnection(row_type='row')
             sql = ('SELECT '
                    '  season, episode, showid, show_name, tv_shows.show_id, tv_shows.indexer '
                    'FROM '
@@ -1293,6 +1380,12 @@ class Series(TV):
         )
 
         scanned_eps = {}
+        # The xem numbering is refreshed before the stored episodes are read, as it updates them
+        xem_refresh(self)
+        stored_episodes = self._load_stored_episodes()
+        scene_numbering = self._get_scene_numbering(stored_episodes)
+        unchanged = 0
+        created = 0
 
         sql_l = []
         for season in indexed_show:
@@ -1305,6 +1398,16 @@ class Series(TV):
                 # need some examples of wtf episode 0 means to decide if we want it or not
                 if episode == 0:
                     continue
+
+                stored_episode = stored_episodes.get((season, episode))
+                # A loaded episode keeps its scene numbering until it's loaded again
+                episode_obj = self.episodes.get(season, {}).get(episode)
+                if stored_episode and _is_synced(stored_episode, indexed_show[season][episode],
+                                                 scene_numbering[(season, episode)], episode_obj):
+                    unchanged += 1
+                    scanned_eps[season][episode] = True
+                    continue
+
                 try:
                     ep = self.get_episode(season, episode)
                     if not ep:
@@ -1327,7 +1430,12 @@ class Series(TV):
                         continue
 
                 with ep.lock:
-                    sql_l.append(ep.get_sql())
+                    sql = ep.get_sql()
+                if sql:
+                    sql_l.append(sql)
+                    created += not stored_episode
+                else:
+                    unchanged += 1
 
                 scanned_eps[season][episode] = True
 
@@ -1335,6 +1443,17 @@ class Series(TV):
             main_db_con = db.DBConnection()
             main_db_con.mass_action(sql_l)
 
+        log.info(
+            u'{id}: Synced the episodes from {indexer}: {created} created,'
+            u' {updated} updated, {unchanged} unchanged', {
+                'id': self.series_id,
+                'indexer': indexerApi(self.indexer).name,
+                'created': created,
+                'updated': len(sql_l) - created,
+                'unchanged': unchanged,
+            }
+        )
+
         # Done updating save last update date
         self.last_update_indexer = datetime.date.today().toordinal()
         log.debug(u'{id}: Saving indexer changes to database',
@@ -1343,6 +1462,58 @@ class Series(TV):
 
         return scanned_eps
 
+    def _load_stored_episodes(self):
+        """Load the stored fields of the episodes that are synced from the indexer, by (season, episode)."""
+        main_db_con = db.DBConnection()
+        sql_results = main_db_con.select(
+            'SELECT season, episode, indexerid, name, description, airdate, absolute_number, '
+            'scene_season, scene_episode, scene_absolute_number, status, location '
+            'FROM tv_episodes '
+            'WHERE indexer = ? AND showid = ?',
+            [self.indexer, self.series_id])
+        return {(row['season'], row['episode']): row for row in sql_results}
+
+    def _get_scene_numbering(self, stored_episodes):
+        """
+        Get the scene numbering Episode.load_from_indexer gives the stored episodes, by (season, episode).
+
+        It's what get_scene_numbering and get_scene_absolute_numbering return for every episode,
+        from the stored episodes and a single query of the custom absolute numbering, as the
+        scene_season, scene_episode and scene_absolute_number properties of the episode return it.
+
+        :param stored_episodes: the rows of _load_stored_episodes
+        :return: the scene season, episode and absolute number of every stored episode
+        :rtype: dict
+        """
+        main_db_con = db.DBConnection()
+        custom_absolute = {}
+        for row in main_db_con.select(
+                'SELECT absolute_number, scene_absolute_number '
+                'FROM scene_numbering '
+                'WHERE indexer = ? AND indexer_id = ? AND scene_absolute_number != 0',
+                [self.indexer, self.series_id]):
+            custom_absolute.setdefault(row['absolute_number'], int(row['scene_absolute_number']))
+
+        by_scene_numbering = {}
+        xem_absolute = {}
+        for (season, episode), row in viewitems(stored_episodes):
+            by_scene_numbering.setdefault((row['scene_season'], row['scene_episode']), (season, episode))
+            if row['scene_absolute_number']:
+                xem_absolute.setdefault(row['absolute_number'], int(row['scene_absolute_number']))
+
+        # Without a scene numbering, the episode falls back to its own numbering, like the Episode properties
+        scene_numbering = {}
+        for (season, episode), row in viewitems(stored_episodes):
+            scene_season, scene_episode = by_scene_numbering.get((season, episode), (None, None))
+            absolute_number = row['absolute_number']
+            scene_absolute_number = custom_absolute.get(absolute_number) or xem_absolute.get(absolute_number)
+            scene_numbering[(season, episode)] = (
+                season if scene_season is None else scene_season,
+                scene_episode or episode,
+                scene_absolute_number or absolute_number,
+            )
+        return scene_numbering
+
     def _save_externals_to_db(self):
         """Save the indexers external id's to the db."""
         sql_l = []
@@ -1864,7 +2035,11 @@ class Series(TV):
         action = ('delete', 'trash')[app.TRASH_REMOVE_SHOW]
 
         # remove self from show list
-        app.showList = [x for x in app.showList if x.identifier != self.identifier]
+        series_obj = app.showList.find_by_id(self.indexer, self.series_id)
+        while series_obj is not None:
+            app.showList.remove(series_obj)
+            series_obj = app.showList.find_by_id(self.indexer, self.series_id)
+        disk_usage.remove(self)
 
         # clear the cache
         image_cache_dir = os.path.join(app.CACHE_DIR, 'images')
@@ -178,7 +178,7 @@ class QueueProgressIndicator(object):
         return len([x for x in self.queueItemList if x.isInQueue()])
 
     def nextName(self):
-        for curItem in [app.show_queue_scheduler.action.current_item] + app.show_queue_scheduler.action.queue:  # @UndefinedVariable
+        for curItem in app.show_queue_scheduler.action.running_items + sorted(app.show_queue_scheduler.action.queue):
             if curItem in self.queueItemList:
                 return curItem.name
 
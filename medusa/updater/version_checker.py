@@ -127,6 +127,7 @@ class CheckVersion(object):
             for filename in files:
                 source.append(os.path.join(path, filename))
 
+        db.checkpoint()
         return helpers.backup_config_zip(source, target, app.DATA_DIR)
 
     def safe_to_update(self):
@@ -11,6 +11,8 @@ from medusa import app, classes, common, db, helpers, logger, metadata
 from medusa.indexers.config import INDEXER_TVDBV2
 from medusa.common import cpu_presets
 from medusa.helpers.utils import int_default
+from medusa.name_parser.guessit_parser import GuessItCache
+from medusa.name_parser.parser import NameParserCache
 from medusa.sbdatetime import date_presets, time_presets
 from medusa.schedulers.utils import all_schedulers
 from tests.apiv2.conftest import TEST_API_KEY
@@ -83,6 +85,8 @@ def config_main(monkeypatch, app_config):
 
     section_data['indexerDefaultLanguage'] = app.INDEXER_DEFAULT_LANGUAGE
     section_data['showUpdateHour'] = int_default(app.SHOWUPDATE_HOUR, app.DEFAULT_SHOWUPDATE_HOUR)
+    section_data['showUpdateWorkers'] = int(app.SHOW_UPDATE_WORKERS)
+    section_data['schedulerWorkers'] = int(app.SCHEDULER_WORKERS)
     section_data['indexerTimeout'] = int_default(app.INDEXER_TIMEOUT, 20)
     section_data['indexerDefault'] = app.INDEXER_DEFAULT
 
@@ -306,6 +310,8 @@ def config_system(monkeypatch):
     def memory_usage_mock(*args, **kwargs):
         return '124.86 MB'
     monkeypatch.setattr(helpers, 'memory_usage', memory_usage_mock)
+    monkeypatch.setattr('medusa.server.api.v2.config.name_parser_cache', NameParserCache())
+    monkeypatch.setattr('medusa.server.api.v2.config.guessit_cache', GuessItCache())
 
     section_data = {}
     section_data['memoryUsage'] = memory_usage_mock()
@@ -320,6 +326,10 @@ def config_system(monkeypatch):
             'type': 'TV Download Directory'
         }
     }
+    section_data['parseCache'] = {
+        'nameParser': {'size': 0, 'maxSize': 1000, 'hits': 0, 'misses': 0, 'evictions': 0},
+        'guessit': {'size': 0, 'maxSize': 25000, 'hits': 0, 'misses': 0, 'evictions': 0},
+    }
     section_data['branch'] = app.BRANCH
     section_data['commitHash'] = app.CUR_COMMIT_HASH
     section_data['release'] = app.APP_VERSION
@@ -407,6 +417,7 @@ def config_postprocessing():
     section_data['processMethod'] = app.PROCESS_METHOD
     section_data['reflinkAvailable'] = bool(pkgutil.find_loader('reflink'))
     section_data['autoPostprocessorFrequency'] = int(app.AUTOPOSTPROCESSOR_FREQUENCY)
+    section_data['postprocessWorkers'] = int(app.POSTPROCESS_WORKERS)
     section_data['syncFiles'] = app.SYNC_FILES
     section_data['fileTimestampTimezone'] = app.FILE_TIMESTAMP_TIMEZONE
     section_data['allowedExtensions'] = app.ALLOWED_EXTENSIONS
@@ -738,6 +749,14 @@ def config_search():
 
     section_data['general'] = {}
     section_data['general']['randomizeProviders'] = bool(app.RANDOMIZE_PROVIDERS)
+    section_data['general']['providerSearchWorkers'] = int_default(app.PROVIDER_SEARCH_WORKERS, 1)
+    section_data['general']['providerSearchTimeout'] = int_default(app.PROVIDER_SEARCH_TIMEOUT, 300)
+    section_data['general']['providerSearchMaxPerHost'] = int_default(app.PROVIDER_SEARCH_MAX_PER_HOST, 1)
+    section_data['general']['nameParserWorkers'] = int_default(app.NAME_PARSER_WORKERS, 1)
+    section_data['general']['persistentParseCache'] = bool(app.PARSE_CACHE_PERSISTENT)
+    section_data['general']['parseCacheSize'] = int_default(app.PARSE_CACHE_SIZE, 100)
+    section_data['general']['nameParserCacheSize'] = int_default(app.NAME_PARSER_CACHE_SIZE, 1000)
+    section_data['general']['guessitCacheSize'] = int_default(app.GUESSIT_CACHE_SIZE, 25000)
     section_data['general']['downloadPropers'] = bool(app.DOWNLOAD_PROPERS)
     section_data['general']['checkPropersInterval'] = app.CHECK_PROPERS_INTERVAL
     section_data['general']['propersSearchDays'] = int(app.PROPERS_SEARCH_DAYS)
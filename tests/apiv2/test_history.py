@@ -0,0 +1,90 @@
+# coding=utf-8
+"""Test /history route."""
+from __future__ import unicode_literals
+
+import json
+
+from medusa import db
+from medusa.common import DOWNLOADED, SNATCHED
+
+import pytest
+
+
+@pytest.fixture
+def history(monkeypatch, tmpdir):
+    path = str(tmpdir.join('main.db'))
+
+    class HistoryDBConnection(db.DBConnection):
+        def __init__(self, filename=None, suffix=None, row_type=None):
+            super(HistoryDBConnection, self).__init__(path, None, row_type)
+
+    monkeypatch.setattr('medusa.db.DBConnection', HistoryDBConnection)
+
+    main_db_con = db.DBConnection()
+    main_db_con.action('CREATE TABLE history (action NUMERIC, date NUMERIC, showid NUMERIC, quality NUMERIC, '
+                       'resource TEXT, provider TEXT, version NUMERIC DEFAULT -1, proper_tags TEXT, '
+                       'manually_searched NUMERIC, info_hash TEXT, size NUMERIC, indexer_id NUMERIC, '
+                       'season NUMERIC, episode NUMERIC, provider_type TEXT, client_status INTEGER, '
+                       'part_of_batch INTEGER)')
+    main_db_con.mass_action([
+        ['INSERT INTO history (action, date, showid, indexer_id, quality, resource, provider, size, season, episode) '
+         'VALUES (?, ?, ?, 1, 8, ?, ?, ?, 1, ?)',
+         [SNATCHED if number % 2 else DOWNLOADED, 20200101000000 + number, 1 + number % 2,
+          'Show.S01E{0:02d}.mkv'.format(number), 'Provider', number * 100, number]]
+        for number in range(1, 6)
+    ])
+
+    yield
+    db.db_cons.pop(path).close()
+    readers = db.db_readers.pop(path)
+    if readers:
+        readers.close()
+
+
+@pytest.mark.gen_test
+async def test_history_get(http_client, create_url, auth_headers, history):
+    # given
+    url = create_url('/history', limit=2, page=2)
+
+    # when
+    response = await http_client.fetch(url, **auth_headers)
+    actual = json.loads(response.body)
+
+    # then
+    assert response.code == 200
+    assert [item['episode'] for item in actual] == [3, 2]
+    assert actual[0]['series'] == 'tvdb2'
+    assert actual[0]['resource'] == 'Show.S01E03.mkv'
+    assert actual[0]['provider'] == {'id': 'provider', 'name': 'Provider'}
+    assert actual[1]['releaseGroup'] == 'Provider'
+    assert '2' == response.headers['X-Pagination-Page']
+    assert '2' == response.headers['X-Pagination-Limit']
+    assert '5' == response.headers['X-Pagination-Count']
+    assert '3' == response.headers['X-Pagination-Total']
+
+
+@pytest.mark.gen_test
+async def test_history_get_series(http_client, create_url, auth_headers, history):
+    # given
+    url = create_url('/history/tvdb1', sort='size')
+
+    # when
+    response = await http_client.fetch(url, **auth_headers)
+    actual = json.loads(response.body)
+
+    # then
+    assert response.code == 200
+    assert [item['size'] for item in actual] == [200, 400]
+    assert '2' == response.headers['X-Pagination-Count']
+
+
+@pytest.mark.gen_test
+async def test_history_get_invalid_sort(http_client, create_url, auth_headers, history):
+    # given
+    url = create_url('/history', sort='resource')
+
+    # when
+    response = await http_client.fetch(url, raise_error=False, **auth_headers)
+
+    # then
+    assert response.code == 400
@@ -79,3 +79,29 @@ async def test_log_post(monkeypatch, http_client, create_url, auth_headers, logg
     assert 'Some nice message' == actual[0].message
     assert 'ERROR' == actual[0].level_name
     assert 'VUE' == actual[0].extra
+
+
+@pytest.mark.gen_test
+async def test_log_get_store(monkeypatch, http_client, create_url, auth_headers, log_store_handler):
+    # given
+    monkeypatch.setattr(log.instance, 'file_handler', log_store_handler)
+    log_store_handler.store.append('2016-08-06 15:58:34 ERROR    DAILYSEARCHER :: [d4ea5af] Some error message')
+    log_store_handler.store.append('2016-08-06 15:58:35 INFO     SHOWQUEUE-UPDATE-12 :: [d4ea5af] Some info message 1')
+    log_store_handler.store.append('2016-08-06 15:58:36 INFO     SHOWQUEUE-REFRESH-12 :: [d4ea5af] Some info message 2')
+    log_store_handler.store.append('2016-08-06 15:58:37 DEBUG    SHOWQUEUE-UPDATE-12 :: [d4ea5af] Some debug message')
+    log_store_handler.flush()
+    url = create_url('/log', thread='showqueue', limit=1, page=2)
+
+    # when
+    response = await http_client.fetch(url, **auth_headers)
+    actual = json.loads(response.body)
+
+    # then
+    assert response.code == 200
+    assert len(actual) == 1
+    assert 'd4ea5af' == actual[0]['commit']
+    assert 'INFO' == actual[0]['level']
+    assert 'SHOWQUEUE-UPDATE' == actual[0]['thread']
+    assert 12 == actual[0]['threadId']
+    assert 'Some info message 1' == actual[0]['message']
+    assert '2' == response.headers['X-Pagination-Page']
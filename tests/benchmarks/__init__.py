@@ -0,0 +1,5 @@
+# coding=utf-8
+"""Benchmark scripts, run them as modules from the repository root: python -m tests.benchmarks.bench_<name>."""
+from __future__ import unicode_literals
+
+import medusa.tv  # noqa: F401 Needs to be imported first, to prevent a circular import
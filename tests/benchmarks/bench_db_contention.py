@@ -0,0 +1,100 @@
+# coding=utf-8
+"""Benchmark reads from several threads while a thread writes, on the shared writer connection vs WAL with readers."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+
+from medusa import app, db
+
+
+class LegacyDBConnection(db.DBConnection):
+    """The database connection as it was before WAL: selects wait for the writer connection and commit."""
+
+    def _configure_journal(self):
+        return None
+
+    def select(self, query, args=None):
+        return self.action(query, args, fetchall=True) or []
+
+    def selectOne(self, query, args=None):  # noqa: N802 Overrides DBConnection.selectOne
+        return self.action(query, args, fetchone=True) or []
+
+
+def create_db(connection_class, filename, shows, episodes):
+    con = connection_class(filename)
+    con.action('CREATE TABLE tv_episodes (episode_id INTEGER PRIMARY KEY, showid NUMERIC, season NUMERIC, '
+               'episode NUMERIC, name TEXT, status NUMERIC, location TEXT)')
+    con.action('CREATE INDEX idx_showid ON tv_episodes (showid)')
+    con.mass_action([
+        ['INSERT INTO tv_episodes (showid, season, episode, name, status, location) VALUES (?, 1, ?, ?, 1, ?)',
+         [show, episode, 'Episode {0}'.format(episode), '/tv/Show {0}/Episode {1}.mkv'.format(show, episode)]]
+        for show in range(shows) for episode in range(episodes)
+    ])
+    return con
+
+
+def run(connection_class, filename, readers, reads, writes, shows, episodes):
+    create_db(connection_class, filename, shows, episodes)
+    latencies = []
+
+    def read():
+        con = connection_class(filename)
+        for _ in range(reads):
+            start = time.time()
+            con.select('SELECT * FROM tv_episodes WHERE showid = ?', [random.randrange(shows)])
+            latencies.append(time.time() - start)
+
+    def write():
+        con = connection_class(filename)
+        for _ in range(writes):
+            # Like a show refresh, a transaction that updates all the episodes of a few shows
+            con.mass_action([['UPDATE tv_episodes SET status = ? WHERE showid = ? AND episode = ?',
+                              [random.randrange(10), show, episode]]
+                             for show in random.sample(range(shows), 10) for episode in range(episodes)])
+
+    threads = [threading.Thread(target=read) for _ in range(readers)] + [threading.Thread(target=write)]
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.time() - start
+
+    db.db_cons.pop(filename).close()
+    readers_pool = db.db_readers.pop(filename)
+    if readers_pool:
+        readers_pool.close()
+
+    latencies.sort()
+    return total, sum(latencies) / len(latencies), latencies[int(len(latencies) * 0.99)]
+
+
+def main(argv):
+    readers = int(argv[1]) if len(argv) > 1 else 4
+    reads = int(argv[2]) if len(argv) > 2 else 200
+    writes = int(argv[3]) if len(argv) > 3 else 20
+    shows = int(argv[4]) if len(argv) > 4 else 200
+    episodes = int(argv[5]) if len(argv) > 5 else 100
+
+    random.seed(42)
+    app.DATA_DIR = tempfile.mkdtemp()
+    try:
+        print('{0} reader threads with {1} selects each, 1 writer thread with {2} transactions, {3} episodes'.format(
+            readers, reads, writes, shows * episodes))
+        print('{0:>8} {1:>10} {2:>16} {3:>16}'.format('', 'total (s)', 'avg select (ms)', 'p99 select (ms)'))
+        for label, connection_class, filename in (('shared', LegacyDBConnection, 'legacy.db'),
+                                                  ('WAL', db.DBConnection, 'wal.db')):
+            total, average, p99 = run(connection_class, filename, readers, reads, writes, shows, episodes)
+            print('{0:>8} {1:>10.3f} {2:>16.3f} {3:>16.3f}'.format(label, total, average * 1000, p99 * 1000))
+    finally:
+        shutil.rmtree(app.DATA_DIR)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
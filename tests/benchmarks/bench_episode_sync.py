@@ -0,0 +1,106 @@
+# coding=utf-8
+"""Benchmark syncing the episodes of a 1000 episode show from the indexer, loading every episode vs the delta sync."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from medusa import app, db, scene_numbering
+from medusa.databases import main_db
+from medusa.tv.series import Series
+
+
+class IndexedEpisode(dict):
+    def __getattr__(self, item):
+        """Get the fields as attributes, like the episodes of the indexer api."""
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item)
+
+
+def create_indexed_show(seasons, episodes):
+    return {1: {
+        season: {
+            episode: IndexedEpisode({
+                'id': season * 1000 + episode,
+                'episodename': 'Episode {0}x{1}'.format(season, episode),
+                'overview': 'The story of episode {0} of season {1}.'.format(episode, season),
+                'firstaired': '{0}-{1:02d}-{2:02d}'.format(1980 + season, 1 + episode % 12, 1 + episode),
+                'absolute_number': (season - 1) * episodes + episode,
+            })
+            for episode in range(1, episodes + 1)
+        }
+        for season in range(1, seasons + 1)
+    }}
+
+
+def legacy_load_episodes(series, tvapi):
+    """Series.load_episodes_from_indexer as it was before the delta sync."""
+    series.indexer_api = tvapi
+    indexed_show = series.indexer_api[series.series_id]
+    sql_l = []
+    for season in indexed_show:
+        for episode in indexed_show[season]:
+            ep = series.get_episode(season, episode)
+            ep.load_from_indexer(tvapi=series.indexer_api)
+            with ep.lock:
+                sql_l.append(ep.get_sql())
+    if sql_l:
+        db.DBConnection().mass_action(sql_l)
+    return len([sql for sql in sql_l if sql])
+
+
+def timed(function, *args):
+    start = time.time()
+    function(*args)
+    return time.time() - start
+
+
+def main(argv):
+    seasons = int(argv[1]) if len(argv) > 1 else 40
+    episodes = int(argv[2]) if len(argv) > 2 else 25
+    changed = int(argv[3]) if len(argv) > 3 else 10
+
+    # The benchmark runs offline
+    scene_numbering.xem_refresh = lambda *args, **kwargs: None
+
+    data_dir = tempfile.mkdtemp()
+    app.DATA_DIR = data_dir
+    app.APPLICATION_DB = 'bench.db'
+    try:
+        con = db.DBConnection()
+        db.upgradeDatabase(con, main_db.InitialSchema)
+        con.action('INSERT INTO tv_shows (indexer, indexer_id, show_name, location, status, lang, default_ep_status,'
+                   " rls_ignore_words, rls_require_words) VALUES (1, 1, 'Bench Show', ?, 'Ended', 'en', 5, '', '')",
+                   [os.path.join(data_dir, 'Bench Show')])
+        series = Series(1, 1, quality=1)
+        tvapi = create_indexed_show(seasons, episodes)
+
+        first_time = timed(series.load_episodes_from_indexer, None, tvapi)
+        legacy_time = timed(legacy_load_episodes, series, tvapi)
+        delta_time = timed(series.load_episodes_from_indexer, None, tvapi)
+
+        for episode in range(1, changed + 1):
+            tvapi[1][1 + episode % seasons][episode]['overview'] = 'A new description.'
+        changed_time = timed(series.load_episodes_from_indexer, None, tvapi)
+        assert con.select("SELECT COUNT(*) AS count FROM tv_episodes WHERE description = 'A new description.'")[0][
+            'count'] == changed
+
+        print('{0} episodes, {1} changed on the indexer'.format(seasons * episodes, changed))
+        print('{0:>24} {1:>10}'.format('', 'time (s)'))
+        print('{0:>24} {1:>10.3f}'.format('first sync', first_time))
+        print('{0:>24} {1:>10.3f}'.format('unchanged, every episode', legacy_time))
+        print('{0:>24} {1:>10.3f}'.format('unchanged, delta', delta_time))
+        print('{0:>24} {1:>10.3f}'.format('{0} changed, delta'.format(changed), changed_time))
+    finally:
+        db.db_cons.pop('bench.db').close()
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
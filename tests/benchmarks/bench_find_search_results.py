@@ -0,0 +1,76 @@
+# coding=utf-8
+"""Benchmark collecting 5000 provider items into unique search results, a list lookup vs keyed on the identifier."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import operator
+import random
+import sys
+import time
+
+from medusa.common import Quality
+from medusa.name_parser.parser import InvalidShowException, NameParser
+from medusa.providers.generic_provider import GenericProvider
+
+from tests.benchmarks.stubs import StubSeries
+
+QUALITIES = ['480p.HDTV.x264', '720p.HDTV.x264', '720p.WEB-DL.DD5.1.H.264', '1080p.WEB-DL.DD5.1.H.264',
+             '1080p.BluRay.x264', '2160p.WEB-DL.DDP5.1.HEVC']
+
+
+def create_items(count, search_strings, unique):
+    """Return the items found for every search string. A season pack search finds the same items over and over."""
+    items = [{'title': 'Show.Name.S01.{0}-GRP{1}'.format(random.choice(QUALITIES), number),
+              'link': 'http://tracker.local/download/{0}.torrent'.format(number)}
+             for number in range(unique)]
+    per_string = count // search_strings
+    return {'search {0}'.format(number): [random.choice(items) for _ in range(per_string)]
+            for number in range(search_strings)}
+
+
+def legacy_collect(provider, series, found):
+    """Collect the search results as find_search_results did before, with a list lookup on SearchResult.__eq__."""
+    results = []
+    for items in found.values():
+        for item in items:
+            result = provider.get_result(series=series, item=item)
+            if result not in results:
+                result.quality = Quality.quality_from_name(result.name, series.is_anime)
+                results.append(result)
+    results.sort(key=operator.attrgetter('quality'), reverse=True)
+    return results
+
+
+def main(argv):
+    count = int(argv[1]) if len(argv) > 1 else 5000
+    search_strings = int(argv[2]) if len(argv) > 2 else 10
+    unique = int(argv[3]) if len(argv) > 3 else 2500
+
+    random.seed(42)
+    found = create_items(count, search_strings, unique)
+    provider = GenericProvider('bench')
+    provider._get_season_search_strings = lambda episode: list(found)
+    provider.search = lambda search_string, **kwargs: found[search_string]
+    series = StubSeries(1)
+
+    # Leave the name parser out, it's the same for both and only sees the unique names
+    parsed = []
+    NameParser.parse_many = lambda self, names: parsed.extend(names) or [InvalidShowException(name) for name in names]
+
+    start = time.time()
+    legacy = legacy_collect(provider, series, found)
+    legacy_time = time.time() - start
+
+    start = time.time()
+    provider.find_search_results(series, [None, None], 'sponly', manual_search=True)
+    keyed_time = time.time() - start
+    assert parsed == [result.name for result in legacy]
+
+    print('{0} items from {1} search strings, {2} unique results'.format(count, search_strings, len(legacy)))
+    print('{0:>10} {1:>10}'.format('', 'time (s)'))
+    print('{0:>10} {1:>10.3f}'.format('list', legacy_time))
+    print('{0:>10} {1:>10.3f}'.format('keyed', keyed_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,85 @@
+# coding=utf-8
+"""Benchmark guessit with the expected titles rebuilt for every parse vs the versioned expected titles."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import sys
+import time
+
+from medusa import app
+from medusa.name_parser import guessit_parser
+from medusa.name_parser.guessit_parser import GuessItCache, get_expected_titles, guessit
+
+from tests.benchmarks.stubs import StubSeries
+
+WORDS = ['Night', 'Blue', 'City', 'House', 'Doctor', 'Dark', 'Mountain', 'River', 'Star', 'Lost', 'Good', 'King',
+         'Queen', 'Fire', 'Ice', 'Ghost', 'Island', 'Family', 'Law', 'Order', 'Station', 'Empire', 'Legend', 'Bay']
+
+
+def create_show_list(shows):
+    random.seed(42)
+    show_list = []
+    for number in range(shows):
+        name = ' '.join(random.sample(WORDS, 3))
+        if random.random() < 0.1:
+            name = '{0} {1}'.format(name, random.randint(1, 999))
+        aliases = [' '.join(random.sample(WORDS, 2)) for _ in range(random.randint(0, 2))]
+        show_list.append(StubSeries(number, '{0} {1}'.format(name, number), aliases) if random.random() < 0.05
+                         else StubSeries(number, name, aliases))
+    return show_list
+
+
+def legacy_lookup(cache, name):
+    """Cache lookup as it was done before the versioned expected titles."""
+    final_options = dict(show_type='normal')
+    final_options.update(dict(type='episode', implicit=True,
+                              episode_prefer_number=False,
+                              expected_title=get_expected_titles(app.showList),
+                              expected_group=guessit_parser.expected_groups,
+                              allowed_languages=guessit_parser.allowed_languages,
+                              allowed_countries=guessit_parser.allowed_countries))
+    return cache.get_or_invalidate(name, final_options)
+
+
+def main(argv):
+    names = int(argv[1]) if len(argv) > 1 else 10000
+    shows = int(argv[2]) if len(argv) > 2 else 2000
+    unique = int(argv[3]) if len(argv) > 3 else 500
+
+    app.showList = create_show_list(shows)
+    random.seed(7)
+    release_names = [
+        '{0}.S{1:02d}E{2:02d}.720p.HDTV.x264-GRP{3}'.format(
+            random.choice(app.showList).name.replace(' ', '.'), random.randint(1, 10), random.randint(1, 24), number)
+        for number in range(unique)
+    ]
+    release_names = [random.choice(release_names) for _ in range(names)]
+    print('{0} release names ({1} unique), {2} shows, {3} expected titles'.format(
+        names, unique, shows, len(get_expected_titles(app.showList))))
+
+    start = time.time()
+    for name in set(release_names):
+        guessit(name)
+    print('parsing {0} unique names: {1:.3f}s'.format(unique, time.time() - start))
+
+    legacy_cache = GuessItCache()
+    legacy_cache.cache.update(guessit_parser.guessit_cache.cache)
+    start = time.time()
+    for name in release_names:
+        assert legacy_lookup(legacy_cache, name)
+    legacy_time = time.time() - start
+
+    start = time.time()
+    for name in release_names:
+        guessit(name)
+    versioned_time = time.time() - start
+
+    print('{0:>10} {1:>10} {2:>12}'.format('', 'time (s)', 'per name (ms)'))
+    print('{0:>10} {1:>10.3f} {2:>12.3f}'.format('rebuilt', legacy_time, legacy_time * 1000 / names))
+    print('{0:>10} {1:>10.3f} {2:>12.3f}'.format('versioned', versioned_time, versioned_time * 1000 / names))
+    print('speedup: {0:.1f}x'.format(legacy_time / versioned_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,74 @@
+# coding=utf-8
+"""Benchmark the already processed check, a leading wildcard LIKE on the history resource vs the indexed resource_name."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from medusa import app, db, helpers
+from medusa.common import DOWNLOADED, SNATCHED
+from medusa.databases import main_db, utils
+
+
+def create_history(con, rows):
+    con.action('CREATE TABLE db_version (db_version INTEGER, db_minor_version INTEGER)')
+    con.action('INSERT INTO db_version (db_version, db_minor_version) VALUES (44, 18)')
+    con.action('CREATE TABLE history (action NUMERIC, date NUMERIC, resource TEXT)')
+    con.executemany([[
+        'INSERT INTO history (action, date, resource) VALUES (?, ?, ?)',
+        [[DOWNLOADED if number % 2 else SNATCHED, number,
+          '/tv/Show {0}/Season 01/Show.{0}.S01E{1:02d}.720p.HDTV.x264-GROUP.mkv'.format(number // 20, number % 20)]
+         for number in range(rows)]
+    ]])
+
+
+def legacy_is_already_processed_media(con, full_filename):
+    return bool(con.select('SELECT action FROM history WHERE action = ? AND resource LIKE ?',
+                           [DOWNLOADED, '%' + full_filename]))
+
+
+def main(argv):
+    rows = int(argv[1]) if len(argv) > 1 else 500000
+    lookups = int(argv[2]) if len(argv) > 2 else 200
+
+    random.seed(42)
+    names = ['Show.{0}.S01E{1:02d}.720p.HDTV.x264-GROUP.mkv'.format(random.randrange(rows // 20), random.randrange(20))
+             for _ in range(lookups)]
+
+    data_dir = tempfile.mkdtemp()
+    app.DATA_DIR = data_dir
+    app.APPLICATION_DB = 'bench.db'
+    utils.backup_database = lambda *args: None
+    try:
+        con = db.DBConnection()
+        create_history(con, rows)
+
+        start = time.time()
+        legacy = [legacy_is_already_processed_media(con, name) for name in names]
+        like_time = time.time() - start
+
+        start = time.time()
+        db.upgradeDatabase(con, main_db.AddHistoryFDHFields)
+        upgrade_time = time.time() - start
+
+        start = time.time()
+        indexed = [helpers.is_already_processed_media(name) for name in names]
+        indexed_time = time.time() - start
+        assert legacy == indexed
+
+        print('{0} lookups in a history table of {1} rows'.format(lookups, rows))
+        print('{0:>10} {1:>10} {2:>16}'.format('', 'time (s)', 'per lookup (ms)'))
+        print('{0:>10} {1:>10.3f} {2:>16.3f}'.format('LIKE', like_time, like_time * 1000 / lookups))
+        print('{0:>10} {1:>10.3f} {2:>16.3f}'.format('indexed', indexed_time, indexed_time * 1000 / lookups))
+        print('schema upgrade and backfill: {0:.3f}s'.format(upgrade_time))
+    finally:
+        db.db_cons.pop('bench.db').close()
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
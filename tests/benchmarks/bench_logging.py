@@ -0,0 +1,102 @@
+# coding=utf-8
+"""Benchmark logging with the formatting, censoring and writing done by the caller vs a listener thread."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from logging.handlers import RotatingFileHandler
+
+from medusa import logger
+from medusa.helper.common import dateTimeFormat
+from medusa.init.logconfig import standard_logger
+from medusa.logger.adapters.style import BraceAdapter
+
+
+class LegacyCensoredFormatter(logger.CensoredFormatter):
+    """The formatter as it was before: every censored item is replaced one by one."""
+
+    def format(self, record):
+        msg = logging.Formatter.format(self, record)
+        for ssl_error in self.ssl_errors:
+            if ssl_error.findall(msg):
+                msg = ssl_error.sub('See: https://git.io/vVaIj', msg)
+        for item in logger.censored:
+            msg = msg.replace(item, '**********')
+        return msg
+
+
+def create_logger(name, handler):
+    target = standard_logger(name)
+    target.propagate = False
+    target.setLevel(logging.DEBUG)
+    target.addFilter(logger.ContextFilter())
+    target.addHandler(handler)
+    return BraceAdapter(target)
+
+
+def run(log, messages):
+    latencies = []
+    start = time.time()
+    for number in range(messages):
+        call_start = time.time()
+        log.debug('Adding item from search to cache: {name} with url {url}',
+                  {'name': 'Show.Name.S01E{0:02d}.720p.HDTV.x264-GRP'.format(number % 100),
+                   'url': 'https://tracker.local/download/{0}?apikey=key{1}'.format(number, number % 200)})
+        latencies.append(time.time() - call_start)
+    return time.time() - start, latencies
+
+
+def main(argv):
+    messages = int(argv[1]) if len(argv) > 1 else 50000
+    secrets = int(argv[2]) if len(argv) > 2 else 200
+
+    log_dir = tempfile.mkdtemp()
+    logger.censored_items.update({('Provider{0}'.format(number), 'api_key'): 'key{0}'.format(number)
+                                  for number in range(secrets)})
+    logger.rebuild_censored_list()
+    try:
+        def file_handler(formatter_class, filename):
+            handler = RotatingFileHandler(os.path.join(log_dir, filename), maxBytes=10 * 1024 * 1024,
+                                          backupCount=5, encoding='utf-8')
+            handler.setFormatter(formatter_class(logger.FORMATTER_PATTERN, dateTimeFormat))
+            return handler
+
+        sync_handler = file_handler(LegacyCensoredFormatter, 'sync.log')
+        sync_time, sync_latencies = run(create_logger('bench.sync', sync_handler), messages)
+        sync_handler.close()
+
+        queue_handler = logger.LogQueueHandler([file_handler(logger.CensoredFormatter, 'queued.log')])
+        start = time.time()
+        queued_time, queued_latencies = run(create_logger('bench.queued', queue_handler), messages)
+        queue_handler.close()
+        written_time = time.time() - start
+        for handler in queue_handler.listener.handlers:
+            handler.close()
+
+        for filename in ('sync.log', 'queued.log'):
+            with open(os.path.join(log_dir, filename)) as log_file:
+                lines = log_file.readlines()
+            assert len(lines) == messages
+            assert all('apikey=********** ' in line or line.endswith('apikey=**********\n') for line in lines)
+
+        print('{0} debug messages, {1} censored items'.format(messages, len(logger.censored)))
+        print('{0:>8} {1:>12} {2:>14} {3:>14} {4:>16}'.format(
+            '', 'caller (s)', 'all written (s)', 'avg call (us)', 'p99 call (us)'))
+        for label, caller_time, total_time, latencies in (
+                ('sync', sync_time, sync_time, sync_latencies),
+                ('queued', queued_time, written_time, queued_latencies)):
+            latencies.sort()
+            print('{0:>8} {1:>12.3f} {2:>14.3f} {3:>14.1f} {4:>16.1f}'.format(
+                label, caller_time, total_time, sum(latencies) * 1e6 / len(latencies),
+                latencies[int(len(latencies) * 0.99)] * 1e6))
+    finally:
+        shutil.rmtree(log_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
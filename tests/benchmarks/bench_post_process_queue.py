@@ -0,0 +1,89 @@
+# coding=utf-8
+"""Benchmark the post-process queue throughput with one worker vs several workers, on synthetic releases."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from medusa import app
+from medusa.post_processor import processing_locks
+from medusa.queues import generic_queue
+from medusa.search.queue import PostProcessQueue
+
+
+class SyntheticQueueItem(generic_queue.QueueItem):
+    """Hash and copy a release to its show folder, then wait for the metadata and notifiers to be done."""
+
+    def __init__(self, path, resource_name, series_id, destination, latency):
+        generic_queue.QueueItem.__init__(self, 'Post Process')
+        self.path = path
+        self.resource_name = resource_name
+        self.series_id = series_id
+        self.destination = destination
+        self.latency = latency
+
+    def run(self):
+        generic_queue.QueueItem.run(self)
+        source = os.path.join(self.path, self.resource_name)
+        md5 = hashlib.md5()
+        with open(source, 'rb') as release:
+            for chunk in iter(lambda: release.read(1 << 20), b''):
+                md5.update(chunk)
+
+        with processing_locks.hold(('series', 1, self.series_id), ('location', self.destination)):
+            shutil.copyfile(source, os.path.join(self.destination, self.resource_name))
+            time.sleep(self.latency)
+        self.finish()
+
+
+def run(queue, items):
+    start = time.time()
+    for item in items:
+        queue.add_item(item)
+    while queue.queue or queue.running_items:
+        queue.run()
+        time.sleep(0.005)
+    return time.time() - start
+
+
+def main(argv):
+    releases = int(argv[1]) if len(argv) > 1 else 20
+    size = int(argv[2]) if len(argv) > 2 else 20
+    shows = int(argv[3]) if len(argv) > 3 else 10
+    latency = float(argv[4]) if len(argv) > 4 else 0.2
+
+    work_dir = tempfile.mkdtemp()
+    try:
+        downloads = os.path.join(work_dir, 'downloads')
+        os.makedirs(downloads)
+        for number in range(releases):
+            with open(os.path.join(downloads, 'release{0}.mkv'.format(number)), 'wb') as release:
+                release.write(os.urandom(size << 20))
+
+        print('{0} releases of {1}MB for {2} shows, {3}s of metadata and notifiers per release'.format(
+            releases, size, shows, latency))
+        print('{0:>8} {1:>10} {2:>14}'.format('workers', 'time (s)', 'releases/s'))
+        for workers in (1, 2, 4, 8):
+            app.POSTPROCESS_WORKERS = workers
+            tv_dir = os.path.join(work_dir, 'tv{0}'.format(workers))
+            items = []
+            for number in range(releases):
+                destination = os.path.join(tv_dir, 'show{0}'.format(number % shows))
+                if not os.path.isdir(destination):
+                    os.makedirs(destination)
+                items.append(SyntheticQueueItem(downloads, 'release{0}.mkv'.format(number),
+                                                number % shows, destination, latency))
+            elapsed = run(PostProcessQueue(), items)
+            print('{0:>8} {1:>10.2f} {2:>14.2f}'.format(workers, elapsed, releases / elapsed))
+            shutil.rmtree(tv_dir)
+    finally:
+        shutil.rmtree(work_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,59 @@
+# coding=utf-8
+"""Benchmark the wall-clock time of serial vs concurrent provider searches, using stub providers."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import sys
+import time
+
+from medusa.search.provider_pool import ProviderPool
+
+
+class StubProvider(object):
+    """Provider that simulates the HTTP latency of a real indexer."""
+
+    def __init__(self, index, latency):
+        self.name = 'Stub{0}'.format(index)
+        self.url = 'https://stub{0}.example.org'.format(index)
+        self.latency = latency
+
+    def get_id(self):
+        return self.name.lower()
+
+    def search(self):
+        time.sleep(self.latency)
+        return [self.name]
+
+
+def serial(providers):
+    return [provider.search() for provider in providers]
+
+
+def concurrent(providers, workers):
+    return [task.result for task in ProviderPool(max_workers=workers, timeout=60).map(
+        lambda provider: provider.search(), providers)]
+
+
+def main(argv):
+    latency = float(argv[1]) if len(argv) > 1 else 0.2
+    workers = int(argv[2]) if len(argv) > 2 else 8
+
+    print('latency per provider: {0}s, workers: {1}'.format(latency, workers))
+    print('{0:>10} {1:>12} {2:>12} {3:>8}'.format('providers', 'serial (s)', 'pool (s)', 'speedup'))
+    for count in (1, 5, 10, 15, 20, 30):
+        providers = [StubProvider(i, latency) for i in range(count)]
+
+        start = time.time()
+        expected = serial(providers)
+        serial_time = time.time() - start
+
+        start = time.time()
+        actual = concurrent(providers, workers)
+        pool_time = time.time() - start
+
+        assert actual == expected, 'results must be merged in provider order'
+        print('{0:>10} {1:>12.3f} {2:>12.3f} {3:>7.1f}x'.format(count, serial_time, pool_time, serial_time / pool_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,49 @@
+# coding=utf-8
+"""Benchmark show lookups by id and slug, against the number of shows in the library."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import random
+import sys
+import timeit
+
+from medusa.show.show import Show
+from medusa.show.show_list import ShowList
+
+from tests.benchmarks.stubs import StubSeries
+
+
+def main(argv):
+    lookups = int(argv[1]) if len(argv) > 1 else 10000
+
+    print('{0:>8} {1:>16} {2:>16} {3:>16}'.format('shows', 'list (us/op)', 'indexed (us/op)', 'slug (us/op)'))
+    for count in (10, 100, 500, 1000, 2000, 5000):
+        series = [StubSeries(series_id) for series_id in range(1, count + 1)]
+        plain = list(series)
+        indexed = ShowList(series)
+
+        random.seed(42)
+        ids = [random.randint(1, count) for _ in range(lookups)]
+
+        def lookup_plain():
+            for series_id in ids:
+                Show.find_by_id(plain, 1, series_id)
+
+        def lookup_indexed():
+            for series_id in ids:
+                Show.find_by_id(indexed, 1, series_id)
+
+        slugs = ['tvdb{0}'.format(series_id) for series_id in ids]
+
+        def lookup_slug():
+            for slug in slugs:
+                indexed.find_by_slug(slug)
+
+        plain_time = min(timeit.repeat(lookup_plain, number=1, repeat=3)) / lookups * 1e6
+        indexed_time = min(timeit.repeat(lookup_indexed, number=1, repeat=3)) / lookups * 1e6
+        slug_time = min(timeit.repeat(lookup_slug, number=1, repeat=3)) / lookups * 1e6
+        print('{0:>8} {1:>16.2f} {2:>16.2f} {3:>16.2f}'.format(count, plain_time, indexed_time, slug_time))
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,128 @@
+# coding=utf-8
+"""Benchmark the per-show vs the bulk wanted episodes query, on a synthetic library."""
+from __future__ import print_function
+from __future__ import unicode_literals
+
+import datetime
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+from medusa import app, db
+from medusa.common import DOWNLOADED, HD1080p, Quality, SKIPPED, SNATCHED, UNSET, WANTED
+from medusa.search.core import wanted_episodes_for_shows
+
+from tests.benchmarks.stubs import StubSeries
+
+
+def legacy_wanted_episodes(series_obj, from_date):
+    """The per-show implementation, as it was before the bulk query."""
+    wanted = []
+    allowed_qualities, preferred_qualities = series_obj.current_qualities
+    all_qualities = list(set(allowed_qualities + preferred_qualities))
+
+    con = db.DBConnection()
+    sql_results = con.select(
+        'SELECT status, quality, season, episode, manually_searched '
+        'FROM tv_episodes '
+        'WHERE indexer = ? '
+        ' AND showid = ?'
+        ' AND season > 0'
+        ' AND airdate > ?',
+        [series_obj.indexer, series_obj.series_id, from_date.toordinal()]
+    )
+
+    for episode in sql_results:
+        cur_status, cur_quality = int(episode['status'] or UNSET), int(episode['quality'] or Quality.NA)
+        should_search, _ = Quality.should_search(cur_status, cur_quality, series_obj, episode['manually_searched'])
+        if not should_search:
+            continue
+
+        ep_obj = series_obj.get_episode(episode['season'], episode['episode'])
+        ep_obj.wanted_quality = [
+            quality
+            for quality in all_qualities
+            if Quality.is_higher_quality(cur_quality, quality, allowed_qualities, preferred_qualities)
+        ]
+        wanted.append(ep_obj)
+
+    return wanted
+
+
+def create_library(con, shows, episodes_per_show, wanted_ratio):
+    con.action(
+        'CREATE TABLE tv_episodes (episode_id INTEGER PRIMARY KEY, indexer NUMERIC, showid NUMERIC, season NUMERIC,'
+        ' episode NUMERIC, airdate NUMERIC, status NUMERIC, quality NUMERIC, manually_searched NUMERIC)'
+    )
+    con.action('CREATE TABLE tv_shows (show_id INTEGER PRIMARY KEY, indexer NUMERIC, indexer_id NUMERIC, quality NUMERIC)')
+    con.action('CREATE INDEX idx_showid ON tv_episodes (showid)')
+    con.action('CREATE INDEX idx_status ON tv_episodes (status, quality, season, episode, airdate)')
+
+    con.mass_action([
+        ['INSERT INTO tv_shows (indexer, indexer_id, quality) VALUES (1, ?, ?)', [show, HD1080p]]
+        for show in range(1, shows + 1)
+    ])
+
+    random.seed(42)
+    rows = []
+    for show in range(1, shows + 1):
+        for number in range(episodes_per_show):
+            if random.random() < wanted_ratio:
+                status, quality = random.choice([(WANTED, Quality.NA), (SNATCHED, Quality.SDTV)])
+            else:
+                status, quality = random.choice([(DOWNLOADED, Quality.FULLHDTV), (SKIPPED, Quality.NA)])
+            rows.append([1, show, number // 20 + 1, number % 20 + 1, 1000 + number, status, quality])
+
+    con.mass_action([
+        ['INSERT INTO tv_episodes (indexer, showid, season, episode, airdate, status, quality, manually_searched)'
+         ' VALUES (?, ?, ?, ?, ?, ?, ?, 0)', row]
+        for row in rows
+    ])
+
+
+def main(argv):
+    shows = int(argv[1]) if len(argv) > 1 else 1000
+    episodes_per_show = int(argv[2]) if len(argv) > 2 else 100
+    wanted_ratio = float(argv[3]) if len(argv) > 3 else 0.02
+
+    data_dir = tempfile.mkdtemp()
+    app.DATA_DIR = data_dir
+    app.APPLICATION_DB = 'bench_wanted.db'
+    try:
+        con = db.DBConnection()
+        create_library(con, shows, episodes_per_show, wanted_ratio)
+        print('library: {0} shows, {1} episodes, ~{2:.0%} wanted'.format(
+            shows, shows * episodes_per_show, wanted_ratio))
+
+        from_date = datetime.date.fromordinal(1)
+
+        series_list = [StubSeries(show) for show in range(1, shows + 1)]
+        start = time.time()
+        legacy = []
+        for series_obj in series_list:
+            legacy.extend(legacy_wanted_episodes(series_obj, from_date))
+        legacy_time = time.time() - start
+        legacy_built = sum(series_obj.episodes_built for series_obj in series_list)
+
+        series_list = [StubSeries(show) for show in range(1, shows + 1)]
+        start = time.time()
+        bulk = wanted_episodes_for_shows(series_list, from_date)
+        bulk_time = time.time() - start
+        bulk_built = sum(series_obj.episodes_built for series_obj in series_list)
+
+        assert sorted((ep.series.series_id, ep.season, ep.episode) for ep in legacy) == \
+            sorted((ep.series.series_id, ep.season, ep.episode) for ep in bulk)
+
+        print('{0:>10} {1:>8} {2:>10} {3:>10}'.format('', 'queries', 'episodes', 'time (s)'))
+        print('{0:>10} {1:>8} {2:>10} {3:>10.3f}'.format('per-show', shows, legacy_built, legacy_time))
+        print('{0:>10} {1:>8} {2:>10} {3:>10.3f}'.format('bulk', 1, bulk_built, bulk_time))
+        print('speedup: {0:.1f}x'.format(legacy_time / bulk_time))
+    finally:
+        db.db_cons.pop(app.APPLICATION_DB).close()
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main(sys.argv)
@@ -0,0 +1,41 @@
+# coding=utf-8
+"""Stub shows and episodes, shared by the benchmarks."""
+from __future__ import unicode_literals
+
+from collections import namedtuple
+
+from medusa.common import HD1080p, Quality
+
+Alias = namedtuple('Alias', 'title')
+
+
+class StubEpisode(object):
+    def __init__(self, series, season, episode):
+        self.series = series
+        self.season = season
+        self.episode = episode
+        self.wanted_quality = []
+
+
+class StubSeries(object):
+    """A show with only the attributes the benchmarked code reads, it counts the episodes it builds."""
+
+    def __init__(self, series_id, name=None, aliases=()):
+        self.indexer = 1
+        self.series_id = series_id
+        self.indexerid = series_id
+        self.slug = 'tvdb{0}'.format(series_id)
+        self.name = name or 'Show {0}'.format(series_id)
+        self.aliases = {Alias(title) for title in aliases}
+        self.paused = False
+        self.is_anime = False
+        self.quality = HD1080p
+        self.episodes_built = 0
+
+    @property
+    def current_qualities(self):
+        return Quality.split_quality(int(self.quality))
+
+    def get_episode(self, season, episode):
+        self.episodes_built += 1
+        return StubEpisode(self, season, episode)
@@ -2,12 +2,16 @@
 """Tests for medusa.clients.torrent module."""
 from __future__ import unicode_literals
 
+import time
+
 import medusa.clients.torrent as sut
 from medusa.clients.torrent import (
     deluge, deluged, downloadstation, mlnet,
     qbittorrent, rtorrent, transmission, utorrent
 )
 
+from mock.mock import Mock
+
 import pytest
 
 
@@ -110,3 +114,41 @@ def test_get_client_class(p):
 
     # Then
     assert expected == actual
+
+
+@pytest.mark.parametrize('p', [
+    {  # p0: The request failed
+        'client': qbittorrent.QBittorrentAPI,
+        'response': None,
+        'expected': None
+    },
+    {  # p1: No torrents
+        'client': qbittorrent.QBittorrentAPI,
+        'response': [],
+        'expected': {}
+    },
+    {  # p2: The request failed
+        'client': utorrent.UTorrentAPI,
+        'response': None,
+        'expected': None
+    },
+    {  # p3: No torrents
+        'client': utorrent.UTorrentAPI,
+        'response': {'torrents': []},
+        'expected': {}
+    },
+])
+def test_get_statuses(monkeypatch, p):
+    # Given
+    client = p['client'](host='http://localhost')
+    client.api = (2, 0, 0)
+    client.auth = True
+    client.last_time = time.time()
+    client.response = Mock(json=Mock(return_value=p['response']))
+    monkeypatch.setattr(client, '_request', lambda *args, **kwargs: p['response'] is not None)
+
+    # When
+    actual = client.get_statuses(['AABBCC'])
+
+    # Then
+    assert p['expected'] == actual
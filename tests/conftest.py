@@ -18,8 +18,9 @@ from medusa import app, cache
 from medusa.common import SD
 from medusa.helper.common import dateTimeFormat
 from medusa.indexers.config import INDEXER_TVDBV2
-from medusa.logger import CensoredFormatter, ContextFilter, FORMATTER_PATTERN, instance
+from medusa.logger import CensoredFormatter, ContextFilter, FORMATTER_PATTERN, LOG_STORE_SUFFIX, instance
 from medusa.logger import read_loglines as logger_read_loglines
+from medusa.logger.store import LogStore, LogStoreHandler
 from medusa.providers.generic_provider import GenericProvider
 from medusa.tv import Episode, Series
 from medusa.updater.version_checker import CheckVersion
@@ -224,9 +225,11 @@ def commit_hash(monkeypatch):
 
 
 @pytest.fixture
-def logfile(tmpdir):
+def logfile(monkeypatch, tmpdir):
     target = text_type(tmpdir.ensure('logfile.log'))
     instance.log_file = target
+    # The log viewer reads this log file, instead of the log store of the file handler
+    monkeypatch.setattr(instance, 'file_handler', None)
     return target
 
 
@@ -238,6 +241,16 @@ def rotating_file_handler(logfile):
     return handler
 
 
+@pytest.fixture
+def log_store_handler(logfile):
+    handler = LogStoreHandler(logfile, LogStore(logfile + LOG_STORE_SUFFIX), maxBytes=512 * 1024, backupCount=2,
+                              encoding='utf-8')
+    handler.setFormatter(CensoredFormatter(FORMATTER_PATTERN, dateTimeFormat))
+    handler.setLevel(logging.DEBUG)
+    yield handler
+    handler.close()
+
+
 @pytest.fixture
 def logger(rotating_file_handler, commit_hash):
     print('Using commit_hash {0}'.format(commit_hash))
@@ -211,6 +211,24 @@ def test_replace_extension(p):
         assert sut.replace_extension(filename, extension) == result
 
 
+@pytest.mark.parametrize('value,expected', [
+    (None, ''),
+    ('', ''),
+    ('Show.Name.S01E01.720p-GROUP', 'show.name.s01e01.720p-group'),
+    ('/tv/Show Name/Season 01/Show.Name.S01E01.mkv', 'show.name.s01e01.mkv'),
+    ('C:\\TV\\Show Name\\Show.Name.S01E01.mkv', 'show.name.s01e01.mkv'),
+    ('Show.Name.S01E01/Show.Name.S01E01.mkv', 'show.name.s01e01.mkv'),
+])
+def test_resource_file_name(value, expected):
+    # Given
+
+    # When
+    actual = sut.resource_file_name(value)
+
+    # Then
+    assert expected == actual
+
+
 @pytest.mark.parametrize('value,expected', [
     # special test cases
     (None, ''),
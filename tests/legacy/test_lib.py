@@ -148,9 +148,9 @@ class AppTestDBCase(unittest.TestCase):
 class TestDBConnection(db.DBConnection, object):
     """Test connecting to the database."""
 
-    def __init__(self, db_file_name=TEST_DB_NAME):
+    def __init__(self, db_file_name=TEST_DB_NAME, suffix=None, row_type='dict'):
         db_file_name = os.path.join(TEST_DIR, db_file_name)
-        super(TestDBConnection, self).__init__(db_file_name)
+        super(TestDBConnection, self).__init__(db_file_name, suffix, row_type)
 
 
 class TestCacheDBConnection(TestDBConnection, object):
@@ -0,0 +1,66 @@
+# coding=utf-8
+"""Tests for medusa/name_parser/cache.py."""
+from __future__ import unicode_literals
+
+from medusa.name_parser.cache import BaseCache
+from medusa.name_parser.parser import NameParserCache, ParseResult
+
+
+def test_lru_eviction():
+    # Given
+    cache = BaseCache(max_size=3)
+    for name in ('a', 'b', 'c'):
+        cache.add(name, name.upper())
+
+    # When
+    cache.get('a')
+    cache.add('d', 'D')
+
+    # Then
+    assert list(cache.cache) == ['c', 'a', 'd']
+    assert cache.stats() == {'size': 3, 'max_size': 3, 'hits': 1, 'misses': 0, 'evictions': 1}
+
+
+def test_stats():
+    # Given
+    cache = BaseCache(max_size=2)
+    cache.add('a', 'A')
+
+    # When
+    found = cache.get_many(['a', 'b', 'a'])
+    cache.get('c')
+
+    # Then
+    assert found == {'a': 'A'}
+    assert cache.stats() == {'size': 1, 'max_size': 2, 'hits': 2, 'misses': 2, 'evictions': 0}
+
+
+def test_resize():
+    # Given
+    cache = BaseCache(max_size=4)
+    for name in ('a', 'b', 'c', 'd'):
+        cache.add(name, name.upper())
+
+    # When
+    cache.resize(2)
+
+    # Then
+    assert list(cache.cache) == ['c', 'd']
+    assert cache.evictions == 2
+
+
+def test_name_parser_cache_remove_by_indexer(create_tvshow):
+    # Given
+    cache = NameParserCache(max_size=3)
+    shows = [create_tvshow(indexer=1, indexerid=1), create_tvshow(indexer=1, indexerid=2)]
+    for number, name in enumerate(('a', 'b', 'c', 'd')):
+        result = ParseResult({}, original_name=name)
+        result.series = shows[number % 2]
+        cache.add(name, result)
+
+    # When
+    cache.remove_by_indexer(1, 2)
+
+    # Then
+    assert list(cache.cache) == ['c']
+    assert cache.series_index == {(1, 1): {'c'}}
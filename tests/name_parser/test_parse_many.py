@@ -0,0 +1,86 @@
+# coding=utf-8
+"""Tests for NameParser.parse_many."""
+from __future__ import unicode_literals
+
+from medusa.name_parser import guessit_parser
+from medusa.name_parser.parser import InvalidShowException, NameParser, name_parser_cache
+
+import pytest
+
+
+@pytest.fixture
+def parser(monkeypatch, create_tvshow, monkeypatch_function_return):
+    monkeypatch_function_return([('medusa.scene_numbering.get_indexer_numbering', (None, None))])
+    series = create_tvshow(indexerid=1, name='Show Name')
+    monkeypatch.setattr('medusa.helpers.get_show', lambda name, try_indexers=False: series if name == 'Show Name' else None)
+    monkeypatch.setattr('medusa.app.showList', [series])
+    name_parser_cache.clear()
+    guessit_parser.guessit_cache.clear()
+    yield NameParser()
+    name_parser_cache.clear()
+    guessit_parser.guessit_cache.clear()
+
+
+def test_parse_many(monkeypatch, parser):
+    # Given
+    names = [
+        'Show.Name.S01E02.720p.HDTV.x264-GROUP',
+        'Unknown.Show.S01E01.720p.HDTV.x264-GROUP',
+        'Show.Name.S01E03.720p.HDTV.x264-GROUP',
+        'Show.Name.S01E02.720p.HDTV.x264-GROUP',
+    ]
+    cached = parser.parse('Show.Name.S01E03.720p.HDTV.x264-GROUP')
+    guessed = []
+    guess = guessit_parser._guess
+    monkeypatch.setattr(guessit_parser, '_guess', lambda name, *args, **kwargs: guessed.append(name) or guess(
+        name, *args, **kwargs))
+
+    # When
+    actual = parser.parse_many(names)
+
+    # Then
+    assert guessed == names[:2]
+    assert [result.episode_numbers for result in (actual[0], actual[2], actual[3])] == [[2], [3], [2]]
+    assert isinstance(actual[1], InvalidShowException)
+    assert actual[2] is cached
+    assert actual[3] is actual[0]
+
+
+def test_parse_many_error(monkeypatch, parser):
+    # Given
+    names = ['Show.Name.S01E01.720p.HDTV.x264-GROUP', 'Show.Name.S01E02.720p.HDTV.x264-GROUP']
+    guess = guessit_parser._guess
+    monkeypatch.setattr(guessit_parser, '_guess', lambda name, *args, **kwargs: ValueError(
+        name) if name == names[0] else guess(name, *args, **kwargs))
+
+    # When
+    actual = parser.parse_many(names)
+
+    # Then
+    assert isinstance(actual[0], ValueError)
+    assert actual[1].episode_numbers == [2]
+
+
+def test_parse_many_worker_pool(monkeypatch, parser):
+    # Given
+    monkeypatch.setattr(guessit_parser, 'POOL_MIN_NAMES', 1)
+    monkeypatch.setattr(guessit_parser, 'guessit_pool', None)
+    names = ['Show.Name.S01E{0:02d}.720p.HDTV.x264-GROUP'.format(episode) for episode in range(1, 6)]
+    names.append('Unknown.Show.S01E01.720p.HDTV.x264-GROUP')
+
+    def guesses(results):
+        return [{key: value for key, value in result.guess.items() if key != 'parsing_time'}
+                for result in results[:5]]
+
+    expected = guesses(parser.parse_many(names, workers=1))
+    name_parser_cache.clear()
+    guessit_parser.guessit_cache.clear()
+
+    # When
+    actual = parser.parse_many(names, workers=2)
+    guessit_parser.guessit_pool[1].shutdown()
+
+    # Then
+    assert [result.episode_numbers for result in actual[:5]] == [[episode] for episode in range(1, 6)]
+    assert isinstance(actual[5], InvalidShowException)
+    assert guesses(actual) == expected
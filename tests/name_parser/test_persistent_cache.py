@@ -0,0 +1,115 @@
+# coding=utf-8
+"""Tests for the persistent parse cache."""
+from __future__ import unicode_literals
+
+from medusa.name_parser import guessit_parser
+from medusa.name_parser.parser import NameParser, NameParserCache
+
+import pytest
+
+
+@pytest.fixture
+def series(monkeypatch, create_tvshow, monkeypatch_function_return):
+    monkeypatch_function_return([('medusa.scene_numbering.get_indexer_numbering', (None, None))])
+    series = create_tvshow(indexer=1, indexerid=1, name='Show Name')
+    monkeypatch.setattr('medusa.helpers.get_show', lambda name, try_indexers=False: series if name == 'Show Name' else None)
+    monkeypatch.setattr('medusa.app.showList', [series])
+    guessit_parser.guessit_cache.clear()
+    yield series
+    guessit_parser.guessit_cache.clear()
+
+
+@pytest.fixture
+def parse_cache(monkeypatch, tmpdir, series):
+    caches = []
+
+    def restart():
+        """Open the persistent cache in a new parse cache, like after a restart."""
+        if caches:
+            caches[-1].close_persistent()
+        cache = NameParserCache()
+        cache.open_persistent(str(tmpdir), 1024 * 1024)
+        monkeypatch.setattr('medusa.name_parser.parser.name_parser_cache', cache)
+        caches.append(cache)
+        return cache
+
+    yield restart
+    for cache in caches:
+        cache.close_persistent()
+
+
+def test_persistent_cache_warms_after_restart(parse_cache, series):
+    # Given
+    parse_cache()
+    parsed = NameParser().parse('Show.Name.S01E02.720p.HDTV.x264-GROUP')
+
+    # When
+    actual = parse_cache().cache['Show.Name.S01E02.720p.HDTV.x264-GROUP']
+
+    # Then
+    assert actual is not parsed
+    assert actual == parsed
+    assert actual.series is series
+    assert actual.guess == parsed.guess
+
+
+def test_persistent_cache_erase_cached_parse(parse_cache, series):
+    # Given
+    parse_cache()
+    NameParser().parse('Show.Name.S01E02.720p.HDTV.x264-GROUP')
+
+    # When
+    NameParser.erase_cached_parse(series.indexer, series.series_id)
+
+    # Then
+    assert not parse_cache().cache
+
+
+def test_persistent_cache_series_titles(monkeypatch, parse_cache, series, create_tvshow):
+    # Given
+    cache = parse_cache()
+    NameParser().parse('Show.Name.S01E02.720p.HDTV.x264-GROUP')
+    version = cache.config_version()
+
+    # When another show is added
+    monkeypatch.setattr('medusa.app.showList', [series, create_tvshow(indexer=1, indexerid=2, name='The 100')])
+
+    # Then
+    assert 'Show.Name.S01E02.720p.HDTV.x264-GROUP' in parse_cache().cache
+
+    # When the titles of the series change
+    series.name = 'Show Name 2'
+
+    # Then
+    assert cache.config_version() == version
+    assert not parse_cache().cache
+
+
+def test_persistent_cache_competing_show(monkeypatch, parse_cache, series, create_tvshow):
+    # Given
+    parse_cache()
+    NameParser().parse('Show.Name.S01E02.720p.HDTV.x264-GROUP')
+    NameParser().parse('Show.Name.S01E03.720p.HDTV.x264-GROUP')
+
+    # When a show is added that the series name now belongs to
+    other = create_tvshow(indexer=1, indexerid=2, name='Show Name (US)')
+    monkeypatch.setattr('medusa.app.showList', [series, other])
+    monkeypatch.setattr('medusa.helpers.get_show', lambda name, try_indexers=False: other)
+    cache = parse_cache()
+
+    # Then the results of the series are removed
+    assert not cache.cache
+    assert list(cache.persistent.iterkeys()) == []
+
+
+def test_persistent_cache_batch(parse_cache, series):
+    # Given
+    cache = parse_cache()
+
+    # When
+    NameParser().parse('Show.Name.S01E02.720p.HDTV.x264-GROUP')
+
+    # Then the result is written with the next batch
+    assert cache.persistent.get('Show.Name.S01E02.720p.HDTV.x264-GROUP') is None
+    cache.flush()
+    assert cache.persistent.get('Show.Name.S01E02.720p.HDTV.x264-GROUP') is not None
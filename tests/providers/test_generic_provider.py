@@ -6,6 +6,7 @@ from datetime import date, datetime, timedelta
 
 from dateutil import tz
 
+from medusa.name_parser.parser import InvalidShowException, NameParser
 from medusa.providers.generic_provider import GenericProvider
 
 import pytest
@@ -387,3 +388,41 @@ def test_create_search_string_anime(p, create_tvshow, create_tvepisode, monkeypa
     actual = search_string['Episode']
 
     assert expected == actual
+
+
+def test_find_search_results_unique(monkeypatch, create_tvshow, create_tvepisode):
+    # Given
+    parsed_names = []
+
+    def parse_many(self, names):
+        parsed_names.extend(names)
+        return [InvalidShowException(name) for name in names]
+
+    monkeypatch.setattr(NameParser, 'parse_many', parse_many)
+    series = create_tvshow(indexer=1, name='Show Name')
+    episode = create_tvepisode(series, 1, 2)
+    provider = GenericProvider('mock_provider')
+    items = {
+        'first': [
+            {'title': 'Show Name S01E02 480p HDTV x264-GRP', 'link': 'http://host/1'},
+            {'title': 'Show Name S01E02 1080p WEB-DL DD5.1 H.264-GRP', 'link': 'http://host/2'},
+        ],
+        'second': [
+            {'title': 'Show Name S01E02 1080p WEB-DL DD5.1 H.264-GRP', 'link': 'http://host/2'},
+            {'title': 'Show Name S01E02 720p HDTV x264-GRP', 'link': 'http://host/3'},
+            {'title': 'Show Name S01E02 480p HDTV x264-GRP', 'link': 'http://host/1'},
+        ],
+    }
+    monkeypatch.setattr(provider, '_get_episode_search_strings', lambda episode: ['first', 'second'])
+    monkeypatch.setattr(provider, 'search', lambda search_string, **kwargs: items[search_string])
+
+    # When
+    actual = provider.find_search_results(series, [episode], 'eponly', manual_search=True)
+
+    # Then
+    assert actual == {}
+    assert parsed_names == [
+        'Show.Name.S01E02.1080p.WEB-DL.DD5.1.H.264-GRP',
+        'Show.Name.S01E02.720p.HDTV.x264-GRP',
+        'Show.Name.S01E02.480p.HDTV.x264-GRP',
+    ]
@@ -0,0 +1,176 @@
+# coding=utf-8
+"""Tests for medusa/db.py."""
+from __future__ import unicode_literals
+
+import os
+import sqlite3
+import threading
+
+from medusa import db
+
+import pytest
+
+
+@pytest.fixture
+def create_db(tmpdir):
+    paths = []
+
+    def create():
+        path = str(tmpdir.join('test{0}.db'.format(len(paths))))
+        paths.append(path)
+        con = db.DBConnection(path)
+        con.action('CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT)')
+        con.mass_action([['INSERT INTO items (name) VALUES (?)', ['item {0}'.format(number)]]
+                         for number in range(10)])
+        return con
+
+    yield create
+    for path in paths:
+        db.db_cons.pop(path).close()
+        readers = db.db_readers.pop(path)
+        if readers:
+            readers.close()
+
+
+def test_wal_mode(create_db):
+    # When
+    con = create_db()
+
+    # Then
+    assert con.select('PRAGMA journal_mode')[0]['journal_mode'] == 'wal'
+    assert con.readers is not None
+
+
+def test_select_while_writing(create_db):
+    # Given
+    con = create_db()
+    results = []
+    reader = threading.Thread(target=lambda: results.append(con.select('SELECT name FROM items')))
+
+    # When
+    with db.db_locks[con.filename]:
+        reader.start()
+        reader.join(5)
+
+    # Then
+    assert not reader.is_alive()
+    assert len(results[0]) == 10
+
+
+def test_select_one(create_db):
+    # Given
+    con = create_db()
+
+    # When
+    actual = con.selectOne('SELECT name FROM items WHERE id = ?', [3])
+
+    # Then
+    assert actual == {'name': 'item 2'}
+    assert con.readers.idle
+
+
+def test_select_is_read_only(create_db):
+    # Given
+    con = create_db()
+
+    # When
+    with pytest.raises(sqlite3.OperationalError):
+        con.select('DELETE FROM items')
+
+    # Then
+    assert len(con.select('SELECT id FROM items')) == 10
+
+
+def test_select_without_wal(monkeypatch, create_db):
+    # Given
+    monkeypatch.setattr(db.DBConnection, '_configure_journal', lambda self: None)
+    con = create_db()
+
+    # When
+    actual = con.select('SELECT name FROM items WHERE id > ?', [8])
+
+    # Then
+    assert con.readers is None
+    assert actual == [{'name': 'item 8'}, {'name': 'item 9'}]
+
+
+def test_checkpoint(create_db):
+    # Given
+    con = create_db()
+    assert os.path.getsize(con.path + '-wal') > 0
+
+    # When
+    db.checkpoint()
+
+    # Then
+    assert os.path.getsize(con.path + '-wal') == 0
+
+
+def test_row_type(create_db):
+    # Given
+    con = create_db()
+    row_con = db.DBConnection(con.filename, row_type='row')
+
+    # When
+    actual = row_con.selectOne('SELECT id, name FROM items WHERE id = ?', [3])
+
+    # Then
+    assert isinstance(actual, sqlite3.Row)
+    assert actual['name'] == actual[1] == 'item 2'
+    assert con.selectOne('SELECT name FROM items WHERE id = ?', [3]) == {'name': 'item 2'}
+
+
+def test_select_iter(create_db):
+    # Given
+    con = create_db()
+    results = con.select_iter('SELECT name FROM items ORDER BY id')
+
+    # When
+    first = next(results)
+    con.action('DELETE FROM items')
+    rest = list(results)
+
+    # Then
+    assert first == {'name': 'item 0'}
+    assert len(rest) == 9
+    assert con.select('SELECT name FROM items') == []
+
+
+def test_select_iter_nested(create_db):
+    # Given
+    con = create_db()
+    con.readers.size = 1
+    con.readers.max_size = 1
+
+    # When
+    actual = [
+        (row['id'], con.selectOne('SELECT COUNT(*) AS count FROM items WHERE id <= ?', [row['id']])['count'])
+        for row in con.select_iter('SELECT id FROM items ORDER BY id')
+    ]
+
+    # Then
+    assert actual == [(number, number) for number in range(1, 11)]
+    assert len(con.readers.idle) == 1
+    assert con.readers.open == 1
+
+
+def test_select_iter_max_connections(create_db):
+    # Given
+    con = create_db()
+    con.readers.max_size = 1
+    results = con.select_iter('SELECT name FROM items ORDER BY id')
+    next(results)
+    selected = []
+    thread = threading.Thread(target=lambda: selected.append(con.select('SELECT name FROM items')))
+    thread.start()
+
+    # When
+    thread.join(0.2)
+    waiting = thread.is_alive()
+    results.close()
+    thread.join(2)
+
+    # Then the other select waits for the connection
+    assert waiting
+    assert len(selected[0]) == 10
+    assert con.readers.open == 1
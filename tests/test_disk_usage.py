@@ -0,0 +1,111 @@
+# coding=utf-8
+"""Tests for medusa/show/disk_usage.py."""
+from __future__ import unicode_literals
+
+import os
+
+from medusa.show.disk_usage import DiskUsage
+
+import pytest
+
+
+class FakeDBConnection(object):
+    rows = [
+        {'season': 1, 'episode': 1, 'location': '/shows/Show/S01E01.mkv', 'file_size': 100},
+        {'season': 1, 'episode': 2, 'location': '/shows/Show/S01E02.mkv', 'file_size': 200},
+    ]
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def select(self, query, args=None):
+        FakeDBConnection.queries += 1
+        return self.rows
+
+
+@pytest.fixture
+def series(monkeypatch, create_tvshow, tmpdir):
+    FakeDBConnection.queries = 0
+    FakeDBConnection.rows = FakeDBConnection.rows[:2]
+    monkeypatch.setattr('medusa.db.DBConnection', FakeDBConnection)
+    return create_tvshow(indexer=1, indexerid=1, _location=str(tmpdir))
+
+
+def test_get_size(series):
+    # Given
+    sut = DiskUsage()
+
+    # When
+    first = sut.get_size(series)
+    second = sut.get_size(series)
+
+    # Then
+    assert first == second == 300
+    assert FakeDBConnection.queries == 1
+
+
+def test_update_episode(series):
+    # Given
+    sut = DiskUsage()
+    sut.update_episode(series, 1, 1, 150, '/shows/Show/S01E01.mkv')
+    sut.get_size(series)
+
+    # When
+    sut.update_episode(series, 1, 2, 250, '/shows/Show/S01E02.mkv')
+    sut.update_episode(series, 1, 1, 0)
+    sut.update_episode(series, 1, 3, 300, '/shows/Show/S01E03.mkv')
+
+    # Then
+    assert sut.get_size(series) == 550
+    assert sut.episodes[(1, 1)] == {(1, 2): '/shows/Show/S01E02.mkv', (1, 3): '/shows/Show/S01E03.mkv'}
+
+
+def test_multi_episode_file(series):
+    # Given a file with episodes 2 and 3
+    FakeDBConnection.rows.append({'season': 1, 'episode': 3, 'location': '/shows/Show/S01E02.mkv', 'file_size': 200})
+    sut = DiskUsage()
+
+    # When
+    loaded = sut.get_size(series)
+    sut.update_episode(series, 1, 2, 0)
+    one_episode = sut.get_size(series)
+    sut.update_episode(series, 1, 3, 220, '/shows/Show/S01E03.mkv')
+    replaced = sut.get_size(series)
+    sut.update_episode(series, 1, 2, 220, '/shows/Show/S01E03.mkv')
+
+    # Then it's counted once
+    assert (loaded, one_episode, replaced) == (300, 300, 320)
+    assert sut.get_size(series) == 320
+
+
+def test_reconcile(series, create_file):
+    # Given
+    sut = DiskUsage()
+    create_file(os.path.join(series.location, 'Season 01', 'episode.mkv'), size=300)
+    create_file(os.path.join(series.location, 'tvshow.nfo'), size=20)
+
+    # When
+    reconciled = sut.reconcile(series)
+    sut.update_episode(series, 1, 3, 50, os.path.join(series.location, 'Season 01', 'episode 3.mkv'))
+
+    # Then
+    assert reconciled == 320
+    assert sut.get_size(series) == 370
+
+
+def test_reconcile_missing_folder(series):
+    # Given
+    sut = DiskUsage()
+    series.__dict__['_location'] = os.path.join(series.location, 'missing')
+
+    # When
+    reconciled = sut.reconcile(series)
+
+    # Then
+    assert reconciled == sut.get_size(series) == -1
+
+    # When
+    sut.remove(series)
+
+    # Then
+    assert sut.get_size(series) == 300
@@ -0,0 +1,128 @@
+# coding=utf-8
+"""Tests for medusa/schedulers/download_handler.py."""
+from __future__ import unicode_literals
+
+from medusa.schedulers.download_handler import ClientStatus, DownloadHandler
+
+from mock.mock import Mock
+
+import pytest
+
+
+class FakeDBConnection(object):
+    rows = [
+        {'info_hash': 'hash1', 'resource': 'Show.S01E01', 'client_status': 2, 'part_of_batch': 0},
+        {'info_hash': 'hash1', 'resource': 'Show.S01E02', 'client_status': 2, 'part_of_batch': 0},
+        {'info_hash': 'hash2', 'resource': 'Show.S01E03', 'client_status': 2, 'part_of_batch': 0},
+        {'info_hash': 'hash3', 'resource': 'Show.S01E04', 'client_status': 4, 'part_of_batch': 0},
+    ]
+
+    def __init__(self, *args, **kwargs):
+        self.queries = []
+
+    def select(self, query, args=None):
+        return self.rows
+
+    def executemany(self, querylist=None):
+        self.queries.append(querylist)
+
+
+class FakeClient(object):
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.requests = []
+
+    def get_statuses(self, info_hashes):
+        self.requests.append(info_hashes)
+        return self.statuses
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    monkeypatch.setattr('medusa.db.DBConnection', FakeDBConnection)
+    return DownloadHandler()
+
+
+def test_get_client_statuses(handler):
+    # Given
+    client = FakeClient({'hash1': ClientStatus(status_string='Downloaded')})
+
+    # When
+    statuses = handler._get_client_statuses(client, 'torrent')
+
+    # Then
+    assert statuses == client.statuses
+    assert client.requests == [['hash1', 'hash2', 'hash3']]
+
+
+def test_update_status(handler):
+    # Given
+    statuses = {
+        'hash1': ClientStatus(status_string='Downloaded'),
+        'hash3': ClientStatus(status_string='Downloaded'),
+    }
+
+    # When
+    handler._update_status(FakeClient(statuses), statuses)
+
+    # Then
+    assert handler.main_db_con.queries == [[[
+        'UPDATE history set client_status = ? WHERE info_hash = ? AND resource = ?',
+        [[4, 'hash1', 'Show.S01E01'], [4, 'hash1', 'Show.S01E02']]
+    ]]]
+
+
+def test_clean(handler, monkeypatch):
+    # Given
+    monkeypatch.setattr(handler, '_test_connection', lambda client, client_type: True)
+    statuses = {'hash1': ClientStatus(status_string='Downloading')}
+
+    # When
+    handler._clean(FakeClient(statuses), statuses)
+
+    # Then
+    assert handler.main_db_con.queries == [[[
+        'UPDATE history set client_status = ? WHERE info_hash = ? AND resource = ?',
+        [[2 | 1024, 'hash2', 'Show.S01E03'], [4 | 1024, 'hash3', 'Show.S01E04']]
+    ]]]
+
+
+def test_run_removed_torrents(handler, monkeypatch):
+    # Given
+    client = FakeClient({
+        'hash1': ClientStatus(status_string='Downloading'),
+        'hash2': ClientStatus(status_string='Seeded'),
+        'hash3': ClientStatus(status_string='Downloading'),
+    })
+    monkeypatch.setattr('medusa.app.USE_TORRENTS', True)
+    monkeypatch.setattr('medusa.app.TORRENT_METHOD', 'qbittorrent')
+    monkeypatch.setattr('medusa.app.USE_NZBS', False)
+    monkeypatch.setattr('medusa.clients.torrent.get_client_class', lambda method: lambda: client)
+    monkeypatch.setattr('medusa.ws.Message', lambda *args: Mock())
+    monkeypatch.setattr(handler, '_update_status', lambda client, statuses: None)
+    monkeypatch.setattr(handler, '_check_postprocess', lambda client, statuses: None)
+    monkeypatch.setattr(handler, '_test_connection', lambda client, client_type: True)
+
+    def check_torrent_ratio(client, statuses):
+        client.statuses = {info_hash: status for info_hash, status in statuses.items() if info_hash != 'hash2'}
+        return True
+
+    monkeypatch.setattr(handler, '_check_torrent_ratio', check_torrent_ratio)
+
+    # When
+    handler.run()
+
+    # Then the removed torrent is marked Removed in the same run
+    assert len(client.requests) == 2
+    assert handler.main_db_con.queries == [[[
+        'UPDATE history set client_status = ? WHERE info_hash = ? AND resource = ?',
+        [[2 | 1024, 'hash2', 'Show.S01E03']]
+    ]]]
+
+
+def test_save_statuses_to_history_nothing_changed(handler):
+    # When
+    handler.save_statuses_to_history([])
+
+    # Then
+    assert handler.main_db_con.queries == []
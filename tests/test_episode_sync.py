@@ -0,0 +1,228 @@
+# coding=utf-8
+"""Tests for the episode sync in medusa/tv/series.py."""
+from __future__ import unicode_literals
+
+import threading
+from datetime import date
+
+from medusa.common import DOWNLOADED, SKIPPED, UNAIRED, WANTED
+from medusa.tv import series as series_module
+from medusa.tv.series import Series
+
+import pytest
+
+
+class IndexedEpisode(dict):
+    def __getattr__(self, item):
+        """Get the fields as attributes, like the episodes of the indexer api."""
+        try:
+            return self[item]
+        except KeyError:
+            raise AttributeError(item)
+
+
+class StubEpisode(object):
+    def __init__(self, season, episode):
+        self.season = season
+        self.episode = episode
+        self.scene_season = season
+        self.scene_episode = episode
+        self.scene_absolute_number = 1
+        self.lock = threading.Lock()
+
+    def load_from_indexer(self, tvapi=None):
+        pass
+
+    def get_sql(self):
+        return ['UPDATE tv_episodes', [self.season, self.episode]]
+
+
+class FakeDBConnection(object):
+    queries = []
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def mass_action(self, queries):
+        FakeDBConnection.queries.extend(queries)
+
+
+def indexed_episode(**kwargs):
+    episode = {'id': 100, 'episodename': 'Pilot', 'overview': 'The first one', 'firstaired': '2010-01-02'}
+    episode.update(kwargs)
+    return IndexedEpisode(episode)
+
+
+def stored_episode(**kwargs):
+    row = {'season': 1, 'episode': 1, 'indexerid': 100, 'name': 'Pilot', 'description': 'The first one',
+           'airdate': date(2010, 1, 2).toordinal(), 'absolute_number': 1, 'scene_season': 1, 'scene_episode': 1,
+           'scene_absolute_number': 1, 'status': SKIPPED, 'location': ''}
+    row.update(kwargs)
+    return row
+
+
+@pytest.mark.parametrize('p', [
+    {  # p0: nothing changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(),
+        'expected': True,
+    },
+    {  # p1: a downloaded episode, the indexer has no absolute number
+        'stored': stored_episode(status=DOWNLOADED, location='/shows/Show/S01E01.mkv'),
+        'indexed': indexed_episode(),
+        'expected': True,
+    },
+    {  # p2: the name changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(episodename='Pilot (1)'),
+        'expected': False,
+    },
+    {  # p3: the air date changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(firstaired='2010-01-09'),
+        'expected': False,
+    },
+    {  # p4: the absolute number changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(absolute_number=2),
+        'expected': False,
+    },
+    {  # p5: a malformed air date
+        'stored': stored_episode(),
+        'indexed': indexed_episode(firstaired='2010-01'),
+        'expected': False,
+    },
+    {  # p6: an unaired episode can change its status
+        'stored': stored_episode(status=UNAIRED),
+        'indexed': indexed_episode(),
+        'expected': False,
+    },
+    {  # p7: a wanted episode can change its status
+        'stored': stored_episode(status=WANTED),
+        'indexed': indexed_episode(),
+        'expected': False,
+    },
+    {  # p8: a file that isn't processed yet can change its status
+        'stored': stored_episode(location='/shows/Show/S01E01.mkv'),
+        'indexed': indexed_episode(),
+        'expected': False,
+    },
+    {  # p9: a downloaded episode whose location isn't a media file anymore
+        'stored': stored_episode(status=DOWNLOADED, location='/shows/Show/S01E01.nfo'),
+        'indexed': indexed_episode(),
+        'expected': False,
+    },
+    {  # p10: the scene numbering of the loaded episode changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(),
+        'scene_numbering': (2, 1, 1),
+        'expected': False,
+    },
+    {  # p11: the scene absolute numbering of the loaded episode changed
+        'stored': stored_episode(),
+        'indexed': indexed_episode(),
+        'scene_numbering': (1, 1, 13),
+        'expected': False,
+    },
+    {  # p12: the episode isn't loaded, it gets the scene numbering when it's loaded
+        'stored': stored_episode(),
+        'indexed': indexed_episode(),
+        'scene_numbering': (2, 1, 13),
+        'episode_obj': None,
+        'expected': True,
+    },
+])
+def test_is_synced(p):
+    # Given
+    episode_obj = p.get('episode_obj', StubEpisode(1, 1))
+
+    # When
+    actual = series_module._is_synced(p['stored'], p['indexed'], p.get('scene_numbering', (1, 1, 1)), episode_obj)
+
+    # Then
+    assert actual is p['expected']
+
+
+def test_get_scene_numbering(monkeypatch, create_tvshow):
+    # Given
+    monkeypatch.setattr(FakeDBConnection, 'select', lambda self, query, args: [
+        {'absolute_number': 3, 'scene_absolute_number': 30},
+    ], raising=False)
+    monkeypatch.setattr('medusa.db.DBConnection', FakeDBConnection)
+    series = create_tvshow(indexerid=1, name='Show')
+    stored_episodes = {
+        (1, 1): stored_episode(),
+        # Mapped to 1x3 by xem
+        (1, 2): stored_episode(episode=2, absolute_number=2, scene_episode=3, scene_absolute_number=5),
+        (1, 3): stored_episode(episode=3, absolute_number=3, scene_episode=2, scene_absolute_number=None),
+        (1, 4): stored_episode(episode=4, absolute_number=4, scene_episode=None, scene_absolute_number=None),
+    }
+
+    # When
+    actual = series._get_scene_numbering(stored_episodes)
+
+    # Then the values get_scene_numbering and get_scene_absolute_numbering return
+    assert actual == {(1, 1): (1, 1, 1), (1, 2): (1, 3, 5), (1, 3): (1, 2, 30), (1, 4): (1, 4, 4)}
+
+
+def test_load_episodes_from_indexer(monkeypatch, create_tvshow):
+    # Given
+    FakeDBConnection.queries = []
+    monkeypatch.setattr('medusa.db.DBConnection', FakeDBConnection)
+    series = create_tvshow(indexerid=1, name='Show')
+    tvapi = {1: {1: {
+        1: indexed_episode(),
+        2: indexed_episode(id=101, episodename='Changed'),
+        3: indexed_episode(id=102, episodename='New'),
+    }}}
+    monkeypatch.setattr(Series, '_load_stored_episodes', lambda self: {
+        (1, 1): stored_episode(),
+        (1, 2): stored_episode(episode=2, indexerid=101, name='Old', scene_episode=2),
+    })
+    monkeypatch.setattr(series_module, 'xem_refresh', lambda series_obj: None)
+    monkeypatch.setattr(Series, '_get_scene_numbering', lambda self, stored_episodes: {
+        (1, 1): (1, 1, 1),
+        (1, 2): (1, 2, 1),
+    })
+    loaded = []
+
+    def get_episode(self, season, episode):
+        loaded.append((season, episode))
+        return StubEpisode(season, episode)
+
+    monkeypatch.setattr(Series, 'get_episode', get_episode)
+    monkeypatch.setattr(Series, 'save_to_db', lambda self: None)
+
+    # When
+    scanned = series.load_episodes_from_indexer(tvapi=tvapi)
+
+    # Then
+    assert scanned == {1: {1: True, 2: True, 3: True}}
+    assert loaded == [(1, 2), (1, 3)]
+    assert [query[1] for query in FakeDBConnection.queries] == [[1, 2], [1, 3]]
+
+
+def test_load_episodes_from_indexer_scene_numbering(monkeypatch, create_tvshow):
+    # Given
+    FakeDBConnection.queries = []
+    monkeypatch.setattr('medusa.db.DBConnection', FakeDBConnection)
+    series = create_tvshow(indexerid=1, name='Show')
+    tvapi = {1: {1: {1: indexed_episode()}}}
+    monkeypatch.setattr(Series, '_load_stored_episodes', lambda self: {(1, 1): stored_episode()})
+    monkeypatch.setattr(series_module, 'xem_refresh', lambda series_obj: None)
+    monkeypatch.setattr(Series, '_get_scene_numbering', lambda self, stored_episodes: {(1, 1): (2, 1, 1)})
+    series.episodes = {1: {1: StubEpisode(1, 1)}}
+    loaded = []
+
+    def get_episode(self, season, episode):
+        loaded.append((season, episode))
+        return self.episodes[season][episode]
+
+    monkeypatch.setattr(Series, 'get_episode', get_episode)
+    monkeypatch.setattr(Series, 'save_to_db', lambda self: None)
+
+    # When only the scene mapping of the loaded episode changed
+    series.load_episodes_from_indexer(tvapi=tvapi)
+
+    # Then the episode is loaded again
+    assert loaded == [(1, 1)]
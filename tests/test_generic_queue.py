@@ -0,0 +1,140 @@
+# coding=utf-8
+"""Tests for medusa/queues/generic_queue.py."""
+from __future__ import unicode_literals
+
+import threading
+
+from medusa.queues import generic_queue
+from medusa.queues.generic_queue import QueuePriorities
+
+import pytest
+
+
+class BlockingQueueItem(generic_queue.QueueItem):
+    def __init__(self, name, priority=QueuePriorities.NORMAL):
+        generic_queue.QueueItem.__init__(self, name)
+        self.priority = priority
+        self.done = threading.Event()
+        self.thread_name = None
+
+    def run(self):
+        generic_queue.QueueItem.run(self)
+        self.thread_name = threading.current_thread().name
+        self.done.wait(5)
+        self.finish()
+
+
+@pytest.fixture
+def queue():
+    # Finishing an item renames the thread running the queue
+    thread_name = threading.current_thread().name
+    queue = generic_queue.GenericQueue()
+    yield queue
+    for item in queue.running_items + queue.queue:
+        item.done.set()
+    threading.current_thread().name = thread_name
+
+
+def run_all(queue):
+    started = []
+    while queue.queue or queue.running_items:
+        queue.run()
+        for item in queue.running_items:
+            if item not in started:
+                started.append(item)
+            item.done.set()
+            item.future.result()
+    return started
+
+
+def test_priority_order(queue):
+    # Given
+    items = [
+        BlockingQueueItem('low', QueuePriorities.LOW),
+        BlockingQueueItem('normal 1'),
+        BlockingQueueItem('high', QueuePriorities.HIGH),
+        BlockingQueueItem('normal 2'),
+        BlockingQueueItem('normal 3'),
+    ]
+    for item in items:
+        queue.add_item(item)
+
+    # When
+    started = run_all(queue)
+
+    # Then the items run by priority, in the order they were added within a priority
+    assert [item.name for item in started] == [
+        'QUEUE-HIGH', 'QUEUE-NORMAL-1', 'QUEUE-NORMAL-2', 'QUEUE-NORMAL-3', 'QUEUE-LOW']
+    assert started[0].thread_name == 'QUEUE-HIGH'
+
+
+def test_min_priority(queue):
+    # Given
+    low, high = BlockingQueueItem('low', QueuePriorities.LOW), BlockingQueueItem('high', QueuePriorities.HIGH)
+    queue.add_item(low)
+    queue.add_item(high)
+    queue.min_priority = QueuePriorities.NORMAL
+
+    # When
+    queue.run()
+
+    # Then
+    assert queue.running_items == [high]
+    assert queue.queue == [low]
+
+
+def test_max_workers(queue):
+    # Given
+    queue.max_workers = 2
+    items = [BlockingQueueItem('item {0}'.format(number)) for number in range(3)]
+    for item in items:
+        queue.add_item(item)
+
+    # When
+    queue.run()
+
+    # Then
+    assert queue.running_items == items[:2]
+    assert all(item.is_alive() for item in items[:2])
+    assert not items[2].is_alive()
+
+    # When
+    items[1].done.set()
+    items[1].future.result()
+    queue.run()
+
+    # Then
+    assert queue.running_items == [items[0], items[2]]
+    assert queue.current_item is items[0]
+
+
+def test_remove_item(queue):
+    # Given
+    items = [BlockingQueueItem('item {0}'.format(number)) for number in range(3)]
+    for item in items:
+        queue.add_item(item)
+
+    # When
+    queue.remove_item(items[0])
+    started = run_all(queue)
+
+    # Then
+    assert started == items[1:]
+
+
+def test_stats(queue):
+    # Given
+    for number in range(3):
+        queue.add_item(BlockingQueueItem('item {0}'.format(number)))
+
+    # When
+    queue.run()
+    stats = queue.stats()
+
+    # Then
+    assert stats['depth'] == 2
+    assert stats['running'] == 1
+    assert stats['workers'] == 1
+    assert stats['started'] == 1
+    assert stats['max_wait'] >= stats['average_wait'] >= 0
+    assert stats['oldest_wait'] >= 0
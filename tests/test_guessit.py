@@ -9,6 +9,8 @@ import guessit
 import medusa.name_parser.guessit_parser as sut
 from medusa.scene_exceptions import TitleException
 from medusa import app
+from medusa.show.show_list import ShowList
+
 import pytest
 from six import binary_type, text_type, iteritems
 import yaml
@@ -113,3 +115,46 @@ def test_guess(monkeypatch, show_list, release_name, expected):
 
     if not expected.get('disabled'):
         assert expected == actual
+
+
+def test_expected_titles(create_tvshow):
+    # Given
+    shows = ShowList([
+        create_tvshow(indexerid=1, name='The 100'),
+        create_tvshow(indexerid=2, name='Show Name'),
+    ])
+    titles = sut.ExpectedTitles()
+
+    # When
+    first = titles.get(shows)
+    unchanged = titles.get(shows)
+    shows.append(create_tvshow(indexerid=3, name='Another Show'))
+    no_new_titles = titles.get(shows)
+    shows.append(create_tvshow(indexerid=4, name='12 Monkeys'))
+    added = titles.get(shows)
+    shows[0].__dict__['name'] = 'The 101'
+    titles.invalidate(shows[0])
+    renamed = titles.get(shows)
+
+    # Then
+    assert first == (['The 100'], 1)
+    assert unchanged is first
+    assert no_new_titles == (['The 100'], 1)
+    assert added == (['The 100', '12 Monkeys'], 2)
+    assert renamed == (['The 101', '12 Monkeys'], 3)
+
+
+def test_guessit_cache_invalidated_by_expected_titles(monkeypatch, create_tvshow):
+    # Given
+    monkeypatch.setattr(app, 'showList', [create_tvshow(indexerid=1, name='Show Name')])
+    release_name = 'Incredible.Show.2007.S01E02.720p.HDTV.x264-GROUP'
+    sut.guessit_cache.clear()
+
+    # When
+    before = guessit.guessit(release_name)
+    app.showList.append(create_tvshow(indexerid=2, name='Incredible Show 2007'))
+    after = guessit.guessit(release_name)
+
+    # Then
+    assert before['title'] == 'Incredible Show'
+    assert after['title'] == 'Incredible Show 2007'
@@ -0,0 +1,62 @@
+# coding=utf-8
+"""Tests for the history resource_name lookups."""
+from __future__ import unicode_literals
+
+from medusa import db, helpers
+from medusa.common import DOWNLOADED, SNATCHED
+from medusa.databases import main_db
+
+import pytest
+
+
+@pytest.fixture
+def history_db(monkeypatch, tmpdir):
+    path = str(tmpdir.join('main.db'))
+
+    class TmpDBConnection(db.DBConnection):
+        def __init__(self, *args, **kwargs):
+            super(TmpDBConnection, self).__init__(path)
+
+    monkeypatch.setattr('medusa.databases.utils.backup_database', lambda *args: None)
+    monkeypatch.setattr('medusa.db.DBConnection', TmpDBConnection)
+    con = TmpDBConnection()
+    con.action('CREATE TABLE db_version (db_version INTEGER, db_minor_version INTEGER)')
+    con.action('INSERT INTO db_version (db_version, db_minor_version) VALUES (44, 18)')
+    con.action('CREATE TABLE history (action NUMERIC, date NUMERIC, resource TEXT)')
+    con.mass_action([
+        ['INSERT INTO history (action, date, resource) VALUES (?, 1, ?)', [DOWNLOADED, resource]]
+        for resource in ('/tv/Show/Season 01/Show.S01E01.mkv', 'C:\\TV\\Show\\Show.S01E02.mkv')
+    ] + [['INSERT INTO history (action, date, resource) VALUES (?, 1, ?)', [SNATCHED, 'Show.S01E03.mkv']]])
+
+    yield con
+    db.db_cons.pop(path).close()
+
+
+def test_add_history_resource_name(history_db):
+    # When
+    db.upgradeDatabase(history_db, main_db.AddHistoryFDHFields)
+
+    # Then
+    assert history_db.version == (44, 19)
+    assert [row['resource_name'] for row in history_db.select('SELECT resource_name FROM history')] == [
+        'show.s01e01.mkv', 'show.s01e02.mkv', 'show.s01e03.mkv']
+    assert history_db.select("PRAGMA index_info('idx_history_resource_name')")
+
+
+@pytest.mark.parametrize('filename,expected', [
+    ('Show.S01E01.mkv', True),
+    ('show.s01e02.MKV', True),
+    ('Season 01/Show.S01E01.mkv', True),
+    ('Season 02/Show.S01E01.mkv', False),
+    ('Show.S01E03.mkv', False),
+    ('S01E01.mkv', False),
+])
+def test_is_already_processed_media(history_db, filename, expected):
+    # Given
+    db.upgradeDatabase(history_db, main_db.AddHistoryFDHFields)
+
+    # When
+    actual = helpers.is_already_processed_media(filename)
+
+    # Then
+    assert actual is expected
@@ -0,0 +1,185 @@
+# coding=utf-8
+"""Tests for medusa/logger/store.py."""
+from __future__ import unicode_literals
+
+import logging
+import os
+from datetime import datetime, timedelta
+
+from medusa.logger import ContextFilter
+
+import pytest
+
+
+@pytest.fixture
+def store_logger(log_store_handler, commit_hash):
+    target = logging.getLogger('testing_store_logger')
+    target.addFilter(ContextFilter())
+    target.addHandler(log_store_handler)
+    target.propagate = False
+    target.setLevel(logging.DEBUG)
+    yield target
+    target.removeHandler(log_store_handler)
+
+
+def log_lines(logger):
+    logger.debug('Checking Show Name for new episodes')
+    logger.info('Found 3 episodes of Show Name')
+    logger.warning('Provider Name is broken')
+    logger.error('Unable to connect to Provider Name')
+
+
+def test_read(store_logger, log_store_handler):
+    # Given
+    log_lines(store_logger)
+    log_store_handler.flush()
+    sut = log_store_handler.store
+
+    # When
+    actual = sut.read()
+
+    # Then
+    assert [logline.message for logline in actual] == [
+        'Unable to connect to Provider Name',
+        'Provider Name is broken',
+        'Found 3 episodes of Show Name',
+        'Checking Show Name for new episodes',
+    ]
+    assert actual[0].level_name == 'ERROR'
+    assert actual[0].thread_name == 'MainThread'
+
+
+@pytest.mark.parametrize('p', [
+    {  # p0: min level
+        'kwargs': {'min_level': logging.WARNING},
+        'expected': ['Unable to connect to Provider Name', 'Provider Name is broken'],
+    },
+    {  # p1: thread name
+        'kwargs': {'thread_name': 'MainThread', 'min_level': logging.ERROR},
+        'expected': ['Unable to connect to Provider Name'],
+    },
+    {  # p2: another thread name
+        'kwargs': {'thread_name': {'DAILYSEARCHER', 'BACKLOG'}},
+        'expected': [],
+    },
+    {  # p3: full-text search
+        'kwargs': {'search_query': 'provider NAME'},
+        'expected': ['Unable to connect to Provider Name', 'Provider Name is broken'],
+    },
+    {  # p4: short search
+        'kwargs': {'search_query': ' 3'},
+        'expected': ['Found 3 episodes of Show Name'],
+    },
+    {  # p5: search and min level
+        'kwargs': {'search_query': 'show name', 'min_level': logging.INFO},
+        'expected': ['Found 3 episodes of Show Name'],
+    },
+    {  # p6: page
+        'kwargs': {'offset': 1, 'limit': 2},
+        'expected': ['Provider Name is broken', 'Found 3 episodes of Show Name'],
+    },
+    {  # p7: modification time
+        'kwargs': {},
+        'modified': timedelta(minutes=1),
+        'expected': [],
+    },
+    {  # p8: modification time in the past
+        'kwargs': {},
+        'modified': -timedelta(minutes=1),
+        'expected': [
+            'Unable to connect to Provider Name',
+            'Provider Name is broken',
+            'Found 3 episodes of Show Name',
+            'Checking Show Name for new episodes',
+        ],
+    },
+])
+def test_read__filter(store_logger, log_store_handler, p):
+    # Given
+    log_lines(store_logger)
+    log_store_handler.flush()
+    sut = log_store_handler.store
+    kwargs = dict(p['kwargs'])
+    if 'modified' in p:
+        kwargs['modification_time'] = datetime.now() + p['modified']
+
+    # When
+    actual = sut.read(**kwargs)
+
+    # Then
+    assert [logline.message for logline in actual] == p['expected']
+
+
+def test_read__traceback(store_logger, log_store_handler):
+    # Given
+    try:
+        1 // 0
+    except ZeroDivisionError:
+        store_logger.exception('Expected exception message')
+    log_store_handler.flush()
+    sut = log_store_handler.store
+
+    # When
+    actual = sut.read()
+
+    # Then
+    assert actual[0].message == 'Expected exception message'
+    assert actual[0].traceback_lines[-1] == 'ZeroDivisionError: integer division or modulo by zero'
+
+
+def test_import_files(logger, logfile, store_logger, log_store_handler):
+    # Given
+    logger.info('Written before the store')
+    logger.warning('Also written before the store')
+
+    # When
+    store_logger.info('Written with the store')
+    log_store_handler.flush()
+
+    # Then
+    assert [logline.message for logline in log_store_handler.store.read()] == [
+        'Written with the store',
+        'Also written before the store',
+        'Written before the store',
+    ]
+
+
+def test_rollover(store_logger, log_store_handler, logfile):
+    # Given
+    log_store_handler.store.append('2016-08-06 15:58:34 INFO     MAIN :: [d4ea5af] Rotated out')
+    log_store_handler.doRollover()
+    store_logger.info('Still in a log file')
+    log_store_handler.flush()
+
+    # When
+    log_store_handler.doRollover()
+    log_store_handler.doRollover()
+
+    # Then
+    assert os.path.isfile(logfile + '.2')
+    assert [logline.message for logline in log_store_handler.store.read()] == ['Still in a log file']
+
+
+def test_emit__committed_on_flush(store_logger, log_store_handler):
+    # Given
+    log_lines(store_logger)
+
+    # When
+    before = log_store_handler.store.read()
+    log_store_handler.flush()
+
+    # Then
+    assert before == []
+    assert len(log_store_handler.store.read()) == 4
+
+
+def test_flush__closed(store_logger, log_store_handler):
+    # Given
+    log_lines(store_logger)
+    log_store_handler.close()
+
+    # When
+    log_store_handler.flush()
+
+    # Then
+    assert log_store_handler.store.connection is None
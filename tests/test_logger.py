@@ -473,3 +473,61 @@ def test_format_to_html(logger, read_loglines, app_config):
     # Then
     assert '<a href="../base/' in actual
     assert '">tests' + os.path.sep + 'test_logger.py</a>' in actual
+
+
+@pytest.fixture
+def queue_handler(logger, rotating_file_handler):
+    logger.removeHandler(rotating_file_handler)
+    handler = sut.LogQueueHandler([rotating_file_handler])
+    logger.addHandler(handler)
+    yield handler
+    logger.removeHandler(handler)
+    handler.close()
+
+
+@pytest.fixture
+def censored_items(monkeypatch):
+    def censor(items):
+        monkeypatch.setattr(sut.wrapped, 'censored_items', items)
+        sut.rebuild_censored_list()
+
+    yield censor
+    monkeypatch.undo()
+    sut.rebuild_censored_list()
+
+
+def test_queue_handler(logger, queue_handler, read_loglines):
+    # Given
+    items = ['first']
+
+    # When
+    logger.info('Items: %s', items)
+    items.append('second')
+    try:
+        1 // 0
+    except ZeroDivisionError:
+        logger.exception('Expected exception message')
+    queue_handler.close()
+
+    # Then
+    loglines = list(read_loglines)
+    assert [logline.message for logline in loglines] == ['Expected exception message', "Items: ['first']"]
+    assert loglines[0].traceback_lines[-1] == 'ZeroDivisionError: integer division or modulo by zero'
+    assert not queue_handler.listener._thread
+
+
+def test_censored(logger, read_loglines, censored_items):
+    # Given
+    censored_items({
+        ('General', 'api_key'): 'secret',
+        ('General', 'api_keys'): ['secret_1', '0', 'p@ss word'],
+    })
+
+    # When
+    logger.info('Using secret_1, secret, p@ss word and p%40ss%20word with the secrets')
+
+    # Then
+    assert sut.censored == ['p%40ss%20word', 'p@ss word', 'secret_1', 'secret']
+    assert list(read_loglines)[0].message == (
+        'Using **********, **********, ********** and ********** with the **********s'
+    )
@@ -0,0 +1,107 @@
+# coding=utf-8
+"""Tests for the concurrent post-processing in medusa/search/queue.py."""
+from __future__ import unicode_literals
+
+import threading
+
+from medusa.helpers.utils import KeyedLock
+from medusa.queues import generic_queue
+from medusa.search.queue import PostProcessQueue
+
+import pytest
+
+
+class BlockingQueueItem(generic_queue.QueueItem):
+    def __init__(self, resource_name=None, path='/downloads'):
+        generic_queue.QueueItem.__init__(self, 'Post Process')
+        self.resource_name = resource_name
+        self.path = path
+        self.done = threading.Event()
+
+    def run(self):
+        generic_queue.QueueItem.run(self)
+        self.done.wait(5)
+        self.finish()
+
+
+@pytest.fixture
+def queue(app_config):
+    app_config('POSTPROCESS_WORKERS', 2)
+    queue = PostProcessQueue()
+    yield queue
+    for item in queue.running_items + queue.queue:
+        item.done.set()
+
+
+def test_run_workers(queue):
+    # Given
+    items = [BlockingQueueItem('release {0}'.format(number)) for number in range(3)]
+    for item in items:
+        queue.add_item(item)
+
+    # When
+    queue.run()
+
+    # Then
+    assert queue.running_items == items[:2]
+    assert queue.queue == items[2:]
+    assert queue.is_running(BlockingQueueItem('release 1'))
+
+    # When
+    items[0].done.set()
+    items[0].future.result()
+    queue.run()
+
+    # Then
+    assert queue.running_items == items[1:]
+    assert queue.queue == []
+
+
+def test_run_folder_alone(queue):
+    # Given
+    release, folder, other = BlockingQueueItem('release'), BlockingQueueItem(), BlockingQueueItem('other')
+    for item in (release, folder, other):
+        queue.add_item(item)
+
+    # When
+    queue.run()
+
+    # Then the folder waits for the release to finish, without holding up the other release
+    assert queue.running_items == [release, other]
+    assert queue.queue == [folder]
+
+    # When
+    for item in (release, other):
+        item.done.set()
+        item.future.result()
+    queue.add_item(BlockingQueueItem('new release'))
+    queue.run()
+
+    # Then
+    assert queue.running_items == [folder]
+    assert len(queue.queue) == 1
+
+
+def test_keyed_lock():
+    # Given
+    sut = KeyedLock()
+    entered = []
+
+    def hold(*keys):
+        with sut.hold(*keys):
+            entered.append(keys)
+
+    # When
+    with sut.hold('a', 'b'):
+        other = threading.Thread(target=hold, args=('b', 'c'))
+        other.start()
+        other.join(0.1)
+
+        # Then
+        assert entered == []
+        hold('c')
+        assert entered == [('c',)]
+
+    other.join()
+    assert entered == [('c',), ('b', 'c')]
+    assert sut.locks == {}
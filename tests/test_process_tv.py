@@ -5,12 +5,14 @@ import os
 
 from medusa import app
 from medusa.post_processor import PostProcessor
-from medusa.process_tv import ProcessResult
+from medusa.process_tv import ExtractionManifest, ProcessResult
 
 from mock.mock import Mock
 
 import pytest
 
+from rarfile import BadRarFile
+
 
 @pytest.mark.parametrize('p', [
     {
@@ -493,3 +495,131 @@ def test__clean_up(monkeypatch, p, create_structure):
 
     # Then
     assert p['expected'] == expected
+
+
+class FakeRarInfo(object):
+    def __init__(self, filename, file_size):
+        self.filename = filename
+        self.file_size = file_size
+
+    def isdir(self):
+        return False
+
+
+class FakeRarFile(object):
+    """A RAR archive with one member per archive, named after the archive."""
+
+    opened = []
+    broken = False
+    folder = None
+
+    def __init__(self, archive_path):
+        FakeRarFile.opened.append(os.path.basename(archive_path))
+        self.member = os.path.basename(archive_path).replace('.rar', '.mkv')
+        if self.folder:
+            self.member = '/'.join([self.folder, self.member])
+
+    def needs_password(self):
+        return False
+
+    def infolist(self):
+        return [FakeRarInfo(self.member, 10)]
+
+    def extractall(self, path):
+        if self.folder and not os.path.isdir(os.path.join(path, self.folder)):
+            os.mkdir(os.path.join(path, self.folder))
+        with open(os.path.join(path, self.member), 'wb') as member:
+            member.write(b'\0' * (5 if self.broken else 10))
+        if self.broken:
+            raise BadRarFile('CRC check failed')
+
+
+@pytest.fixture
+def unrar(monkeypatch, tmpdir, create_file):
+    FakeRarFile.opened = []
+    FakeRarFile.broken = False
+    FakeRarFile.folder = None
+    monkeypatch.setattr('medusa.process_tv.RarFile', FakeRarFile)
+    monkeypatch.setattr('medusa.process_tv.extraction_manifest', ExtractionManifest())
+    monkeypatch.setattr(app, 'UNPACK', True)
+    monkeypatch.setattr(app, 'POSTPONE_IF_NO_SUBS', False)
+    monkeypatch.setattr(app, 'CACHE_DIR', str(tmpdir))
+    path = str(tmpdir.mkdir('downloads'))
+    for archive in ('show.s01e01.rar', 'show.s01e02.rar'):
+        create_file(os.path.join('downloads', archive), size=100)
+
+    def run():
+        sut = ProcessResult(path)
+        sut.already_postprocessed = lambda video_file: False
+        return sut, sut.unrar(path, ['show.s01e01.rar', 'show.s01e02.rar'])
+
+    return run
+
+
+def test_unrar(unrar, tmpdir):
+    # When
+    sut, unpacked_files = unrar()
+
+    # Then
+    assert unpacked_files == ['show.s01e01.mkv', 'show.s01e02.mkv']
+    assert sorted(FakeRarFile.opened) == ['show.s01e01.rar', 'show.s01e02.rar']
+    assert tmpdir.join('extracted_archives.json').check()
+
+    # When the archives are processed again
+    FakeRarFile.opened = []
+    sut, unpacked_files = unrar()
+
+    # Then they're skipped without opening them
+    assert unpacked_files == ['show.s01e01.mkv', 'show.s01e02.mkv']
+    assert FakeRarFile.opened == []
+
+    # When an extracted file is removed
+    tmpdir.join('downloads', 'show.s01e02.mkv').remove()
+    sut, unpacked_files = unrar()
+
+    # Then only that archive is extracted again, without reading its members
+    assert unpacked_files == ['show.s01e01.mkv', 'show.s01e02.mkv']
+    assert FakeRarFile.opened == ['show.s01e02.rar']
+
+
+def test_unrar_broken_archive(unrar, tmpdir):
+    # Given
+    FakeRarFile.broken = True
+
+    # When
+    sut, unpacked_files = unrar()
+
+    # Then
+    assert unpacked_files == []
+    assert sut.result is False
+    assert len(sut.missed_files) == 2
+    assert sorted(os.listdir(str(tmpdir.join('downloads')))) == ['show.s01e01.rar', 'show.s01e02.rar']
+    assert not tmpdir.join('extracted_archives.json').check()
+
+
+def test_unrar_folders(unrar, tmpdir):
+    # Given archives with their members in a folder
+    FakeRarFile.folder = 'Sample'
+
+    # When
+    sut, unpacked_files = unrar()
+    FakeRarFile.opened = []
+    sut, unpacked_again = unrar()
+
+    # Then the extracted members are found again
+    assert unpacked_files == unpacked_again == ['show.s01e01.mkv', 'show.s01e02.mkv']
+    assert tmpdir.join('downloads', 'Sample', 'show.s01e01.mkv').check()
+    assert FakeRarFile.opened == []
+
+
+def test_unrar_broken_archive_folders(unrar, tmpdir):
+    # Given
+    FakeRarFile.broken = True
+    FakeRarFile.folder = 'Sample'
+
+    # When
+    sut, unpacked_files = unrar()
+
+    # Then the members in the folder are removed
+    assert unpacked_files == []
+    assert os.listdir(str(tmpdir.join('downloads', 'Sample'))) == []
@@ -0,0 +1,92 @@
+# coding=utf-8
+"""Tests for medusa/search/provider_pool.py."""
+from __future__ import unicode_literals
+
+import threading
+import time
+
+from medusa.search.provider_pool import ProviderPool, ProviderTimeout
+
+import pytest
+
+
+class StubProvider(object):
+    def __init__(self, name, url='https://example.org', delay=0.0):
+        self.name = name
+        self.url = url
+        self.delay = delay
+
+    def get_id(self):
+        return self.name.lower()
+
+
+def test_map_keeps_provider_order():
+    providers = [StubProvider('P{0}'.format(i), url='https://p{0}.org'.format(i), delay=(5 - i) * 0.01)
+                 for i in range(5)]
+
+    def search(provider):
+        time.sleep(provider.delay)
+        return provider.name
+
+    tasks = ProviderPool(max_workers=5, timeout=10).map(search, providers)
+
+    assert [task.provider for task in tasks] == providers
+    assert [task.result for task in tasks] == ['P0', 'P1', 'P2', 'P3', 'P4']
+    assert all(task.error is None for task in tasks)
+
+
+def test_map_stores_errors():
+    def search(provider):
+        if provider.name == 'Broken':
+            raise ValueError(provider.name)
+        return provider.name
+
+    tasks = ProviderPool(max_workers=2, timeout=10).map(
+        search, [StubProvider('Broken', url='https://a.org'), StubProvider('Working', url='https://b.org')]
+    )
+
+    assert isinstance(tasks[0].error, ValueError)
+    assert tasks[0].result is None
+    assert tasks[1].result == 'Working'
+
+
+def test_map_timeout(monkeypatch):
+    monkeypatch.setattr('medusa.search.provider_pool.POLL_INTERVAL', 0.01)
+    event = threading.Event()
+
+    def search(provider):
+        if provider.name == 'Slow':
+            event.wait(5)
+        return provider.name
+
+    tasks = ProviderPool(max_workers=2, timeout=0.1).map(
+        search, [StubProvider('Slow', url='https://a.org'), StubProvider('Fast', url='https://b.org')]
+    )
+    event.set()
+
+    assert isinstance(tasks[0].error, ProviderTimeout)
+    assert tasks[0].result is None
+    assert tasks[1].result == 'Fast'
+
+
+@pytest.mark.parametrize('max_per_host,expected', [
+    (1, 1),
+    (2, 2),
+])
+def test_map_limits_requests_per_host(max_per_host, expected):
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def search(provider):
+        with lock:
+            running.append(provider)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(provider)
+
+    providers = [StubProvider('P{0}'.format(i), url='https://same-host.org/{0}'.format(i)) for i in range(4)]
+    ProviderPool(max_workers=4, timeout=10, max_per_host=max_per_host).map(search, providers)
+
+    assert max(peak) == expected
@@ -0,0 +1,144 @@
+# coding=utf-8
+"""Tests for medusa/schedulers/scheduler.py."""
+from __future__ import unicode_literals
+
+import datetime
+import threading
+import time
+
+from medusa.schedulers.scheduler import Scheduler, scheduler_engine
+
+import pytest
+
+
+class CountingAction(object):
+    def __init__(self, duration=0):
+        self.amActive = False
+        self.duration = duration
+        self.runs = []
+        self.threads = set()
+
+    def run(self, force=False):
+        self.runs.append(force)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.duration)
+
+
+def wait_for(condition, timeout=2):
+    end = time.time() + timeout
+    while not condition() and time.time() < end:
+        time.sleep(0.01)
+    return condition()
+
+
+@pytest.fixture
+def schedulers():
+    started = []
+
+    def create(action, cycle_time=0.05, **kwargs):
+        scheduler = Scheduler(action, cycleTime=datetime.timedelta(seconds=cycle_time), **kwargs)
+        scheduler.enable = True
+        scheduler.start()
+        started.append(scheduler)
+        return scheduler
+
+    yield create
+    for scheduler in started:
+        scheduler.stop.set()
+        scheduler.join(2)
+
+
+def test_interval(schedulers):
+    # Given
+    actions = [CountingAction() for _ in range(20)]
+
+    # When
+    for number, action in enumerate(actions):
+        schedulers(action, threadName='JOB{0}'.format(number))
+
+    # Then all of them run, on the worker pool, under the name of their scheduler
+    assert wait_for(lambda: all(len(action.runs) >= 3 for action in actions))
+    assert actions[3].threads == {'JOB3'}
+    assert len([thread for thread in threading.enumerate() if thread.name == 'SCHEDULER']) == 1
+
+
+def test_force(schedulers):
+    # Given
+    action = CountingAction()
+    scheduler = schedulers(action, cycle_time=3600)
+
+    # When
+    assert scheduler.forceRun()
+
+    # Then
+    assert wait_for(lambda: action.runs == [True])
+    assert scheduler.force is False
+    assert scheduler.run_count == 1
+    assert scheduler.last_duration is not None
+    assert 3590 < scheduler.timeLeft().total_seconds() <= 3600
+
+
+def test_disabled(schedulers):
+    # Given
+    action = CountingAction()
+    scheduler = schedulers(action, cycle_time=0.01)
+    scheduler.enable = False
+    scheduler.force = True
+
+    # When
+    time.sleep(0.1)
+
+    # Then
+    assert action.runs == []
+
+    # When
+    scheduler.enable = True
+
+    # Then
+    assert wait_for(lambda: action.runs[:1] == [True])
+
+
+def test_no_overlap(schedulers):
+    # Given
+    action = CountingAction(duration=0.1)
+    schedulers(action, cycle_time=0)
+
+    # When
+    time.sleep(0.25)
+
+    # Then the action isn't run again before it's done
+    assert 2 <= len(action.runs) <= 3
+    assert scheduler_engine.stats()['busy'] <= 1
+
+
+def test_long_actions(schedulers):
+    # Given
+    long_actions = [CountingAction(duration=1) for _ in range(10)]
+    for action in long_actions:
+        schedulers(action, cycle_time=0)
+    assert wait_for(lambda: all(action.runs for action in long_actions))
+
+    # When
+    action = CountingAction()
+    schedulers(action, cycle_time=0.01)
+
+    # Then the long actions don't hold up the other schedulers
+    assert wait_for(lambda: len(action.runs) >= 3, timeout=0.5)
+    assert scheduler_engine.stats()['workers'] == 11
+
+
+def test_stop(schedulers):
+    # Given
+    action = CountingAction(duration=0.1)
+    scheduler = schedulers(action, cycle_time=0)
+    assert wait_for(lambda: action.runs)
+
+    # When
+    scheduler.stop.set()
+    scheduler.join(1)
+    runs = len(action.runs)
+    time.sleep(0.1)
+
+    # Then
+    assert not scheduler.is_alive()
+    assert len(action.runs) == runs
@@ -2,11 +2,13 @@
 """Tests for medusa/search/core.py."""
 from __future__ import unicode_literals
 
+import datetime
 import functools
 import logging
 
-from medusa.common import HD1080p, Quality
-from medusa.search.core import filter_results, pick_result
+from medusa import db
+from medusa.common import DOWNLOADED, HD1080p, IGNORED, Quality, SKIPPED, SNATCHED, WANTED
+from medusa.search.core import filter_results, pick_result, wanted_episodes, wanted_episodes_for_shows
 
 from mock.mock import Mock
 
@@ -453,3 +455,65 @@ def test_pick_result(p, app_config, create_search_result, search_provider, creat
 
     # Then
     assert expected == actual
+
+
+@pytest.fixture
+def episodes_db(tmpdir, monkeypatch):
+    filename = str(tmpdir.join('wanted_episodes.db'))
+    connection_class = db.DBConnection
+
+    class EpisodesDBConnection(connection_class):
+        def __init__(self, *args, **kwargs):
+            connection_class.__init__(self, filename)
+
+    monkeypatch.setattr(db, 'DBConnection', EpisodesDBConnection)
+    con = db.DBConnection()
+    con.action(
+        'CREATE TABLE tv_episodes (episode_id INTEGER PRIMARY KEY, indexer NUMERIC, showid NUMERIC, season NUMERIC,'
+        ' episode NUMERIC, airdate NUMERIC, status NUMERIC, quality NUMERIC, manually_searched NUMERIC)'
+    )
+    con.action('CREATE TABLE tv_shows (show_id INTEGER PRIMARY KEY, indexer NUMERIC, indexer_id NUMERIC, quality NUMERIC)')
+    yield con
+    db.db_cons.pop(filename).close()
+
+
+def test_wanted_episodes_for_shows(episodes_db, create_tvshow, create_tvepisode):
+    # Given
+    rows = [
+        # indexer, showid, season, episode, status, quality, manually_searched
+        (1, 1, 1, 1, WANTED, Quality.NA, 0),
+        (1, 1, 1, 2, DOWNLOADED, Quality.SDTV, 0),  # Not in allowed qualities
+        (1, 1, 1, 3, DOWNLOADED, Quality.FULLHDTV, 0),  # Already allowed
+        (1, 1, 1, 4, WANTED, Quality.NA, 1),  # Manually searched
+        (1, 1, 1, 5, DOWNLOADED, None, 0),  # Unknown quality
+        (1, 1, 0, 1, WANTED, Quality.NA, 0),  # Specials
+        (1, 2, 1, 1, SKIPPED, Quality.NA, 0),
+        (1, 2, 1, 2, SNATCHED, Quality.SDTV, 0),
+        (1, 2, 1, 3, IGNORED, Quality.NA, 0),
+        (1, 3, 1, 1, WANTED, Quality.NA, 0),  # Show not in the list
+    ]
+    episodes_db.mass_action([
+        ['INSERT INTO tv_episodes (indexer, showid, season, episode, airdate, status, quality, manually_searched)'
+         ' VALUES (?, ?, ?, ?, 2, ?, ?, ?)', [indexer, showid, season, episode, status, quality, manually_searched]]
+        for indexer, showid, season, episode, status, quality, manually_searched in rows
+    ])
+
+    episodes_db.mass_action([
+        ['INSERT INTO tv_shows (indexer, indexer_id, quality) VALUES (1, ?, ?)', [showid, HD1080p]]
+        for showid in (1, 2, 3)
+    ])
+
+    series_list = [create_tvshow(indexer=1, indexerid=showid, name='Show {0}'.format(showid), quality=HD1080p)
+                   for showid in (1, 2)]
+    for series in series_list:
+        series.get_episode = functools.partial(create_tvepisode, series)
+
+    # When
+    actual = wanted_episodes_for_shows(series_list, datetime.date.fromordinal(1))
+    single = wanted_episodes(series_list[1], datetime.date.fromordinal(1))
+
+    # Then
+    assert [(ep.series.series_id, ep.season, ep.episode) for ep in actual] == [
+        (1, 1, 1), (1, 1, 2), (1, 1, 5), (2, 1, 2)]
+    assert [(ep.series.series_id, ep.season, ep.episode) for ep in single] == [(2, 1, 2)]
+    assert Quality.FULLHDTV in actual[0].wanted_quality
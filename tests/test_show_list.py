@@ -0,0 +1,97 @@
+# coding=utf-8
+"""Tests for medusa/show/show_list.py."""
+from __future__ import unicode_literals
+
+from medusa import app
+from medusa.show.show import Show
+from medusa.show.show_list import ShowList
+from medusa.tv.series import Series, SeriesIdentifier
+
+
+class FakeSeries(object):
+    def __init__(self, indexer, indexerid):
+        self.indexer = indexer
+        self.indexerid = indexerid
+
+    @property
+    def slug(self):
+        return 'idx{0}-{1}'.format(self.indexer, self.indexerid)
+
+
+def test_find_by_id():
+    first, second = FakeSeries(1, 10), FakeSeries(3, 10)
+    shows = ShowList([first])
+    shows.append(second)
+
+    assert shows.find_by_id(1, 10) is first
+    assert shows.find_by_id(3, 10) is second
+    assert shows.find_by_id(1, 11) is None
+    assert shows.find_by_slug('idx3-10') is second
+
+
+def test_remove_and_pop():
+    first, second, third = FakeSeries(1, 1), FakeSeries(1, 2), FakeSeries(1, 3)
+    shows = ShowList([first, second, third])
+
+    shows.remove(second)
+    assert shows.pop(0) is first
+    del shows[:]
+
+    assert shows.find_by_id(1, 1) is None
+    assert shows.find_by_id(1, 2) is None
+    assert shows.find_by_id(1, 3) is None
+    assert shows.find_by_slug('idx1-3') is None
+
+
+def test_reindex():
+    series = FakeSeries(1, 1)
+    shows = ShowList([series])
+
+    series.indexerid = 2
+    shows.reindex(series)
+
+    assert shows.find_by_id(1, 1) is None
+    assert shows.find_by_id(1, 2) is series
+    assert shows.find_by_slug('idx1-2') is series
+
+
+def test_version():
+    series = FakeSeries(1, 1)
+    shows = ShowList()
+    versions = [shows.version]
+
+    shows.append(series)
+    versions.append(shows.version)
+    shows.reindex(series)
+    versions.append(shows.version)
+    shows.remove(series)
+    versions.append(shows.version)
+
+    assert versions == sorted(set(versions))
+
+
+def test_stale_index_is_rebuilt():
+    series = FakeSeries(1, 1)
+    shows = ShowList([series])
+
+    series.indexerid = 2
+
+    assert shows.find_by_id(1, 1) is None
+    assert shows.find_by_id(1, 2) is series
+
+
+def test_app_show_list(monkeypatch, create_tvshow):
+    monkeypatch.setattr(app, 'showList', [])
+    series = create_tvshow(indexer=1, indexerid=1234, name='Show Name')
+    app.showList.append(series)
+
+    assert isinstance(app.showList, ShowList)
+    assert Show.find_by_id(app.showList, 1, 1234) is series
+    assert Show.find_by_id(app.showList, '1', '1234') is series
+    assert Show.find_by_slug('tvdb1234') is series
+    assert Series.find_by_identifier(SeriesIdentifier.from_slug('tvdb1234')) is series
+
+    series.indexerid = 4321
+
+    assert Show.find_by_id(app.showList, 1, 1234) is None
+    assert Show.find_by_id(app.showList, 1, 4321) is series
@@ -0,0 +1,110 @@
+# coding=utf-8
+"""Tests for the concurrent show updates in medusa/queues/show_queue.py."""
+from __future__ import unicode_literals
+
+import threading
+
+from medusa.queues.show_queue import ShowQueue, ShowQueueActions, ShowQueueItem
+
+import pytest
+
+
+class BlockingShowQueueItem(ShowQueueItem):
+    def __init__(self, action_id, show):
+        ShowQueueItem.__init__(self, action_id, show)
+        self.done = threading.Event()
+
+    def run(self):
+        ShowQueueItem.run(self)
+        self.done.wait(5)
+        self.finish()
+
+
+@pytest.fixture
+def queue(app_config):
+    app_config('SHOW_UPDATE_WORKERS', 3)
+    # Finishing an item renames the thread running the queue
+    thread_name = threading.current_thread().name
+    queue = ShowQueue()
+    yield queue
+    for item in queue.running_items + queue.queue:
+        item.done.set()
+    threading.current_thread().name = thread_name
+
+
+@pytest.fixture
+def shows(create_tvshow):
+    return [create_tvshow(indexerid=indexerid, name='Show {0}'.format(indexerid)) for indexerid in range(1, 4)]
+
+
+def finish(queue, *items):
+    for item in items:
+        item.done.set()
+        item.future.result()
+    queue.run()
+
+
+def test_run_updates(queue, shows):
+    # Given
+    update_1 = BlockingShowQueueItem(ShowQueueActions.UPDATE, shows[0])
+    refresh_1 = BlockingShowQueueItem(ShowQueueActions.REFRESH, shows[0])
+    update_2 = BlockingShowQueueItem(ShowQueueActions.SEASON_UPDATE, shows[1])
+    rename_3 = BlockingShowQueueItem(ShowQueueActions.RENAME, shows[2])
+    for item in (update_1, refresh_1, update_2, rename_3):
+        queue.add_item(item)
+
+    # When
+    queue.run()
+
+    # Then the refresh waits for the update of the same show, the rename for all of them
+    assert queue.running_items == [update_1, update_2]
+    assert queue.isBeingUpdated(shows[0])
+    assert not queue.isBeingRefreshed(shows[0])
+
+    # When
+    finish(queue, update_1)
+
+    # Then
+    assert queue.running_items == [update_2, refresh_1]
+    assert queue.queue == [rename_3]
+
+    # When
+    finish(queue, update_2, refresh_1)
+
+    # Then
+    assert queue.running_items == [rename_3]
+    assert queue.isBeingRenamed(shows[2])
+
+
+def test_run_alone(queue, shows):
+    # Given
+    rename_1 = BlockingShowQueueItem(ShowQueueActions.RENAME, shows[0])
+    update_2 = BlockingShowQueueItem(ShowQueueActions.UPDATE, shows[1])
+    queue.add_item(rename_1)
+    queue.add_item(update_2)
+
+    # When
+    queue.run()
+
+    # Then
+    assert queue.running_items == [rename_1]
+    assert queue.queue == [update_2]
+
+
+def test_stats(queue, shows):
+    # Given
+    updates = [BlockingShowQueueItem(ShowQueueActions.UPDATE, show) for show in shows]
+    for item in updates:
+        queue.add_item(item)
+    queue.add_item(BlockingShowQueueItem(ShowQueueActions.UPDATE, shows[0]))
+    queue.run()
+
+    # When
+    finish(queue, *updates[:2])
+    stats = queue.stats()
+
+    # Then
+    assert stats['updates_done'] == 2
+    assert stats['updates_running'] == 2
+    assert stats['updates_queued'] == 0
+    assert stats['updates_per_minute'] == 0.2
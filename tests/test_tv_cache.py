@@ -0,0 +1,368 @@
+# coding=utf-8
+"""Tests for medusa/tv/cache.py."""
+from __future__ import unicode_literals
+
+from medusa import app, db
+from medusa.databases import cache_db
+from medusa.name_parser.parser import InvalidNameException
+from medusa.scene_exceptions import TitleException
+from medusa.tv.cache import Cache, create_episode_index
+
+from mock.mock import Mock
+
+import pytest
+
+
+PROVIDER_TABLE = (
+    'CREATE TABLE [{name}] (identifier TEXT, name TEXT, season NUMERIC, episodes TEXT, indexer NUMERIC,'
+    ' indexerid NUMERIC, url TEXT, time NUMERIC, quality NUMERIC, release_group TEXT, date_added NUMERIC,'
+    ' version NUMERIC, seeders NUMERIC, leechers NUMERIC, size NUMERIC, pubdate NUMERIC, proper_tags TEXT)'
+)
+
+
+@pytest.fixture
+def cache_db_con(tmpdir, monkeypatch):
+    filename = str(tmpdir.join('cache.db'))
+    connection_class = db.DBConnection
+
+    class CacheDBConnection(connection_class):
+        def __init__(self, *args, **kwargs):
+            connection_class.__init__(self, filename)
+
+    monkeypatch.setattr(db, 'DBConnection', CacheDBConnection)
+    con = db.DBConnection()
+    db.upgradeDatabase(con, cache_db.InitialSchema)
+    yield con
+    db.db_cons.pop(filename).close()
+
+
+@pytest.fixture
+def provider_cache(cache_db_con):
+    cache_db_con.action(PROVIDER_TABLE.format(name='provider'))
+    cache_db_con.action('CREATE UNIQUE INDEX idx_identifier_provider ON [provider] (identifier)')
+    create_episode_index(cache_db_con, 'provider')
+
+    provider = Mock(anime_only=False)
+    provider.name = 'Provider'
+    provider.get_id.return_value = 'provider'
+    provider._get_identifier.side_effect = lambda item: item.url
+
+    provider_cache = Cache(provider)
+    provider_cache.provider_db = cache_db_con
+    return provider_cache
+
+
+def _add(provider_cache, series, name, season, episodes, url=None):
+    search_result = Mock(seeders=1, leechers=1, size=1, pubdate=None, url=url or name)
+    search_result.name = name
+    parsed_result = Mock(series_name=series.name, series=series, season_number=season, episode_numbers=episodes,
+                         quality=1, release_group='Grp', version=-1, proper_tags=[])
+    return provider_cache.save_cache_entries([provider_cache.add_cache_entry(search_result, parsed_result)])
+
+
+def _indexed(cache_db_con):
+    return sorted(
+        (row['identifier'], row['season'], row['episode'])
+        for row in cache_db_con.select('SELECT * FROM provider_episodes')
+    )
+
+
+def test_add_cache_entry_indexes_episodes(cache_db_con, provider_cache, create_tvshow):
+    # Given
+    series = create_tvshow(indexer=1, indexerid=12, name='Show Name')
+
+    # When
+    _add(provider_cache, series, 'Show.Name.S01E01E02', 1, [1, 2])
+    _add(provider_cache, series, 'Show.Name.S01', 1, [])
+
+    # Then
+    assert _indexed(cache_db_con) == [
+        ('Show.Name.S01', 1, -1),
+        ('Show.Name.S01E01E02', 1, 1),
+        ('Show.Name.S01E01E02', 1, 2),
+    ]
+
+    # When an entry is updated with other episodes
+    _add(provider_cache, series, 'Show.Name.S01E01E02', 2, [3], url='Show.Name.S01E01E02')
+
+    # Then
+    assert _indexed(cache_db_con) == [
+        ('Show.Name.S01', 1, -1),
+        ('Show.Name.S01E01E02', 2, 3),
+    ]
+
+    # When entries are deleted
+    cache_db_con.action('DELETE FROM [provider] WHERE identifier = ?', ['Show.Name.S01'])
+
+    # Then
+    assert _indexed(cache_db_con) == [('Show.Name.S01E01E02', 2, 3)]
+
+
+def test_save_cache_entries(cache_db_con, provider_cache, create_tvshow):
+    # Given
+    series = create_tvshow(indexer=1, indexerid=12, name='Show Name')
+
+    def entry(name, url, episodes, seeders):
+        search_result = Mock(seeders=seeders, leechers=1, size=1, pubdate=None, url=url)
+        search_result.name = name
+        parsed_result = Mock(series_name=series.name, series=series, season_number=1, episode_numbers=episodes,
+                             quality=1, release_group='Grp', version=-1, proper_tags=['PROPER'])
+        return provider_cache.add_cache_entry(search_result, parsed_result)
+
+    # When
+    first = provider_cache.save_cache_entries([
+        entry('Show.Name.S01E01', 'a', [1], 1),
+        entry('Show.Name.S01E02', 'b', [2], 1),
+    ])
+    cache_db_con.action('UPDATE [provider] SET date_added = 1')
+    second = provider_cache.save_cache_entries([
+        entry('Show.Name.S01E02', 'b', [2], 5),
+        entry('Show.Name.S01E03', 'c', [3], 1),
+        entry('Show.Name.S01E03.REPACK', 'c', [3], 2),  # Same identifier, last one wins
+        None,
+    ])
+
+    # Then
+    assert first == (2, 0)
+    assert second == (1, 1)
+    rows = cache_db_con.select('SELECT * FROM [provider] ORDER BY identifier')
+    assert [(row['identifier'], row['name'], row['seeders'], row['proper_tags']) for row in rows] == [
+        ('a', 'Show.Name.S01E01', 1, 'PROPER'),
+        ('b', 'Show.Name.S01E02', 5, 'PROPER'),
+        ('c', 'Show.Name.S01E03.REPACK', 2, 'PROPER'),
+    ]
+    assert [row['date_added'] for row in rows[:2]] == [1, 1]
+    assert _indexed(cache_db_con) == [('a', 1, 1), ('b', 1, 2), ('c', 1, 3)]
+
+
+@pytest.mark.parametrize('sqlite_version', [(3, 23, 1), (3, 24, 0)])
+def test_save_cache_entries_sqlite_version(monkeypatch, cache_db_con, provider_cache, create_tvshow, sqlite_version):
+    # Given
+    monkeypatch.setattr('sqlite3.sqlite_version_info', sqlite_version)
+    series = create_tvshow(indexer=1, indexerid=12, name='Show Name')
+
+    # When
+    inserted = _add(provider_cache, series, 'Show.Name.S01E01', 1, [1])
+    updated = _add(provider_cache, series, 'Show.Name.S01E01', 1, [1, 2], url='Show.Name.S01E01')
+
+    # Then
+    assert inserted == (1, 0)
+    assert updated == (0, 1)
+    assert _indexed(cache_db_con) == [('Show.Name.S01E01', 1, 1), ('Show.Name.S01E01', 1, 2)]
+
+
+def test_create_episode_index_existing_entries(cache_db_con):
+    # Given
+    cache_db_con.action(PROVIDER_TABLE.format(name='provider'))
+    cache_db_con.mass_action([
+        ['INSERT INTO [provider] (identifier, season, episodes, indexer, indexerid) VALUES (?, ?, ?, ?, ?)',
+         [identifier, season, episodes, indexer, 12]]
+        for identifier, season, episodes, indexer in [
+            ('a', 1, '|1|', 1),
+            ('b', 1, '|1|2|', 1),
+            ('c', 3, '||', 1),
+            ('d', 1, '|1|', None),  # Added without an indexer, can't be found
+        ]
+    ])
+
+    # When
+    create_episode_index(cache_db_con, 'provider')
+
+    # Then
+    assert _indexed(cache_db_con) == [('a', 1, 1), ('b', 1, 1), ('b', 1, 2), ('c', 3, -1)]
+
+
+def test_reindex_season_packs(cache_db_con):
+    # Given a season pack indexed as episode 0
+    cache_db_con.action(PROVIDER_TABLE.format(name='provider'))
+    cache_db_con.action('INSERT INTO [provider] (identifier, season, episodes, indexer, indexerid) '
+                        "VALUES ('a', 1, '||', 1, 12)")
+    create_episode_index(cache_db_con, 'provider')
+    cache_db_con.action('UPDATE provider_episodes SET episode = 0')
+
+    # When
+    cache_db.ReindexSeasonPacks(cache_db_con).execute()
+    create_episode_index(cache_db_con, 'provider')
+
+    # Then
+    assert _indexed(cache_db_con) == [('a', 1, -1)]
+
+
+def test_find_episodes(monkeypatch, provider_cache, create_tvshow, create_tvepisode):
+    # Given
+    series = create_tvshow(indexer=1, indexerid=12, name='Show Name')
+    other = create_tvshow(indexer=1, indexerid=13, name='Other Show')
+    monkeypatch.setattr(app, 'showList', [series, other])
+    provider_cache.provider.get_result.side_effect = lambda series, cache: Mock(
+        episode_number=cache['episodes'], identifier=cache['identifier']
+    )
+
+    _add(provider_cache, series, 'Show.Name.S01E01', 1, [1])
+    _add(provider_cache, series, 'Show.Name.S01E11', 1, [11])
+    _add(provider_cache, series, 'Show.Name.S01E01E02', 1, [1, 2])
+    _add(provider_cache, series, 'Show.Name.S01', 1, [])
+    _add(provider_cache, series, 'Show.Name.S02E01', 2, [1])
+    _add(provider_cache, other, 'Other.Show.S01E01', 1, [1])
+
+    # When
+    single = provider_cache.find_episodes(create_tvepisode(series, 1, 1))
+    multi = provider_cache.find_episodes([create_tvepisode(series, 1, 1), create_tvepisode(series, 1, 2)])
+    special = provider_cache.find_episodes(create_tvepisode(series, 1, 0))
+
+    # Then
+    assert sorted(result.identifier for results in single.values() for result in results) == [
+        'Show.Name.S01E01', 'Show.Name.S01E01E02',
+    ]
+    assert sorted(result.identifier for results in multi.values() for result in results) == [
+        'Show.Name.S01', 'Show.Name.S01E01', 'Show.Name.S01E01E02', 'Show.Name.S01E01E02',
+    ]
+    assert not special  # The season pack isn't a special
+
+
+RSS_FEED = (
+    '<?xml version="1.0"?><rss version="2.0"><channel><title>Feed</title>'
+    '<item><title>Show.Name.S01E01</title><link>https://example.org/1</link></item>'
+    '</channel></rss>'
+)
+
+
+class FeedCache(Cache):
+    def _get_rss_data(self):
+        return self.get_rss_feed('https://example.org/rss', params={'limit': 10})
+
+
+@pytest.fixture
+def update_cache(monkeypatch, app_config, cache_db_con, provider_cache):
+    app_config('CACHE_TRIMMING', False)
+    cache_db_con.action('CREATE TABLE last_update (provider TEXT, time NUMERIC)')
+    provider = provider_cache.provider
+    provider.recent_results = []
+    provider.max_recent_items = 5
+    provider.stop_at = 3
+    provider._get_title_and_url.side_effect = lambda item: (item['title'], item['link'])
+
+    parser = Mock()
+    parser.parse_many.side_effect = lambda names: [InvalidNameException(name) for name in names]
+    monkeypatch.setattr('medusa.tv.cache.NameParser', lambda: parser)
+
+    def update(cache, search_start_time):
+        cache.provider_db = cache_db_con
+        cache.update_cache(search_start_time)
+        return parser.parse_many.call_count
+
+    update.parser = parser
+    return update
+
+
+def test_update_cache_unchanged_entries(provider_cache, update_cache):
+    # Given
+    provider = provider_cache.provider
+    entries = [{'title': 'Show.Name.S01E01', 'link': 'https://example.org/1'}]
+    provider.search.side_effect = lambda search_params: list(entries)
+
+    # When
+    first = update_cache(provider_cache, 1000)
+    unchanged = update_cache(provider_cache, 2000)
+    entries.append({'title': 'Show.Name.S01E02', 'link': 'https://example.org/2'})
+    changed = update_cache(provider_cache, 3000)
+
+    # Then
+    assert (first, unchanged, changed) == (1, 1, 2)
+    assert provider_cache.updated == 3000
+
+
+def test_update_cache_show_added(monkeypatch, provider_cache, update_cache, create_tvshow):
+    # Given
+    provider = provider_cache.provider
+    provider.search.side_effect = lambda search_params: [{'title': 'Show.Name.S01E01', 'link': 'https://example.org/1'}]
+    monkeypatch.setattr(app, 'showList', [create_tvshow(indexer=1, indexerid=12, name='Other Show')])
+
+    # When
+    first = update_cache(provider_cache, 1000)
+    app.showList.append(create_tvshow(indexer=1, indexerid=13, name='Show Name'))
+    added = update_cache(provider_cache, 2000)
+    unchanged = update_cache(provider_cache, 3000)
+
+    # Then the unchanged feed is parsed again for the added show
+    assert (first, added, unchanged) == (1, 2, 2)
+
+
+def test_update_cache_alias_added(monkeypatch, provider_cache, update_cache, create_tvshow):
+    # Given
+    provider = provider_cache.provider
+    provider.search.side_effect = lambda search_params: [{'title': 'Alias.S01E01', 'link': 'https://example.org/1'}]
+    series = create_tvshow(indexer=1, indexerid=12, name='Show Name')
+    monkeypatch.setattr(app, 'showList', [series])
+
+    # When
+    first = update_cache(provider_cache, 1000)
+    series._aliases = {TitleException('Alias', -1, 1, 12, True)}
+    added = update_cache(provider_cache, 2000)
+    unchanged = update_cache(provider_cache, 3000)
+
+    # Then the unchanged feed is parsed again for the alias
+    assert (first, added, unchanged) == (1, 2, 2)
+
+
+def test_clear_provider_tables(provider_cache, update_cache):
+    # Given
+    provider_cache.provider.search.side_effect = lambda search_params: []
+    update_cache(provider_cache, 1000)
+
+    # When
+    cache_db.InitialSchema(provider_cache.provider_db).clear_provider_tables()
+
+    # Then
+    assert provider_cache.provider_db.select('SELECT * FROM feed_state') == []
+
+
+def test_update_cache_stop_parsing(monkeypatch, provider_cache, update_cache):
+    # Given
+    provider = provider_cache.provider
+    entries = [{'title': 'Show.Name.S01E{0:02d}'.format(episode), 'link': 'https://example.org/{0}'.format(episode)}
+               for episode in range(1, 51)]
+    provider.search.side_effect = lambda search_params: list(entries)
+    provider.recent_results = [item['title'] for item in entries]
+    provider.get_result.side_effect = lambda series, item: item['title']
+    parser = update_cache.parser
+    parser.parse_many.side_effect = lambda names: [Mock() for name in names]
+    monkeypatch.setattr(provider_cache, '_parse_item', lambda search_result, parsed_result: None)
+
+    # When
+    update_cache(provider_cache, 1000)
+
+    # Then only the first chunk of entries is parsed
+    assert [len(call[0][0]) for call in parser.parse_many.call_args_list] == [20]
+
+
+def test_update_cache_conditional_feed(provider_cache, update_cache):
+    # Given
+    provider = provider_cache.provider
+    sut = FeedCache(provider)
+    responses = [
+        Mock(status_code=200, content=RSS_FEED.encode('utf-8'), text=RSS_FEED,
+             headers={'ETag': '"v1"', 'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'}),
+        Mock(status_code=304),
+        Mock(status_code=200, content=RSS_FEED.encode('utf-8'), text=RSS_FEED, headers={}),
+    ]
+    provider.session.get.side_effect = responses
+
+    # When
+    parsed = [update_cache(sut, search_start_time) for search_start_time in (1000, 2000, 3000)]
+
+    # Then the feed is only parsed when it changed
+    assert parsed == [1, 1, 1]
+    requests = provider.session.get.call_args_list
+    assert requests[0][1]['headers'] == {}
+    assert requests[1][1]['headers'] == {
+        'If-None-Match': '"v1"', 'If-Modified-Since': 'Sat, 17 Oct 2026 10:00:00 GMT'}
+    assert requests[2][1]['params'] == {'limit': 10}
+    assert sut.updated == 3000
+
+    # When the cache isn't updated
+    provider.session.get.side_effect = None
+    provider.session.get.return_value = responses[0]
+    sut.get_rss_feed('https://example.org/rss')
+
+    # Then
+    assert 'headers' not in provider.session.get.call_args[1]